@@ -11,6 +11,8 @@ Main fixes vs the original:
 - prefers PitSvFuel when available instead of always forcing a full tank
 - respects DriverCarMaxFuelPct fuel restrictions when present
 - avoids writing profile JSON every frame
+- projects the rejoin gap for a whole sweep of pit losses (splash to full
+  tank, with and without tires) in one NumPy pass over the CarIdx arrays
 """
 
 from __future__ import annotations
@@ -23,12 +25,17 @@ import tkinter as tk
 from typing import Dict, List, Optional, Tuple
 
 import irsdk
+import numpy as np
 
 UPDATE_MS = 100
 DEFAULT_LAP_TIME_S = 90.0
+MIN_LAP_TIME_S = 20.0
 GREEN_GAP_S = 5.0
 YELLOW_GAP_S = 1.5
 MAX_REASONABLE_RATE_LPS = 8.0
+NO_GAP_S = 99.0
+SWEEP_STEPS = 41
+CURVE_HEIGHT = 64
 
 
 def _get_appdata_dir() -> Path:
@@ -41,6 +48,68 @@ def _get_appdata_dir() -> Path:
 PROFILE_FILE = _get_appdata_dir() / "nishizumi_pittime_profiles.json"
 
 
+def usable_lap_time(lap_time_s: float) -> float:
+    """The lap time to wrap with: anything under MIN_LAP_TIME_S (or NaN) is not a lap."""
+    return lap_time_s if lap_time_s >= MIN_LAP_TIME_S else DEFAULT_LAP_TIME_S
+
+
+def wrap_car_deltas(
+    car_est,
+    player_idx: int,
+    lap_time_s: float,
+    on_pit_road=None,
+    track_surface=None,
+) -> np.ndarray:
+    """CarIdxEstTime of every other running car relative to the player, wrapped to half a lap.
+
+    Cars on pit road, off the world (negative CarIdxTrackSurface) or without
+    a finite estimate are masked out in the same pass. A lap time under
+    MIN_LAP_TIME_S (e.g. LapCurrentLapTime just after the line) is replaced
+    by DEFAULT_LAP_TIME_S (see usable_lap_time).
+    """
+    est = np.asarray(car_est, dtype=float)
+    if est.ndim != 1 or not 0 <= player_idx < est.size:
+        return np.empty(0)
+    keep = np.isfinite(est)
+    keep[player_idx] = False
+    if on_pit_road is not None:
+        pit = np.asarray(on_pit_road, dtype=bool)
+        if pit.shape == est.shape:
+            keep &= ~pit
+    if track_surface is not None:
+        surface = np.asarray(track_surface, dtype=float)
+        if surface.shape == est.shape:
+            keep &= surface >= 0
+    lap_time_s = usable_lap_time(lap_time_s)
+    half_lap = lap_time_s / 2.0
+    delta = est[keep] - est[player_idx]
+    return np.mod(delta + half_lap, lap_time_s) - half_lap
+
+
+def rejoin_gap_curve(deltas: np.ndarray, losses: np.ndarray, lap_time_s: float) -> np.ndarray:
+    """Front and rear rejoin gaps for every candidate pit loss.
+
+    Each car's delta plus the loss is wrapped back into half a lap, so a car
+    the stop lets past counts as behind, however long the stop is. Returns an
+    array of shape ``(2,) + losses.shape``: the smallest gap to a car ahead
+    and to a car behind after losing each amount of time, with NO_GAP_S where
+    there is nobody on that side.
+
+    A car 14 s ahead on a 60 s lap rejoins 1 s behind after a 45 s stop:
+
+    >>> rejoin_gap_curve(np.array([14.0]), np.array([45.0]), 60.0)[:, 0].tolist()
+    [99.0, 1.0]
+    """
+    lap_time_s = usable_lap_time(lap_time_s)
+    half_lap = lap_time_s / 2.0
+    losses = np.asarray(losses, dtype=float)
+    projected = np.mod(np.asarray(deltas, dtype=float) + losses[..., None] + half_lap, lap_time_s) - half_lap
+    ahead = projected >= 0
+    front = np.where(ahead, projected, np.inf).min(axis=-1, initial=np.inf)
+    rear = -np.where(ahead, -np.inf, projected).max(axis=-1, initial=-np.inf)
+    return np.minimum(np.stack((front, rear)), NO_GAP_S)
+
+
 class PitStopOverlay:
     BG = "#0f1115"
     PANEL = "#171a21"
@@ -65,7 +134,7 @@ class PitStopOverlay:
         self.root.overrideredirect(True)
         self.root.attributes("-topmost", True)
         self.root.attributes("-alpha", 0.97)
-        self.root.geometry("420x224+80+80")
+        self.root.geometry("420x308+80+80")
         self.root.minsize(320, 120)
 
         self._drag_offset_x = 0
@@ -87,6 +156,7 @@ class PitStopOverlay:
         self.loss_line_var = tk.StringVar(value="Pit loss: --")
         self.window_var = tk.StringVar(value="Awaiting telemetry")
         self.gaps_var = tk.StringVar(value="Front -- | Rear --")
+        self.curve_var = tk.StringVar(value="Rejoin curve: --")
         self.status_var = tk.StringVar(value="Waiting for telemetry…")
 
         self.profile_data = self._load_profiles()
@@ -203,6 +273,19 @@ class PitStopOverlay:
         self.fuel_label.pack(fill="x", pady=(2, 0))
         self.loss_label = tk.Label(self.info_card, textvariable=self.loss_line_var, bg=self.PANEL, fg=self.TEXT, font=("Segoe UI", 9), anchor="w")
         self.loss_label.pack(fill="x", pady=(2, 0))
+        self.curve_label = tk.Label(self.info_card, textvariable=self.curve_var, bg=self.PANEL, fg=self.TEXT, font=("Segoe UI", 9), anchor="w")
+        self.curve_label.pack(fill="x", pady=(6, 0))
+        self.curve_canvas = tk.Canvas(self.info_card, bg=self.ENTRY_BG, height=CURVE_HEIGHT, highlightthickness=0, bd=0)
+        self.curve_canvas.pack(fill="x", pady=(2, 0))
+        self.curve_bands = {
+            gap: self.curve_canvas.create_line(0, 0, 0, 0, fill=color, dash=(2, 3))
+            for gap, color in ((GREEN_GAP_S, self.GOOD), (YELLOW_GAP_S, self.WARN))
+        }
+        self.curve_lines = (
+            self.curve_canvas.create_line(0, 0, 0, 0, fill=self.ACCENT, width=2),
+            self.curve_canvas.create_line(0, 0, 0, 0, fill=self.MUTED, width=2),
+        )
+        self.curve_plan = self.curve_canvas.create_line(0, 0, 0, 0, fill=self.TEXT)
 
         self.settings_card = tk.Frame(self.main, bg=self.PANEL, padx=10, pady=10, highlightthickness=1, highlightbackground=self.BORDER)
 
@@ -337,10 +420,10 @@ class PitStopOverlay:
         if settings:
             self.settings_card.pack(fill="x", pady=(8, 0), after=self.info_card)
             self.footer.pack(fill="x", pady=(8, 0), after=self.settings_card)
-            self.root.geometry("420x320")
+            self.root.geometry("420x404")
         else:
             self.footer.pack(fill="x", pady=(8, 0), after=self.info_card)
-            self.root.geometry("420x224")
+            self.root.geometry("420x308")
             self.content_canvas.yview_moveto(0)
 
         self.root.after_idle(self._update_scrollbar_visibility)
@@ -683,53 +766,40 @@ class PitStopOverlay:
         self._is_fueling = False
         self._fueling_samples = []
 
-    def _collect_car_deltas(self, lap_time_s: float) -> List[float]:
+    def _collect_car_deltas(self, lap_time_s: float) -> np.ndarray:
         player_idx = self._read_var("PlayerCarIdx")
         car_est = self._read_var("CarIdxEstTime")
-        track_surface = self._read_var("CarIdxTrackSurface")
-        car_on_pit_road = self._read_var("CarIdxOnPitRoad")
-
         if player_idx is None or car_est is None:
-            return []
-
+            return np.empty(0)
         try:
-            player_idx = int(player_idx)
-            player_est = float(car_est[player_idx])
-        except Exception:
-            return []
-
-        deltas: List[float] = []
-        half_lap = max(10.0, lap_time_s / 2.0)
-
-        for idx, other_est in enumerate(car_est):
-            if idx == player_idx:
-                continue
-
-            try:
-                if car_on_pit_road is not None and bool(car_on_pit_road[idx]):
-                    continue
-            except Exception:
-                pass
-
-            try:
-                if track_surface is not None and int(track_surface[idx]) < 0:
-                    continue
-            except Exception:
-                pass
-
-            try:
-                delta = float(other_est) - player_est
-            except Exception:
-                continue
-
-            while delta > half_lap:
-                delta -= lap_time_s
-            while delta < -half_lap:
-                delta += lap_time_s
-
-            deltas.append(delta)
-
-        return deltas
+            return wrap_car_deltas(
+                car_est,
+                int(player_idx),
+                lap_time_s,
+                self._read_var("CarIdxOnPitRoad"),
+                self._read_var("CarIdxTrackSurface"),
+            )
+        except (TypeError, ValueError):
+            return np.empty(0)
+
+    def _draw_rejoin_curve(self, fuel_sweep: np.ndarray, curve: np.ndarray, planned_fuel: float) -> None:
+        """Plot the smaller of the front/rear gaps over the fuel sweep, without and with tires."""
+        canvas = self.curve_canvas
+        width = max(canvas.winfo_width(), 2)
+        span = max(float(fuel_sweep[-1]), 1e-6)
+        top = GREEN_GAP_S * 2.0
+
+        def y(gap):
+            return CURVE_HEIGHT - 2 - (CURVE_HEIGHT - 4) * np.clip(gap, 0.0, top) / top
+
+        xs = (width - 1) * fuel_sweep / span
+        for gap, item in self.curve_bands.items():
+            level = float(y(gap))
+            canvas.coords(item, 0, level, width, level)
+        for item, gaps in zip(self.curve_lines, np.minimum(curve[0], curve[1])):
+            canvas.coords(item, *np.column_stack((xs, y(gaps))).ravel().tolist())
+        x_plan = (width - 1) * min(planned_fuel, span) / span
+        canvas.coords(self.curve_plan, x_plan, 0, x_plan, CURVE_HEIGHT)
 
     @staticmethod
     def _status_from_gaps(front_gap: float, rear_gap: float) -> Tuple[str, str, float]:
@@ -783,12 +853,18 @@ class PitStopOverlay:
 
         lap_time_s = self._estimate_lap_time()
         deltas = self._collect_car_deltas(lap_time_s)
-        projected = [delta + total_loss for delta in deltas]
 
-        front_candidates = [delta for delta in projected if delta >= 0]
-        rear_candidates = [delta for delta in projected if delta < 0]
-        front_gap = min(front_candidates) if front_candidates else 99.0
-        rear_gap = abs(max(rear_candidates)) if rear_candidates else 99.0
+        # Candidate stops from a splash to a full tank, without and with tires,
+        # plus the planned stop as the last column: all evaluated in one broadcast.
+        full_add = max(fuel_to_add, (fuel_max - fuel_now) if fuel_max else 0.0)
+        fuel_sweep = np.linspace(0.0, full_add, SWEEP_STEPS)
+        losses = np.empty((2, SWEEP_STEPS + 1))
+        losses[:, :-1] = base_loss + np.array([[0.0], [tire_loss]]) + fuel_sweep / fuel_rate
+        losses[:, -1] = total_loss
+        curve = rejoin_gap_curve(deltas, losses, lap_time_s)
+        front_gap = float(curve[0, 0, -1])
+        rear_gap = float(curve[1, 0, -1])
+        curve = curve[:, :, :-1]
 
         status, color, score = self._status_from_gaps(front_gap, rear_gap)
 
@@ -801,6 +877,12 @@ class PitStopOverlay:
         )
         self.window_var.set(f"{score:.0f}%   {status}")
         self.gaps_var.set(f"Front {front_gap:.2f}s | Rear {rear_gap:.2f}s")
+        worst = np.minimum(curve[0], curve[1])
+        self.curve_var.set(
+            f"Rejoin gap 0–{full_add:.0f} L: no tires {worst[0].min():.1f}–{worst[0].max():.1f}s"
+            f" | tires {worst[1].min():.1f}–{worst[1].max():.1f}s"
+        )
+        self._draw_rejoin_curve(fuel_sweep, curve, fuel_to_add)
         self.status_var.set(
             f"Projected rejoin after {total_loss:.2f}s pit loss. "
             f"Lap estimate {lap_time_s:.2f}s."
@@ -817,6 +899,7 @@ class PitStopOverlay:
         self.loss_line_var.set("Pit loss: --")
         self.window_var.set("Awaiting telemetry")
         self.gaps_var.set("Front -- | Rear --")
+        self.curve_var.set("Rejoin curve: --")
         self.status_var.set("No live telemetry available.")
         self.live_card.configure(highlightbackground=self.BORDER)
 
@@ -6,14 +6,21 @@ from __future__ import annotations
 import json
 import math
 import os
+import queue
+import sqlite3
 import sys
+import threading
 import time
 import tkinter as tk
+from bisect import bisect_left, insort
+from collections import deque
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 import irsdk
+import numpy as np
 
 
 def _get_appdata_dir() -> Path:
@@ -23,6 +30,48 @@ def _get_appdata_dir() -> Path:
     return path
 
 
+class ViewBinder:
+    """Push widget options and variable values to Tk only when they change.
+
+    The last applied value of every bound field is kept per Tk name, so an
+    unchanged field costs a dict lookup instead of a configure/set call and
+    the geometry pass Tk schedules after it.
+    """
+
+    def __init__(self) -> None:
+        self._applied: dict[tuple[str, str], object] = {}
+        self._changed = False
+
+    def config(self, widget: tk.Misc, **options: object) -> bool:
+        name = str(widget)
+        changed = {
+            option: value
+            for option, value in options.items()
+            if (name, option) not in self._applied or self._applied[(name, option)] != value
+        }
+        if not changed:
+            return False
+        widget.configure(**changed)
+        for option, value in changed.items():
+            self._applied[(name, option)] = value
+        self._changed = True
+        return True
+
+    def set(self, variable: tk.Variable, value: object) -> bool:
+        key = (str(variable), "value")
+        if key in self._applied and self._applied[key] == value:
+            return False
+        variable.set(value)
+        self._applied[key] = value
+        self._changed = True
+        return True
+
+    def take_changed(self) -> bool:
+        changed = self._changed
+        self._changed = False
+        return changed
+
+
 @dataclass
 class StintState:
     fuel_start: float
@@ -31,6 +80,747 @@ class StintState:
     started_at: float
 
 
+class LapStatistics:
+    """Running statistics over lap samples with an optional bounded window.
+
+    Sums are maintained on insert so per-tick reads (count, mean, variance and
+    the save/push band averages) are O(1). The sorted view is kept up to date
+    with ``insort`` so the bands never need a full sort.
+    """
+
+    def __init__(self, maxlen: Optional[int] = None, band_fraction: float = 0.35) -> None:
+        self.maxlen = maxlen
+        self.band_fraction = band_fraction
+        self._samples: deque[float] = deque()
+        self._sorted: list[float] = []
+        self._total = 0.0
+        self._total_sq = 0.0
+        self._low_band_mean: Optional[float] = None
+        self._high_band_mean: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def __bool__(self) -> bool:
+        return bool(self._samples)
+
+    def clear(self) -> None:
+        self._samples.clear()
+        self._sorted.clear()
+        self._total = 0.0
+        self._total_sq = 0.0
+        self._low_band_mean = None
+        self._high_band_mean = None
+
+    def append(self, value: float) -> None:
+        if self.maxlen is not None and len(self._samples) >= self.maxlen:
+            self._evict_oldest()
+        self._samples.append(value)
+        insort(self._sorted, value)
+        self._total += value
+        self._total_sq += value * value
+        self._update_bands()
+
+    def _evict_oldest(self) -> None:
+        oldest = self._samples.popleft()
+        index = bisect_left(self._sorted, oldest)
+        del self._sorted[index]
+        self._total -= oldest
+        self._total_sq -= oldest * oldest
+        if not self._samples:
+            self._total = 0.0
+            self._total_sq = 0.0
+
+    def _update_bands(self) -> None:
+        count = len(self._sorted)
+        if count == 0:
+            self._low_band_mean = None
+            self._high_band_mean = None
+            return
+        band_size = max(1, math.ceil(count * self.band_fraction))
+        self._low_band_mean = sum(self._sorted[:band_size]) / band_size
+        self._high_band_mean = sum(self._sorted[-band_size:]) / band_size
+
+    @property
+    def total(self) -> float:
+        return self._total
+
+    @property
+    def mean(self) -> Optional[float]:
+        if not self._samples:
+            return None
+        return self._total / len(self._samples)
+
+    @property
+    def variance(self) -> Optional[float]:
+        count = len(self._samples)
+        if count < 2:
+            return None
+        mean = self._total / count
+        return max(0.0, (self._total_sq - count * mean * mean) / (count - 1))
+
+    @property
+    def low_band_mean(self) -> Optional[float]:
+        return self._low_band_mean
+
+    @property
+    def high_band_mean(self) -> Optional[float]:
+        return self._high_band_mean
+
+    @property
+    def last(self) -> Optional[float]:
+        return self._samples[-1] if self._samples else None
+
+    def values(self) -> list[float]:
+        return list(self._samples)
+
+
+class LapFuelProfile:
+    """Fuel burn learned per ``LapDistPct`` bin across laps.
+
+    Each tick adds the fuel drop to the bins covered since the previous
+    sample, so the current lap is O(1) to update. Completed green laps are
+    blended into a normalised profile, and its cumulative curve maps lap
+    distance to the fraction of a lap's fuel burned by that point.
+    """
+
+    def __init__(self, bins: int = 100, blend: float = 0.2, min_coverage: float = 0.8) -> None:
+        self.bins = bins
+        self.blend = blend
+        self.min_coverage = min_coverage
+        self._profile = np.zeros(bins, dtype=np.float64)
+        self._current = np.zeros(bins, dtype=np.float64)
+        self._visited = np.zeros(bins, dtype=bool)
+        self._cumulative: list[float] = [index / bins for index in range(bins + 1)]
+        self._laps_learned = 0
+        self._lap_valid = True
+        self._last_lapdist: Optional[float] = None
+        self._last_fuel: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._laps_learned > 0
+
+    @property
+    def laps_learned(self) -> int:
+        return self._laps_learned
+
+    def clear(self) -> None:
+        self._profile.fill(0.0)
+        self._cumulative = [index / self.bins for index in range(self.bins + 1)]
+        self._laps_learned = 0
+        self.reset_lap()
+
+    def reset_lap(self) -> None:
+        self._current.fill(0.0)
+        self._visited.fill(False)
+        self._lap_valid = True
+        self._last_lapdist = None
+        self._last_fuel = None
+
+    def _bin(self, lapdist: float) -> int:
+        return min(self.bins - 1, max(0, int(lapdist * self.bins)))
+
+    def observe(self, lapdist: float, fuel_level: float) -> None:
+        if self._last_lapdist is not None and self._last_fuel is not None:
+            drop = self._last_fuel - fuel_level
+            if drop < 0:
+                self._lap_valid = False
+            elif lapdist >= self._last_lapdist:
+                start = self._bin(self._last_lapdist)
+                end = self._bin(lapdist)
+                self._current[start:end + 1] += drop / (end - start + 1)
+                self._visited[start:end + 1] = True
+            else:
+                # Wrapped across the line: the drop belongs to the end of the lap.
+                start = self._bin(self._last_lapdist)
+                self._current[start:] += drop / (self.bins - start)
+                self._visited[start:] = True
+        self._last_lapdist = lapdist
+        self._last_fuel = fuel_level
+
+    def complete_lap(self, valid: bool) -> None:
+        total = float(self._current.sum())
+        coverage = float(self._visited.mean())
+        if valid and self._lap_valid and total > 0 and coverage >= self.min_coverage:
+            lap_shape = self._current / total
+            if self._laps_learned == 0:
+                self._profile[:] = lap_shape
+            else:
+                weight = max(self.blend, 1.0 / (self._laps_learned + 1))
+                self._profile *= 1.0 - weight
+                self._profile += weight * lap_shape
+            cumulative = np.concatenate(([0.0], np.cumsum(self._profile)))
+            cumulative /= cumulative[-1]
+            self._cumulative = cumulative.tolist()
+            self._laps_learned += 1
+        self._current.fill(0.0)
+        self._visited.fill(False)
+        self._lap_valid = True
+
+    def fraction_at(self, lapdist: float) -> float:
+        """Fraction of a lap's fuel burned between the line and ``lapdist``."""
+        position = min(1.0, max(0.0, lapdist)) * self.bins
+        index = min(self.bins - 1, int(position))
+        lower = self._cumulative[index]
+        return lower + (self._cumulative[index + 1] - lower) * (position - index)
+
+    def lapdist_at(self, fraction: float) -> float:
+        """Inverse of ``fraction_at``: lap distance where ``fraction`` of the lap fuel is burned."""
+        fraction = min(1.0, max(0.0, fraction))
+        index = min(self.bins - 1, max(0, bisect_left(self._cumulative, fraction) - 1))
+        lower = self._cumulative[index]
+        span = self._cumulative[index + 1] - lower
+        offset = (fraction - lower) / span if span > 0 else 0.0
+        return (index + min(1.0, max(0.0, offset))) / self.bins
+
+    def laps_remaining(self, fuel_level: float, avg_per_lap: float, lapdist: float) -> float:
+        """Laps of distance the fuel covers from ``lapdist`` at ``avg_per_lap``."""
+        if avg_per_lap <= 0:
+            return 0.0
+        laps_of_fuel = fuel_level / avg_per_lap
+        burned = self.fraction_at(lapdist)
+        if laps_of_fuel < 1.0 - burned:
+            return self.lapdist_at(burned + laps_of_fuel) - lapdist
+        after_line = laps_of_fuel - (1.0 - burned)
+        whole_laps = math.floor(after_line)
+        return (1.0 - lapdist) + whole_laps + self.lapdist_at(after_line - whole_laps)
+
+
+@dataclass(frozen=True)
+class HistoryLap:
+    car: str
+    track: str
+    session_type: str
+    fuel_used: float
+    lap_time: Optional[float]
+    session_flags: int
+    track_temp: Optional[float]
+    recorded_at: float
+
+
+@dataclass(frozen=True)
+class HistoryPrior:
+    laps: int
+    fuel_mean: float
+    fuel_std: float
+    lap_time_mean: Optional[float]
+
+
+class FuelHistoryStore:
+    """SQLite history of valid laps, indexed by car and track.
+
+    Laps are queued from the UI thread and written in batches by a daemon
+    writer. A per car/track summary row (counts and running sums) is updated
+    in the same transaction, so the session-start lookup is a single
+    primary-key read however many laps are stored.
+    """
+
+    BATCH_SIZE = 10
+    FLUSH_INTERVAL_S = 5.0
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._pending: queue.Queue[Optional[HistoryLap]] = queue.Queue()
+        self._conn = self._connect()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        try:
+            conn = sqlite3.connect(str(self.path), timeout=1.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS laps (
+                    id INTEGER PRIMARY KEY,
+                    car TEXT NOT NULL,
+                    track TEXT NOT NULL,
+                    session_type TEXT NOT NULL,
+                    fuel_used REAL NOT NULL,
+                    lap_time REAL,
+                    session_flags INTEGER NOT NULL,
+                    track_temp REAL,
+                    recorded_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_laps_car_track ON laps (car, track);
+                CREATE TABLE IF NOT EXISTS lap_summary (
+                    car TEXT NOT NULL,
+                    track TEXT NOT NULL,
+                    laps INTEGER NOT NULL,
+                    fuel_sum REAL NOT NULL,
+                    fuel_sq_sum REAL NOT NULL,
+                    time_laps INTEGER NOT NULL,
+                    time_sum REAL NOT NULL,
+                    PRIMARY KEY (car, track)
+                );
+                """
+            )
+            return conn
+        except sqlite3.Error:
+            return None
+
+    def record(self, lap: HistoryLap) -> None:
+        self._pending.put(lap)
+
+    def lookup(self, car: str, track: str) -> Optional[HistoryPrior]:
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT laps, fuel_sum, fuel_sq_sum, time_laps, time_sum FROM lap_summary WHERE car = ? AND track = ?",
+                (car, track),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None or row[0] <= 0:
+            return None
+        laps, fuel_sum, fuel_sq_sum, time_laps, time_sum = row
+        mean = fuel_sum / laps
+        variance = (fuel_sq_sum - laps * mean * mean) / (laps - 1) if laps > 1 else 0.0
+        return HistoryPrior(
+            laps=int(laps),
+            fuel_mean=mean,
+            fuel_std=math.sqrt(max(0.0, variance)),
+            lap_time_mean=time_sum / time_laps if time_laps > 0 else None,
+        )
+
+    def close(self) -> None:
+        self._pending.put(None)
+        self._writer.join(timeout=2.0)
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        batch: list[HistoryLap] = []
+        flush_at = time.monotonic() + self.FLUSH_INTERVAL_S
+        running = True
+        while running:
+            try:
+                item = self._pending.get(timeout=max(0.05, flush_at - time.monotonic()))
+                if item is None:
+                    running = False
+                else:
+                    batch.append(item)
+            except queue.Empty:
+                pass
+            if batch and (not running or len(batch) >= self.BATCH_SIZE or time.monotonic() >= flush_at):
+                self._flush(conn, batch)
+                batch = []
+            if time.monotonic() >= flush_at:
+                flush_at = time.monotonic() + self.FLUSH_INTERVAL_S
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def _flush(self, conn: Optional[sqlite3.Connection], batch: list[HistoryLap]) -> None:
+        if conn is None:
+            return
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO laps (car, track, session_type, fuel_used, lap_time, session_flags, track_temp, recorded_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            lap.car,
+                            lap.track,
+                            lap.session_type,
+                            lap.fuel_used,
+                            lap.lap_time,
+                            lap.session_flags,
+                            lap.track_temp,
+                            lap.recorded_at,
+                        )
+                        for lap in batch
+                    ],
+                )
+                conn.executemany(
+                    "INSERT INTO lap_summary (car, track, laps, fuel_sum, fuel_sq_sum, time_laps, time_sum) "
+                    "VALUES (?, ?, 1, ?, ?, ?, ?) "
+                    "ON CONFLICT (car, track) DO UPDATE SET "
+                    "laps = laps + 1, "
+                    "fuel_sum = fuel_sum + excluded.fuel_sum, "
+                    "fuel_sq_sum = fuel_sq_sum + excluded.fuel_sq_sum, "
+                    "time_laps = time_laps + excluded.time_laps, "
+                    "time_sum = time_sum + excluded.time_sum",
+                    [
+                        (
+                            lap.car,
+                            lap.track,
+                            lap.fuel_used,
+                            lap.fuel_used * lap.fuel_used,
+                            1 if lap.lap_time else 0,
+                            lap.lap_time or 0.0,
+                        )
+                        for lap in batch
+                    ],
+                )
+        except sqlite3.Error:
+            pass
+
+
+# Fraction of lap time lost per fraction of fuel saved (lift and coast).
+SAVE_TIME_COST = 0.25
+MAX_STRATEGY_STOPS = 40
+# Optimiser pit inputs when neither a setting nor a Pit Calibrator history provides them.
+DEFAULT_PIT_BASE_LOSS_S = 30.0
+DEFAULT_FILL_RATE_LPS = 2.4
+PIT_CALIBRATION_PATH = _get_appdata_dir() / "nishizumi_pitcalibrator.sqlite3"
+# Width of the Pit Calibrator's fill-curve bins.
+FUEL_BIN_LITERS = 2.0
+
+
+class FuelFillCurve:
+    """Fill time over litres added, from the Pit Calibrator's per-bin pump rates.
+
+    ``rates[i]`` applies while litres ``i * FUEL_BIN_LITERS`` to
+    ``(i + 1) * FUEL_BIN_LITERS`` go in; amounts past the learned range
+    continue at the last rate. The time to every bin edge is precomputed, so a
+    fill time is one bin index plus one linear step.
+    """
+
+    def __init__(self, rates: tuple[float, ...]) -> None:
+        self.rates = rates
+        self._edge_times = np.concatenate(([0.0], np.cumsum(FUEL_BIN_LITERS / np.asarray(rates, dtype=float))))
+        self._last_bin = len(rates) - 1
+
+    def fill_time(self, liters: float) -> float:
+        if liters <= 0.0:
+            return 0.0
+        index = min(int(liters / FUEL_BIN_LITERS), self._last_bin)
+        return float(self._edge_times[index] + (liters - index * FUEL_BIN_LITERS) / self.rates[index])
+
+
+@dataclass(frozen=True)
+class PitCalibration:
+    """Stop medians the Pit Calibrator stored for one car and track."""
+
+    stops: int
+    base_loss_s: Optional[float]
+    fill_rate_lps: Optional[float]
+    fill_curve: tuple[float, ...] = ()
+
+
+def read_pit_calibration(path: Path, car_id: str, track_id: str) -> Optional[PitCalibration]:
+    """Read the Pit Calibrator's per car/track aggregates, opening its database read-only."""
+    if not path.exists():
+        return None
+    try:
+        conn = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True, timeout=0.5)
+    except sqlite3.Error:
+        return None
+    try:
+        rows = conn.execute(
+            "SELECT metric, n, median FROM stop_stats WHERE car_id = ? AND track_id = ?",
+            (car_id, track_id),
+        ).fetchall()
+        try:
+            # The fill curve is per car; histories written before it existed lack the table.
+            bins = conn.execute("SELECT rate FROM fuel_bins WHERE car_id = ? ORDER BY bin", (car_id,)).fetchall()
+        except sqlite3.Error:
+            bins = []
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+    stats = {str(metric): (int(n), float(median)) for metric, n, median in rows}
+    if not stats:
+        return None
+    base = stats.get("base")
+    rate = stats.get("fuel_rate")
+    return PitCalibration(
+        stops=max(n for n, _ in stats.values()),
+        base_loss_s=base[1] if base is not None and base[1] > 0 else None,
+        fill_rate_lps=rate[1] if rate is not None and rate[1] > 0 else None,
+        fill_curve=tuple(float(row[0]) for row in bins) if all(row[0] > 0 for row in bins) else (),
+    )
+
+
+@dataclass(frozen=True)
+class StrategyPlan:
+    stops: int
+    target_per_lap: float
+    fuel_per_stop: float
+    fuel_added: float
+    race_time_s: float
+    margin_laps: float
+
+
+@dataclass(frozen=True)
+class StrategyResult:
+    best: Optional[StrategyPlan]
+    by_stops: tuple[StrategyPlan, ...]
+
+
+def _quantise(value: float, step: float) -> float:
+    return round(round(value / step) * step, 6)
+
+
+def solve_race_strategy(
+    laps_to_go: float,
+    fuel_level: float,
+    avg_per_lap: float,
+    save_avg: float,
+    push_avg: float,
+    tank_capacity: Optional[float],
+    finish_buffer: float,
+    lap_time: Optional[float],
+    pit_base_loss: float,
+    fill_rate: float,
+    fill_curve: tuple[float, ...] = (),
+) -> StrategyResult:
+    """Return the fastest feasible stop plan for the remaining race.
+
+    Fuel time per stop comes from ``fill_curve`` (a FuelFillCurve's bin
+    rates) when one is given, otherwise from the flat ``fill_rate``. Inputs
+    are quantised before hitting the memoised solver, so the search only
+    re-runs when the race state changes meaningfully.
+    """
+    return _solve_race_strategy(
+        _quantise(laps_to_go, 0.1),
+        _quantise(fuel_level, 0.1),
+        _quantise(avg_per_lap, 0.005),
+        _quantise(save_avg, 0.005),
+        _quantise(push_avg, 0.005),
+        _quantise(tank_capacity, 0.5) if tank_capacity else 0.0,
+        _quantise(max(0.0, finish_buffer), 0.05),
+        _quantise(lap_time, 0.5) if lap_time and lap_time > 0 else 90.0,
+        _quantise(max(0.0, pit_base_loss), 0.5),
+        _quantise(max(0.0, fill_rate), 0.05),
+        tuple(_quantise(rate, 0.01) for rate in fill_curve),
+    )
+
+
+@lru_cache(maxsize=256)
+def _solve_race_strategy(
+    laps_to_go: float,
+    fuel_level: float,
+    avg_per_lap: float,
+    save_avg: float,
+    push_avg: float,
+    tank_capacity: float,
+    finish_buffer: float,
+    lap_time: float,
+    pit_base_loss: float,
+    fill_rate: float,
+    fill_curve: tuple[float, ...],
+) -> StrategyResult:
+    if laps_to_go <= 0 or avg_per_lap <= 0 or save_avg <= 0 or push_avg < save_avg:
+        return StrategyResult(best=None, by_stops=())
+
+    usable_fuel = fuel_level - finish_buffer
+    if tank_capacity > 0:
+        worst_case_need = laps_to_go * push_avg - usable_fuel
+        max_stops = min(MAX_STRATEGY_STOPS, max(0, math.ceil(worst_case_need / tank_capacity)))
+    else:
+        max_stops = 0
+
+    step = max(0.005, avg_per_lap * 0.0025)
+    targets = {save_avg + index * step for index in range(int((push_avg - save_avg) / step) + 1)}
+    targets.update((save_avg, avg_per_lap, push_avg))
+    for stops in range(max_stops + 1):
+        stint_cap = (usable_fuel + stops * tank_capacity) / laps_to_go
+        if save_avg <= stint_cap <= push_avg:
+            targets.add(stint_cap)
+    candidates = sorted(value for value in targets if save_avg <= value <= push_avg)
+
+    def lap_time_at(target: float) -> float:
+        return lap_time * (1.0 + SAVE_TIME_COST * (avg_per_lap - target) / avg_per_lap)
+
+    curve = FuelFillCurve(fill_curve) if fill_curve else None
+
+    def fill_time(liters: float) -> float:
+        if curve is not None:
+            return curve.fill_time(liters)
+        return liters / fill_rate if fill_rate > 0 else 0.0
+
+    fastest_laps_time = laps_to_go * lap_time_at(push_avg)
+    best: Optional[StrategyPlan] = None
+    by_stops: list[StrategyPlan] = []
+    for stops in range(max_stops + 1):
+        # Every extra stop adds at least the base loss, so once the optimistic
+        # bound for this stop count is slower than the best plan, stop searching.
+        if best is not None and fastest_laps_time + stops * pit_base_loss >= best.race_time_s:
+            break
+        capacity = usable_fuel + stops * tank_capacity
+        stop_best: Optional[StrategyPlan] = None
+        for target in candidates:
+            fuel_needed = laps_to_go * target
+            if fuel_needed > capacity + 1e-9:
+                break
+            fuel_added = max(0.0, fuel_needed - usable_fuel)
+            if stops > 0 and fuel_added <= 0:
+                continue
+            pit_time = 0.0
+            if stops > 0:
+                # Every stop fills its own share, and each fill starts at the bottom of the curve.
+                pit_time = stops * (pit_base_loss + fill_time(fuel_added / stops))
+            race_time = laps_to_go * lap_time_at(target) + pit_time
+            if stop_best is None or race_time < stop_best.race_time_s:
+                stop_best = StrategyPlan(
+                    stops=stops,
+                    target_per_lap=target,
+                    fuel_per_stop=fuel_added / stops if stops > 0 else 0.0,
+                    fuel_added=fuel_added,
+                    race_time_s=race_time,
+                    margin_laps=(usable_fuel + fuel_added) / target - laps_to_go,
+                )
+        if stop_best is None:
+            continue
+        by_stops.append(stop_best)
+        if best is None or stop_best.race_time_s < best.race_time_s:
+            best = stop_best
+    return StrategyResult(best=best, by_stops=tuple(by_stops))
+
+
+FINISH_CONFIDENCE = 0.95
+MAX_SIMULATED_LAPS = 600
+SIMULATION_CELL_BUDGET = 150_000
+
+
+@dataclass(frozen=True)
+class SimulationRequest:
+    lap: int
+    fuel_samples: tuple[float, ...]
+    lap_time_samples: tuple[float, ...]
+    usable_fuel: float
+    laps_to_go: float
+    session_time_remain: Optional[float]
+    tank_capacity: Optional[float]
+    plans: tuple[StrategyPlan, ...]
+
+
+@dataclass(frozen=True)
+class PlanOdds:
+    stops: int
+    finish_probability: float
+    safe_target_per_lap: float
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    lap: int
+    draws: int
+    elapsed_ms: float
+    plan_odds: tuple[PlanOdds, ...]
+    error: Optional[str] = None
+
+
+def simulate_fuel_to_finish(request: SimulationRequest, rng: np.random.Generator) -> Optional[SimulationResult]:
+    """Bootstrap race completions from the recorded lap fuel and lap time samples.
+
+    Each draw resamples the per-lap fuel use for the rest of the race. For timed
+    sessions the lap count is also drawn, by resampling lap times until the
+    session clock runs out, which carries the uncertainty of the laps-remaining
+    estimate into the result.
+    """
+    started = time.perf_counter()
+    fuel = np.asarray(request.fuel_samples, dtype=np.float32)
+    if fuel.size < 3 or request.laps_to_go <= 0:
+        return None
+    mean_fuel = float(fuel.mean())
+    if mean_fuel <= 0:
+        return None
+
+    horizon = min(MAX_SIMULATED_LAPS, math.ceil(request.laps_to_go * 1.25) + 2)
+    draws = max(250, min(2000, SIMULATION_CELL_BUDGET // horizon))
+    cum_fuel = np.cumsum(fuel[rng.integers(0, fuel.size, size=(draws, horizon))], axis=1)
+
+    lap_times = np.asarray(request.lap_time_samples, dtype=np.float32)
+    if request.session_time_remain is not None and request.session_time_remain > 0 and lap_times.size >= 3:
+        cum_time = np.cumsum(lap_times[rng.integers(0, lap_times.size, size=(draws, horizon))], axis=1)
+        laps_needed = np.count_nonzero(cum_time < request.session_time_remain, axis=1) + 1
+        laps_needed = np.minimum(laps_needed, horizon)
+    else:
+        laps_needed = np.full(draws, min(horizon, max(1, math.ceil(request.laps_to_go))))
+    fuel_needed = cum_fuel[np.arange(draws), laps_needed - 1]
+    fuel_needed_q = float(np.quantile(fuel_needed, FINISH_CONFIDENCE))
+
+    plan_odds: list[PlanOdds] = []
+    for plan in request.plans:
+        available = request.usable_fuel
+        if plan.stops > 0 and request.tank_capacity:
+            available += plan.stops * request.tank_capacity
+        # Running the plan's target scales the recorded distribution around its mean.
+        scale = plan.target_per_lap / mean_fuel
+        finishes = np.count_nonzero(fuel_needed * scale <= available)
+        plan_odds.append(
+            PlanOdds(
+                stops=plan.stops,
+                finish_probability=float(finishes) / draws,
+                safe_target_per_lap=max(0.0, available * mean_fuel / fuel_needed_q) if fuel_needed_q > 0 else 0.0,
+            )
+        )
+
+    return SimulationResult(
+        lap=request.lap,
+        draws=draws,
+        elapsed_ms=(time.perf_counter() - started) * 1000.0,
+        plan_odds=tuple(plan_odds),
+    )
+
+
+class FuelFinishSimulator(threading.Thread):
+    """Background worker that keeps the latest fuel-to-finish simulation."""
+
+    def __init__(self) -> None:
+        super().__init__(daemon=True)
+        self._requests: queue.Queue[SimulationRequest] = queue.Queue(maxsize=1)
+        self._stop_event = threading.Event()
+        self._result_lock = threading.Lock()
+        self._result: Optional[SimulationResult] = None
+        self._rng = np.random.default_rng()
+
+    def submit(self, request: SimulationRequest) -> None:
+        try:
+            self._requests.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self._requests.put_nowait(request)
+        except queue.Full:
+            pass
+
+    def latest(self) -> Optional[SimulationResult]:
+        with self._result_lock:
+            return self._result
+
+    def clear(self) -> None:
+        with self._result_lock:
+            self._result = None
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                request = self._requests.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                result = simulate_fuel_to_finish(request, self._rng)
+            except Exception as exc:
+                # Replace the previous odds so a broken simulation shows up on the overlay.
+                result = SimulationResult(
+                    lap=request.lap,
+                    draws=0,
+                    elapsed_ms=0.0,
+                    plan_odds=(),
+                    error=f"{type(exc).__name__}: {exc}",
+                )
+            with self._result_lock:
+                self._result = result
+
+
 class FuelConsumptionMonitor:
     WINDOW_MIN_WIDTH = 308
     WINDOW_MIN_HEIGHT_COLLAPSED = 190
@@ -42,6 +832,7 @@ class FuelConsumptionMonitor:
     BUTTON_HOVER_BG = "#2b3950"
     CLOSE_BG = "#171b23"
     CLOSE_HOVER_BG = "#a83c4a"
+    LAP_HISTORY_LIMIT = 200
 
     def __init__(self) -> None:
         self.ir = irsdk.IRSDK()
@@ -54,6 +845,9 @@ class FuelConsumptionMonitor:
         self.root.attributes("-alpha", 0.92)
         self._is_dragging = False
         self._close_button_visible = False
+        self._view = ViewBinder()
+        self._layout_size: Optional[tuple[int, int]] = None
+        self._pit_overlay_visible = False
 
         self._drag_offset_x = 0
         self._drag_offset_y = 0
@@ -62,9 +856,11 @@ class FuelConsumptionMonitor:
         self._last_fuel: Optional[float] = None
         self._last_lap: Optional[int] = None
         self._lap_start_fuel: Optional[float] = None
+        self._lap_start_lapdist: Optional[float] = None
+        self._fuel_profile = LapFuelProfile()
         self._last_lap_used: Optional[float] = None
         self._pit_hold_until: float = 0.0
-        self._lap_consumptions: list[float] = []
+        self._lap_consumptions = LapStatistics(maxlen=self.LAP_HISTORY_LIMIT)
         self._locked_target: Optional[float] = None
         self._last_on_pitroad: Optional[bool] = None
         self._pit_overlay_until: float = 0.0
@@ -76,6 +872,9 @@ class FuelConsumptionMonitor:
         self.refuel_threshold_l = 0.3
         self.avg_min_progress = 0.05
         self.anomaly_threshold = 0.3
+        self.pit_loss_var = tk.StringVar(value="")
+        self.fill_rate_var = tk.StringVar(value="")
+        self._pit_calibration: Optional[PitCalibration] = None
 
         self.target_var = tk.StringVar(value="2.50")
         self.lock_target_var = tk.BooleanVar(value=False)
@@ -83,20 +882,26 @@ class FuelConsumptionMonitor:
         self.advanced_toggle_text = tk.StringVar(value="I")
 
         self._position_path = _get_appdata_dir() / "fuel_consumption_monitor.json"
+        self._history = FuelHistoryStore(_get_appdata_dir() / "fuel_consumption_history.sqlite3")
+        self._history_key: Optional[tuple[str, str]] = None
+        self._history_prior: Optional[HistoryPrior] = None
+        self._history_checked_at: float = 0.0
+        self._session_type = ""
 
         self._plus_one_target: Optional[float] = None
         self._minus_one_target: Optional[float] = None
         self._plus_one_laps: Optional[int] = None
         self._minus_one_laps: Optional[int] = None
         self._last_lap_time: Optional[float] = None
-        self._lap_times: list[float] = []
+        self._lap_times = LapStatistics(maxlen=self.LAP_HISTORY_LIMIT)
         self._estimated_tank_capacity_l: Optional[float] = None
-        self._strategy_cache_text = "Race: waiting for session estimate..."
-        self._strategy_cache_color = "#9fc7ff"
-        self._strategy_cache_key: Optional[tuple[object, ...]] = None
-        self._strategy_cache_until: float = 0.0
+        self._last_strategy_result: Optional[StrategyResult] = None
+        self._simulated_lap: Optional[int] = None
+        self._simulator = FuelFinishSimulator()
+        self._simulator.start()
 
         self._build_ui()
+        self._load_pit_settings()
         self._build_close_button_window()
         self._apply_window_geometry(default_pos=(60, 60))
 
@@ -173,6 +978,15 @@ class FuelConsumptionMonitor:
         )
         self.lastlap_label.pack(anchor="w")
 
+        self.lapdelta_label = tk.Label(
+            bottom,
+            text="Lap delta: --",
+            font=("Segoe UI", 12),
+            fg="#d4d4d4",
+            bg=self.CARD_BG,
+        )
+        self.lapdelta_label.pack(anchor="w")
+
         self.stint_label = tk.Label(
             bottom,
             text="Stint: (C) --; (E) --",
@@ -342,6 +1156,37 @@ class FuelConsumptionMonitor:
         self.minus_one_button.pack(side="left")
         self._bind_hover(self.minus_one_button, self.BUTTON_BG, self.BUTTON_HOVER_BG)
 
+        pit_row = tk.Frame(self.advanced_frame, bg=self.CARD_BG)
+        pit_row.pack(fill="x", pady=(4, 0))
+        self.pit_setting_entries = []
+        for text, variable in (("Pit loss s:", self.pit_loss_var), ("Fill L/s:", self.fill_rate_var)):
+            tk.Label(
+                pit_row,
+                text=text,
+                font=("Segoe UI", 9),
+                fg="#c4c4c4",
+                bg=self.CARD_BG,
+            ).pack(side="left")
+            entry = tk.Entry(
+                pit_row,
+                textvariable=variable,
+                width=5,
+                font=("Segoe UI", 9),
+                justify="center",
+                bd=0,
+                highlightthickness=1,
+                highlightbackground="#293242",
+                highlightcolor="#47607a",
+                relief="flat",
+                bg="#151a22",
+                fg="#f3f3f3",
+                insertbackground="#f3f3f3",
+            )
+            entry.pack(side="left", padx=(4, 10))
+            entry.bind("<Return>", self._commit_pit_settings)
+            entry.bind("<FocusOut>", self._commit_pit_settings)
+            self.pit_setting_entries.append(entry)
+
         self.advanced_stint_label = tk.Label(
             self.advanced_frame,
             text="",
@@ -443,14 +1288,15 @@ class FuelConsumptionMonitor:
 
     def _set_standby_state(self, status_text: str) -> None:
         unit = self._unit_label
-        self.avg_label.config(text=f"--.-- {unit}/Lap", fg="#c8c8c8")
-        self.delta_label.config(text="(--)", fg="#c8c8c8")
-        self.fuel_label.config(text=f"Fuel: --.-- {unit}")
-        self.laps_label.config(text="Remaining: --.- laps")
-        self.lastlap_label.config(text=f"Last lap: --.- {unit}")
-        self.stint_label.config(text="Stint: (C) --; (E) --", fg="#d4d4d4")
-        self.strategy_label.config(text="Race: waiting for session estimate...", fg="#9fc7ff")
-        self.status_label.config(text=status_text)
+        self._view.config(self.avg_label, text=f"--.-- {unit}/Lap", fg="#c8c8c8")
+        self._view.config(self.delta_label, text="(--)", fg="#c8c8c8")
+        self._view.config(self.fuel_label, text=f"Fuel: --.-- {unit}")
+        self._view.config(self.laps_label, text="Remaining: --.- laps")
+        self._view.config(self.lastlap_label, text=f"Last lap: --.- {unit}")
+        self._view.config(self.lapdelta_label, text="Lap delta: --", fg="#d4d4d4")
+        self._view.config(self.stint_label, text="Stint: (C) --; (E) --", fg="#d4d4d4")
+        self._view.config(self.strategy_label, text="Race: waiting for session estimate...", fg="#9fc7ff")
+        self._view.config(self.status_label, text=status_text)
         self._hide_pit_overlay()
 
     def _set_connection_state(self, connected: bool) -> None:
@@ -459,6 +1305,11 @@ class FuelConsumptionMonitor:
         self._connected = connected
         if not connected:
             self._reset_stint()
+            self._fuel_profile.clear()
+            self._history_key = None
+            self._history_prior = None
+            self._history_checked_at = 0.0
+            self._pit_calibration = None
             self._estimated_tank_capacity_l = None
             self._last_on_pitroad = None
             self._pit_overlay_until = 0.0
@@ -500,17 +1351,21 @@ class FuelConsumptionMonitor:
 
     def _manual_reset(self) -> None:
         self._reset_stint()
-        self.status_label.config(text="Manual reset")
+        self._view.config(self.status_label, text="Manual reset")
 
     def _reset_stint(self) -> None:
         self._stint = None
         self._last_fuel = None
         self._last_lap = None
         self._lap_start_fuel = None
+        self._lap_start_lapdist = None
+        self._fuel_profile.reset_lap()
         self._last_lap_used = None
         self._last_lap_time = None
         self._lap_consumptions.clear()
         self._lap_times.clear()
+        self._simulated_lap = None
+        self._simulator.clear()
 
     def _update_stint(
         self,
@@ -521,6 +1376,7 @@ class FuelConsumptionMonitor:
         lap_last_time: Optional[float],
     ) -> None:
         now = time.time()
+        self._fuel_profile.observe(lapdist, fuel_level)
         if self._stint is None:
             self._stint = StintState(
                 fuel_start=fuel_level,
@@ -531,7 +1387,8 @@ class FuelConsumptionMonitor:
             self._last_fuel = fuel_level
             self._last_lap = lap
             self._lap_start_fuel = fuel_level
-            self.status_label.config(text="Stint tracking")
+            self._lap_start_lapdist = lapdist
+            self._view.config(self.status_label, text="Stint tracking")
             return
 
         if self._last_fuel is not None and fuel_level - self._last_fuel >= self.refuel_threshold_l:
@@ -543,16 +1400,19 @@ class FuelConsumptionMonitor:
                 started_at=now,
             )
             self._lap_start_fuel = fuel_level
+            self._lap_start_lapdist = lapdist
             self._last_lap_used = None
-            self.status_label.config(text="Refuel detected")
+            self._view.config(self.status_label, text="Refuel detected")
 
         if self._last_lap is not None and lap > self._last_lap and self._lap_start_fuel is not None:
             lap_progress = self._compute_progress(lap, lapdist)
             lap_used = max(0.0, self._lap_start_fuel - fuel_level)
             self._lap_start_fuel = fuel_level
+            self._lap_start_lapdist = lapdist
             if lap_progress is None or lap_progress < 1:
                 self._last_lap_used = None
                 self._last_lap_time = None
+                self._fuel_profile.complete_lap(False)
             else:
                 self._last_lap_used = lap_used
                 valid_green_lap = (
@@ -562,6 +1422,8 @@ class FuelConsumptionMonitor:
                 )
                 if valid_green_lap:
                     self._lap_consumptions.append(self._last_lap_used)
+                    self._record_history_lap(self._last_lap_used, lap_last_time, session_flags)
+                self._fuel_profile.complete_lap(valid_green_lap)
                 if lap_last_time is not None and lap_last_time > 0:
                     self._last_lap_time = lap_last_time
                     if valid_green_lap and not self._is_anomalous_lap_time(lap_last_time):
@@ -572,6 +1434,147 @@ class FuelConsumptionMonitor:
         self._last_fuel = fuel_level
         self._last_lap = lap
 
+    def _read_session_identity(self) -> Optional[tuple[str, str, str]]:
+        try:
+            weekend = self.ir["WeekendInfo"]
+            driver_info = self.ir["DriverInfo"]
+        except Exception:
+            return None
+        if not isinstance(weekend, dict) or not isinstance(driver_info, dict):
+            return None
+        track = str(weekend.get("TrackDisplayName") or weekend.get("TrackName") or "").strip()
+        track_config = str(weekend.get("TrackConfigName") or "").strip()
+        if track and track_config:
+            track = f"{track} - {track_config}"
+        car = ""
+        car_idx = driver_info.get("DriverCarIdx")
+        for entry in driver_info.get("Drivers") or []:
+            if isinstance(entry, dict) and entry.get("CarIdx") == car_idx:
+                car = str(entry.get("CarScreenName") or entry.get("CarPath") or "").strip()
+                break
+        if not car or not track:
+            return None
+        session_type = ""
+        session_num = self._safe_int("SessionNum")
+        try:
+            session_info = self.ir["SessionInfo"]
+        except Exception:
+            session_info = None
+        if isinstance(session_info, dict):
+            for session in session_info.get("Sessions") or []:
+                if isinstance(session, dict) and session.get("SessionNum") == session_num:
+                    session_type = str(session.get("SessionType") or "")
+                    break
+        return car, track, session_type
+
+    def _read_pit_identity(self) -> Optional[tuple[str, str]]:
+        # The Pit Calibrator keys its history by CarPath and the internal TrackName.
+        try:
+            weekend = self.ir["WeekendInfo"]
+            driver_info = self.ir["DriverInfo"]
+        except Exception:
+            return None
+        if not isinstance(weekend, dict) or not isinstance(driver_info, dict):
+            return None
+        car_idx = driver_info.get("DriverCarIdx")
+        for entry in driver_info.get("Drivers") or []:
+            if isinstance(entry, dict) and entry.get("CarIdx") == car_idx:
+                car_id = str(entry.get("CarPath") or entry.get("CarClassShortName") or car_idx or "unknown_car")
+                track_id = str(
+                    weekend.get("TrackName") or weekend.get("TrackDisplayShortName") or weekend.get("TrackID") or "unknown_track"
+                )
+                return car_id, track_id
+        return None
+
+    def _update_history_identity(self, now: float) -> None:
+        if now < self._history_checked_at:
+            return
+        self._history_checked_at = now + 5.0
+        identity = self._read_session_identity()
+        if identity is None:
+            return
+        car, track, self._session_type = identity
+        if (car, track) != self._history_key:
+            self._history_key = (car, track)
+            self._history_prior = self._history.lookup(car, track)
+        # Re-read on every check: the Pit Calibrator may store a stop mid-session.
+        pit_identity = self._read_pit_identity()
+        self._pit_calibration = read_pit_calibration(PIT_CALIBRATION_PATH, *pit_identity) if pit_identity else None
+
+    def _pit_setting(self, variable: tk.StringVar) -> Optional[float]:
+        value = self._parse_decimal_input(variable.get())
+        return value if value is not None and value > 0 else None
+
+    def _pit_inputs(self) -> tuple[float, float, tuple[float, ...], str]:
+        """Base pit loss, fill rate and fill curve for the optimiser, and a line saying where they came from.
+
+        A value typed into the settings wins, then the Pit Calibrator's data
+        for this car and track (its fill curve before its median rate), then
+        the built-in default.
+        """
+        calibration = self._pit_calibration
+        sources = []
+        values = []
+        for setting, calibrated, default in (
+            (self.pit_loss_var, calibration.base_loss_s if calibration else None, DEFAULT_PIT_BASE_LOSS_S),
+            (self.fill_rate_var, calibration.fill_rate_lps if calibration else None, DEFAULT_FILL_RATE_LPS),
+        ):
+            value = self._pit_setting(setting)
+            if value is not None:
+                sources.append("set")
+            elif calibrated is not None:
+                value = calibrated
+                sources.append(f"{calibration.stops} stops")
+            else:
+                value = default
+                sources.append("default")
+            values.append(value)
+        base_loss, fill_rate = values
+        fill_curve: tuple[float, ...] = ()
+        if calibration is not None and calibration.fill_curve and self._pit_setting(self.fill_rate_var) is None:
+            fill_curve = calibration.fill_curve
+            fill_text = f"fill curve to {len(fill_curve) * FUEL_BIN_LITERS:.0f} L"
+        else:
+            fill_text = f"{fill_rate:.2f} L/s ({sources[1]})"
+        line = f"Pit: {base_loss:.1f}s base ({sources[0]}), {fill_text}"
+        return base_loss, fill_rate, fill_curve, line
+
+    def _commit_pit_settings(self, event: tk.Event | None = None) -> None:
+        for variable in (self.pit_loss_var, self.fill_rate_var):
+            value = self._pit_setting(variable)
+            variable.set("" if value is None else f"{value:g}")
+        self._write_saved_state(
+            pit_base_loss_s=self._pit_setting(self.pit_loss_var),
+            fill_rate_lps=self._pit_setting(self.fill_rate_var),
+        )
+
+    def _load_pit_settings(self) -> None:
+        data = self._read_saved_state()
+        for variable, name in ((self.pit_loss_var, "pit_base_loss_s"), (self.fill_rate_var, "fill_rate_lps")):
+            value = data.get(name)
+            if isinstance(value, (int, float)) and value > 0:
+                variable.set(f"{value:g}")
+
+    def _record_history_lap(self, lap_used: float, lap_last_time: Optional[float], session_flags: Optional[int]) -> None:
+        if self._history_key is None:
+            return
+        car, track = self._history_key
+        track_temp = self._safe_float("TrackTempCrew")
+        if track_temp is None:
+            track_temp = self._safe_float("TrackTemp")
+        self._history.record(
+            HistoryLap(
+                car=car,
+                track=track,
+                session_type=self._session_type,
+                fuel_used=lap_used,
+                lap_time=lap_last_time if lap_last_time is not None and lap_last_time > 0 else None,
+                session_flags=session_flags or 0,
+                track_temp=track_temp,
+                recorded_at=time.time(),
+            )
+        )
+
     def _compute_progress(self, lap: int, lapdist: float) -> Optional[float]:
         if self._stint is None:
             return None
@@ -580,6 +1583,31 @@ class FuelConsumptionMonitor:
             return None
         return progress
 
+    def _compute_fuel_progress(self, lap: int, lapdist: float) -> Optional[float]:
+        """Stint progress weighted by where in the lap the fuel is actually burned."""
+        progress = self._compute_progress(lap, lapdist)
+        if progress is None or self._stint is None or not self._fuel_profile.ready:
+            return progress
+        weighted = (
+            (lap - self._stint.lap_start)
+            + self._fuel_profile.fraction_at(lapdist)
+            - self._fuel_profile.fraction_at(self._stint.lapdist_start)
+        )
+        return weighted if weighted > 0 else None
+
+    def _lap_point_delta(self, fuel_level: float, lapdist: float, target: Optional[float]) -> Optional[float]:
+        if target is None or target <= 0 or not self._fuel_profile.ready:
+            return None
+        if self._lap_start_fuel is None or self._lap_start_lapdist is None:
+            return None
+        expected_fraction = self._fuel_profile.fraction_at(lapdist) - self._fuel_profile.fraction_at(
+            self._lap_start_lapdist
+        )
+        if expected_fraction < 0.02:
+            return None
+        used = self._lap_start_fuel - fuel_level
+        return used - target * expected_fraction
+
     def _parse_target(self) -> Optional[float]:
         return self._parse_target_with_units(self._display_units)
 
@@ -604,13 +1632,13 @@ class FuelConsumptionMonitor:
             if target is not None:
                 self._locked_target = target
                 self.target_entry.configure(state="disabled")
-                self.status_label.config(text="Target locked")
+                self._view.config(self.status_label, text="Target locked")
             else:
                 self.lock_target_var.set(False)
         else:
             self._locked_target = None
             self.target_entry.configure(state="normal")
-            self.status_label.config(text="Target unlocked")
+            self._view.config(self.status_label, text="Target unlocked")
 
     def _toggle_advanced_info(self) -> None:
         show_advanced = not self.show_advanced_var.get()
@@ -632,7 +1660,7 @@ class FuelConsumptionMonitor:
         self.target_var.set(f"{self._from_liters(target):.2f}")
         if self.lock_target_var.get():
             self._locked_target = target
-        self.status_label.config(text="Target updated from advanced")
+        self._view.config(self.status_label, text="Target updated from advanced")
 
     def _is_yellow_flag(self, session_flags: Optional[int]) -> bool:
         if session_flags is None:
@@ -651,8 +1679,8 @@ class FuelConsumptionMonitor:
             return True
         if len(self._lap_consumptions) < 3:
             return False
-        avg = sum(self._lap_consumptions) / len(self._lap_consumptions)
-        if avg <= 0:
+        avg = self._lap_consumptions.mean
+        if avg is None or avg <= 0:
             return False
         deviation = abs(lap_used - avg) / avg
         return deviation >= self.anomaly_threshold
@@ -662,21 +1690,23 @@ class FuelConsumptionMonitor:
             return True
         if len(self._lap_times) < 3:
             return False
-        avg = sum(self._lap_times) / len(self._lap_times)
-        if avg <= 0:
+        avg = self._lap_times.mean
+        if avg is None or avg <= 0:
             return False
         deviation = abs(lap_time - avg) / avg
         return deviation >= 0.35
 
     def _estimated_lap_time(self, lap_last_time: Optional[float], lap_best_time: Optional[float]) -> Optional[float]:
         if self._lap_times:
-            return sum(self._lap_times) / len(self._lap_times)
+            return self._lap_times.mean
         if self._last_lap_time is not None and self._last_lap_time > 0:
             return self._last_lap_time
         if lap_last_time is not None and lap_last_time > 0:
             return lap_last_time
         if lap_best_time is not None and lap_best_time > 0:
             return lap_best_time
+        if self._history_prior is not None:
+            return self._history_prior.lap_time_mean
         return None
 
     def _update_tank_capacity_estimate(self, fuel_level: float, fuel_level_pct: Optional[float]) -> None:
@@ -702,21 +1732,13 @@ class FuelConsumptionMonitor:
             return float(session_laps_remain_ex)
         return None
 
-    def _calculate_required_stops(self, laps_to_go: float, current_laps: float, full_tank_laps: float) -> int:
-        if laps_to_go <= current_laps:
-            return 0
-        if full_tank_laps <= 0:
-            return 999
-        return max(0, math.ceil((laps_to_go - current_laps) / full_tank_laps))
-
     def _scenario_average_map(self, avg_per_lap: Optional[float]) -> dict[str, float]:
         if avg_per_lap is None or avg_per_lap <= 0:
             return {}
-        samples = sorted(value for value in self._lap_consumptions if value > 0)
-        if len(samples) >= 4:
-            band_size = max(1, math.ceil(len(samples) * 0.35))
-            save_avg = sum(samples[:band_size]) / band_size
-            push_avg = sum(samples[-band_size:]) / band_size
+        samples = self._lap_consumptions
+        if len(samples) >= 4 and samples.low_band_mean is not None and samples.high_band_mean is not None:
+            save_avg = samples.low_band_mean
+            push_avg = samples.high_band_mean
         else:
             save_avg = avg_per_lap * 0.97
             push_avg = avg_per_lap * 1.03
@@ -729,49 +1751,6 @@ class FuelConsumptionMonitor:
             "push": push_avg,
         }
 
-    def _build_scenario_plan(
-        self,
-        avg_per_lap: float,
-        fuel_level: float,
-        laps_to_go: float,
-    ) -> dict[str, Optional[float]]:
-        current_laps = fuel_level / avg_per_lap if avg_per_lap > 0 else 0.0
-        plan: dict[str, Optional[float]] = {
-            "avg": avg_per_lap,
-            "current_laps": current_laps,
-            "stops": None,
-            "margin_laps": current_laps - laps_to_go,
-            "max_avg_same_stop": None,
-            "save_to_cut_one": None,
-            "push_room_same_stop": None,
-        }
-        if laps_to_go <= 0:
-            plan["stops"] = 0
-            return plan
-        if self._estimated_tank_capacity_l is None or self._estimated_tank_capacity_l <= 0:
-            if current_laps >= laps_to_go:
-                plan["stops"] = 0
-                max_avg_same_stop = fuel_level / laps_to_go
-                plan["max_avg_same_stop"] = max_avg_same_stop
-                plan["push_room_same_stop"] = max(0.0, max_avg_same_stop - avg_per_lap)
-            return plan
-
-        full_tank_laps = self._estimated_tank_capacity_l / avg_per_lap
-        stops = self._calculate_required_stops(laps_to_go, current_laps, full_tank_laps)
-        total_available_laps = current_laps + stops * full_tank_laps
-        max_avg_same_stop = (fuel_level + stops * self._estimated_tank_capacity_l) / laps_to_go
-        plan["stops"] = float(stops)
-        plan["margin_laps"] = total_available_laps - laps_to_go
-        plan["max_avg_same_stop"] = max_avg_same_stop
-        plan["push_room_same_stop"] = max(0.0, max_avg_same_stop - avg_per_lap)
-
-        if stops > 0:
-            max_avg_one_less = (fuel_level + (stops - 1) * self._estimated_tank_capacity_l) / laps_to_go
-            plan["save_to_cut_one"] = max(0.0, avg_per_lap - max_avg_one_less)
-        else:
-            plan["save_to_cut_one"] = 0.0
-        return plan
-
     def _format_stops(self, value: Optional[float]) -> str:
         if value is None:
             return "--"
@@ -783,7 +1762,9 @@ class FuelConsumptionMonitor:
         avg_per_lap: Optional[float],
         fuel_level: float,
         laps_to_go: Optional[float],
+        lap_time_estimate: Optional[float],
     ) -> tuple[str, str, list[str]]:
+        self._last_strategy_result = None
         if avg_per_lap is None or avg_per_lap <= 0 or laps_to_go is None or laps_to_go <= 0:
             return "Race: waiting for session estimate...", "#9fc7ff", []
 
@@ -791,130 +1772,145 @@ class FuelConsumptionMonitor:
         if not scenarios:
             return "Race: waiting for session estimate...", "#9fc7ff", []
 
-        plans = {
-            name: self._build_scenario_plan(value, fuel_level, laps_to_go)
-            for name, value in scenarios.items()
-        }
-        current_plan = plans["current"]
-        save_plan = plans["save"]
-        push_plan = plans["push"]
+        pit_base_loss, fill_rate, fill_curve, pit_line = self._pit_inputs()
+        result = solve_race_strategy(
+            laps_to_go,
+            fuel_level,
+            avg_per_lap,
+            scenarios["save"],
+            scenarios["push"],
+            self._estimated_tank_capacity_l,
+            0.0,
+            lap_time_estimate,
+            pit_base_loss,
+            fill_rate,
+            fill_curve,
+        )
+        self._last_strategy_result = result
 
+        unit = self._unit_label
         lines = [
             (
                 "P/C/S avg: "
                 f"{self._from_liters(scenarios['push']):.2f} / "
                 f"{self._from_liters(scenarios['current']):.2f} / "
-                f"{self._from_liters(scenarios['save']):.2f} {self._unit_label}/lap"
-            )
+                f"{self._from_liters(scenarios['save']):.2f} {unit}/lap"
+            ),
+            pit_line,
         ]
 
-        if current_plan["stops"] is not None:
+        plan = result.best
+        if plan is None:
+            required_avg = max(0.0, fuel_level / laps_to_go)
+            save_needed = max(0.0, avg_per_lap - required_avg)
+            text = (
+                f"Race: ~{laps_to_go:.1f} laps left | save "
+                f"{self._from_liters(save_needed):.2f} {unit}/lap for no-stop"
+            )
+            lines.append(f"No-stop target: {self._from_liters(required_avg):.2f} {unit}/lap")
+            return text, "#ffb86c", lines
+
+        plan_line = f"Plan: {self._format_stops(plan.stops)} @ {self._from_liters(plan.target_per_lap):.2f} {unit}/lap"
+        if plan.stops > 0:
+            plan_line += f", +{self._from_liters(plan.fuel_per_stop):.1f} {unit}/stop"
+        lines.append(plan_line)
+        for alternative in result.by_stops:
+            if alternative.stops == plan.stops:
+                continue
             lines.append(
-                "Stops est: "
-                f"push {self._format_stops(push_plan['stops'])} | "
-                f"cur {self._format_stops(current_plan['stops'])} | "
-                f"save {self._format_stops(save_plan['stops'])}"
+                f"Alt {self._format_stops(alternative.stops)}: "
+                f"{self._from_liters(alternative.target_per_lap):.2f} {unit}/lap, "
+                f"{alternative.race_time_s - plan.race_time_s:+.1f}s"
             )
 
-        if current_plan["stops"] == 0:
-            push_room = current_plan["push_room_same_stop"] or 0.0
-            margin_laps = current_plan["margin_laps"] or 0.0
-            if push_room > 0.02:
+        target_delta = plan.target_per_lap - avg_per_lap
+        if plan.stops == 0:
+            if target_delta > 0.02:
                 text = (
                     f"Race: ~{laps_to_go:.1f} laps left | no-stop on current, "
-                    f"push +{self._from_liters(push_room):.2f} {self._unit_label}/lap safely"
+                    f"push +{self._from_liters(target_delta):.2f} {unit}/lap safely"
                 )
-            elif margin_laps > 0.35:
-                text = f"Race: ~{laps_to_go:.1f} laps left | no-stop is comfortable"
-            else:
+            elif target_delta >= -0.01:
                 text = f"Race: ~{laps_to_go:.1f} laps left | no-stop is on"
-            color = "#6fe38f"
-        elif save_plan["stops"] is not None and current_plan["stops"] is not None and save_plan["stops"] < current_plan["stops"]:
-            save_to_cut = current_plan["save_to_cut_one"] or 0.0
-            if save_to_cut <= 0.01:
-                text = f"Race: ~{laps_to_go:.1f} laps left | 1 stop less looks possible"
-                color = "#6fe38f"
             else:
                 text = (
                     f"Race: ~{laps_to_go:.1f} laps left | save "
-                    f"{self._from_liters(save_to_cut):.2f} {self._unit_label}/lap to cut 1 stop"
+                    f"{self._from_liters(-target_delta):.2f} {unit}/lap for no-stop"
                 )
-                color = "#ffb86c"
-            lines.append(
-                f"Cut 1 stop: save {self._from_liters(max(0.0, save_to_cut)):.2f} {self._unit_label}/lap"
-            )
-        elif push_plan["stops"] is not None and current_plan["stops"] is not None and push_plan["stops"] > current_plan["stops"]:
-            push_room = current_plan["push_room_same_stop"] or 0.0
+        elif target_delta < -0.01:
             text = (
-                f"Race: ~{laps_to_go:.1f} laps left | push risks +1 stop, "
-                f"room is only {self._from_liters(push_room):.2f} {self._unit_label}/lap"
+                f"Race: ~{laps_to_go:.1f} laps left | fastest is {self._format_stops(plan.stops)}, "
+                f"save {self._from_liters(-target_delta):.2f} {unit}/lap"
             )
-            color = "#ff6b6b"
-            lines.append(
-                f"Safe push room: +{self._from_liters(push_room):.2f} {self._unit_label}/lap"
+        elif target_delta > 0.02:
+            text = (
+                f"Race: ~{laps_to_go:.1f} laps left | fastest is {self._format_stops(plan.stops)}, "
+                f"push +{self._from_liters(target_delta):.2f} {unit}/lap"
             )
-        elif current_plan["stops"] is not None:
-            margin_laps = current_plan["margin_laps"] or 0.0
-            if margin_laps >= 0.6:
-                text = (
-                    f"Race: ~{laps_to_go:.1f} laps left | current pace is safe for "
-                    f"{self._format_stops(current_plan['stops'])}"
-                )
-                color = "#6fe38f"
-            else:
-                text = (
-                    f"Race: ~{laps_to_go:.1f} laps left | current pace points to "
-                    f"{self._format_stops(current_plan['stops'])}"
-                )
-                color = "#ffb86c"
         else:
-            required_avg = fuel_level / laps_to_go
-            save_needed = max(0.0, avg_per_lap - required_avg)
             text = (
-                f"Race: ~{laps_to_go:.1f} laps left | save "
-                f"{self._from_liters(save_needed):.2f} {self._unit_label}/lap for no-stop"
-            )
-            color = "#ffb86c"
-            lines.append(
-                f"No-stop target: {self._from_liters(required_avg):.2f} {self._unit_label}/lap"
+                f"Race: ~{laps_to_go:.1f} laps left | fastest is "
+                f"{self._format_stops(plan.stops)} at current pace"
             )
+        lines.extend(self._simulation_lines(plan.stops))
+        color = "#ffb86c" if target_delta < -0.01 else "#6fe38f"
+        return text, color, lines
 
-        cache_key = (
-            round(laps_to_go, 1),
-            round(avg_per_lap, 3),
-            round(scenarios["save"], 3),
-            round(scenarios["push"], 3),
-            round(current_plan["stops"] or -1, 0),
-            round(save_plan["stops"] or -1, 0),
-            round(push_plan["stops"] or -1, 0),
+    def _simulation_lines(self, best_stops: int) -> list[str]:
+        result = self._simulator.latest()
+        if result is not None and result.error:
+            return [f"Finish odds unavailable ({result.error})"]
+        if result is None or not result.plan_odds:
+            return []
+        odds = " | ".join(
+            f"{self._format_stops(entry.stops)} {entry.finish_probability * 100:.0f}%"
+            for entry in result.plan_odds[:3]
+        )
+        lines = [f"Finish odds: {odds}"]
+        for entry in result.plan_odds:
+            if entry.stops == best_stops:
+                lines.append(
+                    f"{FINISH_CONFIDENCE * 100:.0f}% safe ({self._format_stops(entry.stops)}): "
+                    f"{self._from_liters(entry.safe_target_per_lap):.2f} {self._unit_label}/lap"
+                )
+        return lines
+
+    def _maybe_submit_simulation(
+        self,
+        lap: int,
+        usable_fuel: float,
+        session_time_remain: Optional[float],
+        laps_to_go: Optional[float],
+    ) -> None:
+        if lap == self._simulated_lap or laps_to_go is None or laps_to_go <= 0:
+            return
+        if len(self._lap_consumptions) < 3 or self._last_strategy_result is None:
+            return
+        self._simulated_lap = lap
+        self._simulator.submit(
+            SimulationRequest(
+                lap=lap,
+                fuel_samples=tuple(self._lap_consumptions.values()),
+                lap_time_samples=tuple(self._lap_times.values()),
+                usable_fuel=usable_fuel,
+                laps_to_go=laps_to_go,
+                session_time_remain=session_time_remain,
+                tank_capacity=self._estimated_tank_capacity_l,
+                plans=self._last_strategy_result.by_stops,
+            )
         )
-        now = time.time()
-        if now < self._strategy_cache_until and self._strategy_cache_key is not None:
-            old_laps = self._strategy_cache_key[0]
-            old_avg = self._strategy_cache_key[1]
-            old_cur_stops = self._strategy_cache_key[4]
-            if abs(cache_key[0] - old_laps) < 0.4 and abs(cache_key[1] - old_avg) < 0.04 and cache_key[4] == old_cur_stops:
-                return self._strategy_cache_text, self._strategy_cache_color, lines
-
-        self._strategy_cache_text = text
-        self._strategy_cache_color = color
-        self._strategy_cache_key = cache_key
-        self._strategy_cache_until = now + 3.0
-        return text, color, lines
 
     def _filtered_average(self, fallback: Optional[float]) -> Optional[float]:
         if fallback is None:
-            if self._lap_consumptions:
-                return sum(self._lap_consumptions) / len(self._lap_consumptions)
-            return None
+            return self._lap_consumptions.mean
         if self._lap_consumptions:
-            lap_total = sum(self._lap_consumptions)
+            lap_total = self._lap_consumptions.total
             return (lap_total + fallback) / (len(self._lap_consumptions) + 1)
         return fallback
 
     def _stint_average(self, fallback: Optional[float]) -> Optional[float]:
         if self._lap_consumptions:
-            return sum(self._lap_consumptions) / len(self._lap_consumptions)
+            return self._lap_consumptions.mean
         return fallback
 
     def _show_pit_overlay(self, avg_value: Optional[float]) -> None:
@@ -922,11 +1918,17 @@ class FuelConsumptionMonitor:
             text = f"Stint avg\n--.-- {self._unit_label}/Lap"
         else:
             text = f"Stint avg\n{self._from_liters(avg_value):.2f} {self._unit_label}/Lap"
-        self.pit_overlay_label.config(text=text)
+        self._view.config(self.pit_overlay_label, text=text)
+        if self._pit_overlay_visible:
+            return
+        self._pit_overlay_visible = True
         self.pit_overlay_frame.place(x=0, y=0, relwidth=1, relheight=1)
         self.pit_overlay_frame.lift()
 
     def _hide_pit_overlay(self) -> None:
+        if not self._pit_overlay_visible:
+            return
+        self._pit_overlay_visible = False
         self.pit_overlay_frame.place_forget()
 
     def _update_loop(self) -> None:
@@ -957,6 +1959,7 @@ class FuelConsumptionMonitor:
             return
 
         self._update_tank_capacity_estimate(fuel_level, fuel_level_pct)
+        self._update_history_identity(time.time())
         self._update_stint(fuel_level, lap, lapdist, session_flags, lap_last_time)
 
         progress = self._compute_progress(lap, lapdist)
@@ -964,35 +1967,52 @@ class FuelConsumptionMonitor:
         if progress is not None and progress >= self.avg_min_progress:
             assert self._stint is not None
             fuel_used = max(0.0, self._stint.fuel_start - fuel_level)
-            if progress > 0:
-                avg_per_lap = fuel_used / progress
+            fuel_progress = self._compute_fuel_progress(lap, lapdist)
+            if fuel_progress is not None and fuel_progress > 0:
+                avg_per_lap = fuel_used / fuel_progress
 
         avg_per_lap = self._filtered_average(avg_per_lap)
+        history_prior = self._history_prior
+        using_history = avg_per_lap is None and history_prior is not None
+        if using_history:
+            avg_per_lap = history_prior.fuel_mean
         target = self._locked_target if self.lock_target_var.get() else self._parse_target()
 
         if avg_per_lap is None:
-            self.avg_label.config(text=f"--.-- {self._unit_label}/Lap", fg="#c8c8c8")
-            self.delta_label.config(text="(--)", fg="#c8c8c8")
+            self._view.config(self.avg_label, text=f"--.-- {self._unit_label}/Lap", fg="#c8c8c8")
+            self._view.config(self.delta_label, text="(--)", fg="#c8c8c8")
         else:
             display_avg = self._from_liters(avg_per_lap)
             display_target = self._from_liters(target) if target is not None else None
             delta = display_avg - display_target if display_target is not None else None
             within_target = target is not None and avg_per_lap <= target
             avg_color = "#6fe38f" if within_target else "#ff6b6b"
-            self.avg_label.config(text=f"{display_avg:.2f} {self._unit_label}/Lap", fg=avg_color)
+            self._view.config(self.avg_label, text=f"{display_avg:.2f} {self._unit_label}/Lap", fg=avg_color)
             if delta is None:
-                self.delta_label.config(text="(--)", fg="#c8c8c8")
+                self._view.config(self.delta_label, text="(--)", fg="#c8c8c8")
             else:
-                self.delta_label.config(text=f"({delta:+.2f})", fg=avg_color)
+                self._view.config(self.delta_label, text=f"({delta:+.2f})", fg=avg_color)
+
+        self._view.config(self.fuel_label, text=f"Fuel: {self._from_liters(fuel_level):.2f} {self._unit_label}")
 
-        self.fuel_label.config(text=f"Fuel: {self._from_liters(fuel_level):.2f} {self._unit_label}")
+        lap_delta = self._lap_point_delta(fuel_level, lapdist, target)
+        if lap_delta is None:
+            self._view.config(self.lapdelta_label, text="Lap delta: --", fg="#d4d4d4")
+        else:
+            self._view.config(
+                self.lapdelta_label,
+                text=f"Lap delta: {self._from_liters(lap_delta):+.2f} {self._unit_label} @ {lapdist * 100:.0f}%",
+                fg="#6fe38f" if lap_delta <= 0 else "#ff6b6b",
+            )
 
         remaining_laps = None
         if avg_per_lap and avg_per_lap > 0:
             remaining_laps = fuel_level / avg_per_lap
-            self.laps_label.config(text=f"Remaining: {remaining_laps:.1f} laps")
+            if self._fuel_profile.ready:
+                remaining_laps = self._fuel_profile.laps_remaining(fuel_level, avg_per_lap, lapdist)
+            self._view.config(self.laps_label, text=f"Remaining: {remaining_laps:.1f} laps")
         else:
-            self.laps_label.config(text="Remaining: --.- laps")
+            self._view.config(self.laps_label, text="Remaining: --.- laps")
 
         stint_text = "Stint: (C) --; (E) --"
         stint_color = "#d4d4d4"
@@ -1009,8 +2029,10 @@ class FuelConsumptionMonitor:
             avg_per_lap,
             fuel_level,
             session_laps_estimate,
+            lap_time_estimate,
         )
-        self.strategy_label.config(text=strategy_text, fg=strategy_color)
+        self._view.config(self.strategy_label, text=strategy_text, fg=strategy_color)
+        self._maybe_submit_simulation(lap, fuel_level, session_time_remain, session_laps_estimate)
 
         if avg_per_lap and avg_per_lap > 0:
             remaining = fuel_level / avg_per_lap
@@ -1028,7 +2050,7 @@ class FuelConsumptionMonitor:
             else:
                 stint_text = f"Stint: (C) {planned_laps}; (E) {base_laps}"
 
-        self.stint_label.config(text=stint_text, fg=stint_color)
+        self._view.config(self.stint_label, text=stint_text, fg=stint_color)
 
         if self.show_advanced_var.get():
             if avg_per_lap and avg_per_lap > 0:
@@ -1037,6 +2059,12 @@ class FuelConsumptionMonitor:
                 self._plus_one_target = fuel_level / self._plus_one_laps if self._plus_one_laps else None
                 self._minus_one_target = fuel_level / self._minus_one_laps if self._minus_one_laps else None
                 savings_lines: list[str] = []
+                if history_prior is not None:
+                    savings_lines.append(
+                        f"History: {self._from_liters(history_prior.fuel_mean):.2f} "
+                        f"±{self._from_liters(history_prior.fuel_std):.2f} {self._unit_label}/lap "
+                        f"({history_prior.laps} laps)"
+                    )
                 if session_laps_estimate is not None:
                     savings_lines.append(f"Race est: {session_laps_estimate:.1f} laps left")
                 savings_lines.extend(strategy_details)
@@ -1053,10 +2081,11 @@ class FuelConsumptionMonitor:
                         savings_lines.append(
                             f"Use {self._from_liters(spend_more):.2f} {self._unit_label}/lap more = -1 lap"
                         )
-                self.advanced_info_label.config(text="\n".join(savings_lines))
-                self.advanced_stint_label.config(text="", fg=stint_color)
-                self.plus_one_button.config(text="+1 lap", state="normal")
-                self.minus_one_button.config(
+                self._view.config(self.advanced_info_label, text="\n".join(savings_lines))
+                self._view.config(self.advanced_stint_label, text="", fg=stint_color)
+                self._view.config(self.plus_one_button, text="+1 lap", state="normal")
+                self._view.config(
+                    self.minus_one_button,
                     text="-1lap",
                     state="normal" if self._minus_one_target is not None else "disabled",
                 )
@@ -1065,17 +2094,18 @@ class FuelConsumptionMonitor:
                 self._minus_one_target = None
                 self._plus_one_laps = None
                 self._minus_one_laps = None
-                self.advanced_info_label.config(text="Waiting for valid laps to estimate the stint...")
-                self.advanced_stint_label.config(text="", fg="#d4d4d4")
-                self.plus_one_button.config(text="+1 lap", state="disabled")
-                self.minus_one_button.config(text="-1lap", state="disabled")
+                self._view.config(self.advanced_info_label, text="Waiting for valid laps to estimate the stint...")
+                self._view.config(self.advanced_stint_label, text="", fg="#d4d4d4")
+                self._view.config(self.plus_one_button, text="+1 lap", state="disabled")
+                self._view.config(self.minus_one_button, text="-1lap", state="disabled")
 
         if self._last_lap_used is not None:
-            self.lastlap_label.config(
+            self._view.config(
+                self.lastlap_label,
                 text=f"Last lap: {self._from_liters(self._last_lap_used):.2f} {self._unit_label}"
             )
         else:
-            self.lastlap_label.config(text=f"Last lap: --.- {self._unit_label}")
+            self._view.config(self.lastlap_label, text=f"Last lap: --.- {self._unit_label}")
 
         now = time.time()
         if on_pit_road and not self._last_on_pitroad:
@@ -1085,16 +2115,22 @@ class FuelConsumptionMonitor:
         self._last_on_pitroad = on_pit_road
 
         if now < self._pit_hold_until:
-            self.status_label.config(text="PIT")
+            self._view.config(self.status_label, text="PIT")
+        elif using_history and history_prior is not None:
+            self._view.config(
+                self.status_label,
+                text=f"History prior ({history_prior.laps} laps, ±{self._from_liters(history_prior.fuel_std):.2f})"
+            )
         elif self._stint is not None:
-            self.status_label.config(text="Stint tracking")
+            self._view.config(self.status_label, text="Stint tracking")
 
         if now < self._pit_overlay_until:
             self._show_pit_overlay(self._pit_overlay_value)
         else:
             self._hide_pit_overlay()
 
-        self._refresh_layout()
+        if self._view.take_changed():
+            self._refresh_layout()
         self.root.after(100, self._update_loop)
 
     def _start_move(self, event: tk.Event) -> None:
@@ -1123,6 +2159,8 @@ class FuelConsumptionMonitor:
 
     def _on_close(self, event: tk.Event | None = None) -> None:
         self._save_window_position()
+        self._simulator.stop()
+        self._history.close()
         try:
             self.close_window.destroy()
         except Exception:
@@ -1202,8 +2240,8 @@ class FuelConsumptionMonitor:
         y = self.root.winfo_y() - 12
         try:
             self.close_window.geometry(f"28x28+{x}+{y}")
-            self.strategy_label.configure(wraplength=max(self.WINDOW_MIN_WIDTH - 32, width - 24))
-            self.advanced_info_label.configure(wraplength=max(self.WINDOW_MIN_WIDTH - 32, width - 24))
+            self._view.config(self.strategy_label, wraplength=max(self.WINDOW_MIN_WIDTH - 32, width - 24))
+            self._view.config(self.advanced_info_label, wraplength=max(self.WINDOW_MIN_WIDTH - 32, width - 24))
             if self._close_button_visible:
                 self.close_window.deiconify()
                 self.close_window.lift()
@@ -1214,6 +2252,7 @@ class FuelConsumptionMonitor:
         self.root.update_idletasks()
         width = self._get_window_width()
         height = self._get_window_height()
+        self._layout_size = (width, height)
         position = self._load_window_position()
         if position is None and default_pos is not None:
             position = default_pos
@@ -1226,11 +2265,13 @@ class FuelConsumptionMonitor:
         self._sync_close_button_position()
 
     def _refresh_layout(self) -> None:
-        self.root.update_idletasks()
-        x = self.root.winfo_x()
-        y = self.root.winfo_y()
         width = self._get_window_width()
         height = self._get_window_height()
+        if (width, height) == self._layout_size:
+            return
+        self._layout_size = (width, height)
+        x = self.root.winfo_x()
+        y = self.root.winfo_y()
         self.root.geometry(f"{width}x{height}+{x}+{y}")
         self._sync_close_button_position()
 
@@ -1255,11 +2296,24 @@ class FuelConsumptionMonitor:
         )
         return max(min_height, content_height)
 
-    def _load_window_position(self) -> Optional[tuple[int, int]]:
+    def _read_saved_state(self) -> dict:
         try:
             data = json.loads(self._position_path.read_text(encoding="utf-8"))
         except (OSError, json.JSONDecodeError):
-            return None
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write_saved_state(self, **values: object) -> None:
+        # Window position and pit settings share one file; keep the keys not being written.
+        data = self._read_saved_state()
+        data.update(values)
+        try:
+            self._position_path.write_text(json.dumps(data), encoding="utf-8")
+        except OSError:
+            pass
+
+    def _load_window_position(self) -> Optional[tuple[int, int]]:
+        data = self._read_saved_state()
         x = data.get("x")
         y = data.get("y")
         if isinstance(x, int) and isinstance(y, int):
@@ -1267,13 +2321,7 @@ class FuelConsumptionMonitor:
         return None
 
     def _save_window_position(self) -> None:
-        try:
-            self._position_path.write_text(
-                json.dumps({"x": self.root.winfo_x(), "y": self.root.winfo_y()}),
-                encoding="utf-8",
-            )
-        except OSError:
-            pass
+        self._write_saved_state(x=self.root.winfo_x(), y=self.root.winfo_y())
 
 
 def main() -> int:
@@ -13,18 +13,32 @@ Install:
     pip install irsdk numpy pyqt5
 Run:
     python Nishizumi_TireWear.py
+Warm-start the model from recorded telemetry:
+    python Nishizumi_TireWear.py --train-ibt "<folder with .ibt files>"
+Pick each car/track's forgetting factor from its stint history:
+    python Nishizumi_TireWear.py --tune-lam
 """
 from __future__ import annotations
+import argparse
+import gc
 import json
+import multiprocessing
 import os
 import queue
 import re
 import signal
+import sqlite3
+import sys
 import threading
 import time
-from dataclasses import dataclass
+import tracemalloc
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from multiprocessing import shared_memory
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 from PyQt5 import QtCore, QtGui, QtWidgets
@@ -40,7 +54,8 @@ def _get_appdata_dir() -> Path:
 
 
 APPDATA_DIR = _get_appdata_dir()
-MODEL_PATH = str(APPDATA_DIR / "nishizumi_tirewear_model.json")
+MODEL_PATH = str(APPDATA_DIR / "nishizumi_tirewear_model.sqlite3")
+LEGACY_MODEL_PATH = str(APPDATA_DIR / "nishizumi_tirewear_model.json")
 SETTINGS_PATH = str(APPDATA_DIR / "nishizumi_tirewear_settings.json")
 TIRE_KEYS = ("lf", "rf", "lr", "rr")
 WEAR_FIELDS = {
@@ -56,6 +71,10 @@ INNER_WEAR_INDEX = {
     "lr": 2,
     "rr": 0,
 }
+# Live estimates are recomputed from the newest snapshot at this rate; integration runs at the full 60 Hz.
+ESTIMATE_HZ = 10.0
+# Lap energy is also binned by LapDistPct into this many equal track sectors for wear attribution.
+SECTOR_BINS = 20
 PIT_TIRE_CHANGE_FLAGS = {
     "lf": 0x0001,
     "rf": 0x0002,
@@ -64,74 +83,344 @@ PIT_TIRE_CHANGE_FLAGS = {
 }
 
 
-@dataclass
 class TelemetrySnapshot:
-    """Immutable snapshot of telemetry values consumed by the model worker."""
-
-    session_time: float
-    lap: int
-    lap_dist_pct: float
-    on_pit_road: bool
-    speed_mps: float
-    lat_accel: float
-    long_accel: float
-    steering: float
-    track_temp: float
-    air_temp: float
-    humidity: float
-    pit_sv_flags: int
-    wear: Dict[str, float]
-    track_name: str
-    track_config: str
-    car_path: str
-
-
-class DataStorage:
-    """Thread-safe JSON persistence for learned tire model samples."""
-
-    def __init__(self, path: str = MODEL_PATH):
+    """Snapshot of telemetry values consumed by the model worker.
+
+    Slotted, with the four inner-shoulder wear values stored inline, so the
+    reader allocates a single small object per 60 Hz tick. ``wear`` builds a
+    dict on demand for the pit and stint-boundary code that needs one.
+    """
+
+    __slots__ = (
+        "session_time",
+        "lap",
+        "lap_dist_pct",
+        "on_pit_road",
+        "speed_mps",
+        "lat_accel",
+        "long_accel",
+        "steering",
+        "track_temp",
+        "air_temp",
+        "humidity",
+        "pit_sv_flags",
+        "wear_lf",
+        "wear_rf",
+        "wear_lr",
+        "wear_rr",
+        "track_name",
+        "track_config",
+        "car_path",
+        "captured_at",
+        "car_class",
+    )
+
+    def __init__(
+        self,
+        session_time: float,
+        lap: int,
+        lap_dist_pct: float,
+        on_pit_road: bool,
+        speed_mps: float,
+        lat_accel: float,
+        long_accel: float,
+        steering: float,
+        track_temp: float,
+        air_temp: float,
+        humidity: float,
+        pit_sv_flags: int,
+        wear: Dict[str, float],
+        track_name: str,
+        track_config: str,
+        car_path: str,
+        captured_at: float = 0.0,
+        car_class: str = "",
+    ):
+        self.session_time = session_time
+        self.lap = lap
+        self.lap_dist_pct = lap_dist_pct
+        self.on_pit_road = on_pit_road
+        self.speed_mps = speed_mps
+        self.lat_accel = lat_accel
+        self.long_accel = long_accel
+        self.steering = steering
+        self.track_temp = track_temp
+        self.air_temp = air_temp
+        self.humidity = humidity
+        self.pit_sv_flags = pit_sv_flags
+        self.wear_lf = float(wear["lf"])
+        self.wear_rf = float(wear["rf"])
+        self.wear_lr = float(wear["lr"])
+        self.wear_rr = float(wear["rr"])
+        self.track_name = track_name
+        self.track_config = track_config
+        self.car_path = car_path
+        self.captured_at = captured_at
+        self.car_class = car_class
+
+    @property
+    def wear(self) -> Dict[str, float]:
+        return {"lf": self.wear_lf, "rf": self.wear_rf, "lr": self.wear_lr, "rr": self.wear_rr}
+
+
+ENV_CHANNELS = ("track_temp", "air_temp", "humidity")
+ENV_FIELDS = (
+    ENV_CHANNELS
+    + tuple(f"{channel}_{stat}" for channel in ENV_CHANNELS for stat in ("avg", "start", "end", "delta", "std", "slope"))
+    + ("env_elapsed",)
+)
+ENV_INDEX = {name: i for i, name in enumerate(ENV_FIELDS)}
+_ENV_DIM = len(ENV_FIELDS)
+
+
+def env_vector_to_dict(env: np.ndarray) -> Dict[str, float]:
+    return {name: float(env[i]) for i, name in enumerate(ENV_FIELDS)}
+
+
+class ModelStore:
+    """SQLite store for learned tire model samples and fitted estimators.
+
+    Samples are append-only rows indexed by dataset key, and each key's fitted
+    estimator is a single upserted row, so learning a stint costs two small
+    writes instead of rewriting every key. Keys are read lazily when the model
+    asks for them. A legacy whole-file JSON model is imported once on first open.
+    """
+
+    COMPACT_FREE_FRACTION = 0.25
+
+    def __init__(self, path: str = MODEL_PATH, legacy_json_path: Optional[str] = LEGACY_MODEL_PATH):
         self.path = path
         self.lock = threading.Lock()
-        self.data = self._load()
-        self._ensure_model_file_exists()
-
-    def _ensure_model_file_exists(self):
-        """Create an empty model file so persistence is visible before first sample."""
-        if os.path.exists(self.path):
+        self._conn = self._connect()
+        if legacy_json_path:
+            self._import_legacy_json(legacy_json_path)
+        self._compact_if_fragmented()
+
+    def _connect(self) -> sqlite3.Connection:
+        schema = """
+            CREATE TABLE IF NOT EXISTS samples (
+                id INTEGER PRIMARY KEY,
+                dataset_key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                recorded_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_samples_key ON samples (dataset_key);
+            CREATE TABLE IF NOT EXISTS models (
+                dataset_key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """
+        try:
+            # Shared between the thread that builds the model and the one using it; self.lock serialises access.
+            conn = sqlite3.connect(self.path, timeout=2.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(schema)
+            return conn
+        except sqlite3.Error:
+            # Non-fatal: learning can still proceed for this session without persistence.
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            conn.executescript(schema)
+            return conn
+
+    def _import_legacy_json(self, json_path: str):
+        try:
+            with self.lock:
+                if self._conn.execute("SELECT 1 FROM meta WHERE name = 'legacy_json_imported'").fetchone():
+                    return
+            if os.path.exists(json_path):
+                with open(json_path, "r", encoding="utf-8") as f:
+                    raw = json.load(f)
+            else:
+                raw = {}
+        except (sqlite3.Error, OSError, ValueError):
             return
+
+        now = time.time()
+        sample_rows = []
+        model_rows = []
+        for key, entry in (raw.items() if isinstance(raw, dict) else ()):
+            if not isinstance(entry, dict):
+                continue
+            if key.endswith("::rls"):
+                model_rows.append((key[: -len("::rls")], json.dumps(entry), now))
+                continue
+            for sample in entry.get("samples", []):
+                if isinstance(sample, dict):
+                    sample_rows.append((key, json.dumps(sample), now))
+
         try:
-            with open(self.path, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, indent=2)
-        except Exception:
-            # Non-fatal: learning can still proceed and save later.
+            with self.lock, self._conn:
+                self._conn.executemany("INSERT INTO samples (dataset_key, payload, recorded_at) VALUES (?, ?, ?)", sample_rows)
+                self._conn.executemany("INSERT OR REPLACE INTO models (dataset_key, payload, updated_at) VALUES (?, ?, ?)", model_rows)
+                self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('legacy_json_imported', ?)", (str(now),))
+        except sqlite3.Error:
             pass
 
-    def _load(self) -> Dict[str, dict]:
-        if not os.path.exists(self.path):
-            return {}
+    def _compact_if_fragmented(self):
         try:
-            with open(self.path, "r", encoding="utf-8") as f:
-                raw = json.load(f)
-            return raw if isinstance(raw, dict) else {}
-        except Exception:
-            return {}
+            with self.lock:
+                pages = self._conn.execute("PRAGMA page_count").fetchone()[0]
+                free = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        except sqlite3.Error:
+            return
+        if pages > 0 and free / pages > self.COMPACT_FREE_FRACTION:
+            self.compact()
 
-    def save(self):
+    def compact(self):
+        """Fold the WAL back into the database file and reclaim free pages."""
         with self.lock:
-            tmp = self.path + ".tmp"
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, indent=2)
-            os.replace(tmp, self.path)
+            try:
+                self._conn.execute("VACUUM")
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error:
+                pass
+
+    def dataset_keys(self) -> List[str]:
+        with self.lock:
+            try:
+                rows = self._conn.execute("SELECT DISTINCT dataset_key FROM samples ORDER BY dataset_key").fetchall()
+            except sqlite3.Error:
+                return []
+        return [str(row[0]) for row in rows]
 
     def get_samples(self, key: str) -> List[dict]:
         with self.lock:
-            return list(self.data.get(key, {}).get("samples", []))
+            try:
+                rows = self._conn.execute("SELECT payload FROM samples WHERE dataset_key = ? ORDER BY id", (key,)).fetchall()
+            except sqlite3.Error:
+                return []
+        return [json.loads(row[0]) for row in rows]
 
     def add_sample(self, key: str, sample: dict):
         with self.lock:
-            if key not in self.data:
-                self.data[key] = {"samples": []}
-            self.data[key]["samples"].append(sample)
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT INTO samples (dataset_key, payload, recorded_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(sample), time.time()),
+                    )
+            except sqlite3.Error:
+                pass
+
+    def add_samples(self, key: str, samples: Sequence[dict]):
+        now = time.time()
+        with self.lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO samples (dataset_key, payload, recorded_at) VALUES (?, ?, ?)",
+                        [(key, json.dumps(sample), now) for sample in samples],
+                    )
+            except sqlite3.Error:
+                pass
+
+    def get_meta(self, name: str) -> Optional[str]:
+        with self.lock:
+            try:
+                row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+            except sqlite3.Error:
+                return None
+        return None if row is None else str(row[0])
+
+    def set_meta(self, name: str, value: str):
+        with self.lock:
+            try:
+                with self._conn:
+                    self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+            except sqlite3.Error:
+                pass
+
+    def get_model(self, key: str) -> dict:
+        with self.lock:
+            try:
+                row = self._conn.execute("SELECT payload FROM models WHERE dataset_key = ?", (key,)).fetchone()
+            except sqlite3.Error:
+                return {}
+        if row is None:
+            return {}
+        try:
+            raw = json.loads(row[0])
+        except ValueError:
+            return {}
+        return raw if isinstance(raw, dict) else {}
+
+    def put_model(self, key: str, model: dict) -> Optional[float]:
+        """Upsert a key's estimator; returns its new model_updated_at stamp, None if not stored."""
+        updated_at = time.time()
+        with self.lock:
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO models (dataset_key, payload, updated_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(model), updated_at),
+                    )
+            except sqlite3.Error:
+                return None
+        return updated_at
+
+    def model_updated_at(self, key: str) -> Optional[float]:
+        with self.lock:
+            try:
+                row = self._conn.execute("SELECT updated_at FROM models WHERE dataset_key = ?", (key,)).fetchone()
+            except sqlite3.Error:
+                return None
+        return float(row[0]) if row else None
+
+    def model_payloads(self) -> List[Tuple[str, dict]]:
+        with self.lock:
+            try:
+                rows = self._conn.execute("SELECT dataset_key, payload FROM models").fetchall()
+            except sqlite3.Error:
+                return []
+        out = []
+        for key, payload in rows:
+            try:
+                raw = json.loads(payload)
+            except ValueError:
+                continue
+            if isinstance(raw, dict):
+                out.append((str(key), raw))
+        return out
+
+    def car_classes(self) -> Dict[str, str]:
+        """Car class of each dataset key, as recorded from the session info."""
+        with self.lock:
+            try:
+                rows = self._conn.execute("SELECT name, value FROM meta WHERE name LIKE 'class:%'").fetchall()
+            except sqlite3.Error:
+                return {}
+        return {str(name)[len("class:"):]: str(value) for name, value in rows}
+
+    def recent_model_keys(self, limit: int) -> List[str]:
+        with self.lock:
+            try:
+                rows = self._conn.execute("SELECT dataset_key FROM models ORDER BY updated_at DESC LIMIT ?", (int(limit),)).fetchall()
+            except sqlite3.Error:
+                return []
+        return [row[0] for row in rows]
+
+    def clear(self):
+        with self.lock:
+            try:
+                with self._conn:
+                    self._conn.execute("DELETE FROM samples")
+                    self._conn.execute("DELETE FROM models")
+            except sqlite3.Error:
+                pass
+        self.compact()
+
+    def close(self):
+        with self.lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
 
 
 FEATURE_NAMES = [
@@ -150,6 +439,14 @@ FEATURE_NAMES = [
 ]
 _PHI_DIM = len(FEATURE_NAMES)
 
+DEFAULT_LAM = 0.98
+FORECAST_LAPS = 60
+FORECAST_BAND_Z = 1.28  # two-sided ~80 % band
+MAD_TO_SIGMA = float(np.sqrt(np.pi / 2.0))  # mad_error tracks E|e|; sigma = E|e| * sqrt(pi/2) for Gaussian noise
+LAM_CANDIDATES = (0.90, 0.93, 0.95, 0.97, 0.98, 0.99, 0.995, 1.0)
+LAM_TUNE_BURN_IN = 6
+LAM_TUNE_MIN_SAMPLES = 16
+
 
 def _env_value(env: Optional[Dict[str, float]], name: str, legacy_name: Optional[str] = None, default: float = 0.0) -> float:
     if not env:
@@ -198,28 +495,196 @@ def _phi_from_env_context(env: Optional[Dict[str, float]], energy_per_lap: float
     )
 
 
-class RLSEstimator:
-    """Single-target recursive least squares estimator."""
+_I_T_AVG = ENV_INDEX["track_temp_avg"]
+_I_T_END = ENV_INDEX["track_temp_end"]
+_I_T_DELTA = ENV_INDEX["track_temp_delta"]
+_I_T_STD = ENV_INDEX["track_temp_std"]
+_I_AIR_AVG = ENV_INDEX["air_temp_avg"]
+_I_AIR_DELTA = ENV_INDEX["air_temp_delta"]
+_I_HUM_AVG = ENV_INDEX["humidity_avg"]
+_I_HUM_DELTA = ENV_INDEX["humidity_delta"]
+
+
+def _phi_from_env_vector(env: np.ndarray, energy_per_lap: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Same features as _phi_from_env_context, read from an ENV_FIELDS vector into ``out``."""
+    phi = np.empty(_PHI_DIM, dtype=float) if out is None else out
+    e_lap = float(energy_per_lap)
+    t_avg = env[_I_T_AVG]
+    t_delta = env[_I_T_DELTA]
+    phi[0] = 1.0
+    phi[1] = t_avg
+    phi[2] = env[_I_T_END]
+    phi[3] = t_delta
+    phi[4] = max(0.0, env[_I_T_STD])
+    phi[5] = env[_I_AIR_AVG]
+    phi[6] = env[_I_AIR_DELTA]
+    phi[7] = env[_I_HUM_AVG]
+    phi[8] = env[_I_HUM_DELTA]
+    phi[9] = e_lap
+    phi[10] = t_avg * e_lap
+    phi[11] = t_delta * e_lap
+    return phi
+
+
+def _phi_rows_from_env(envs: np.ndarray, energy_per_lap: float) -> np.ndarray:
+    """Row-wise _phi_from_env_vector for an (n, ENV_FIELDS) matrix."""
+    e_lap = float(energy_per_lap)
+    t_avg = envs[:, _I_T_AVG]
+    t_delta = envs[:, _I_T_DELTA]
+    phi = np.empty((envs.shape[0], _PHI_DIM), dtype=float)
+    phi[:, 0] = 1.0
+    phi[:, 1] = t_avg
+    phi[:, 2] = envs[:, _I_T_END]
+    phi[:, 3] = t_delta
+    phi[:, 4] = np.maximum(0.0, envs[:, _I_T_STD])
+    phi[:, 5] = envs[:, _I_AIR_AVG]
+    phi[:, 6] = envs[:, _I_AIR_DELTA]
+    phi[:, 7] = envs[:, _I_HUM_AVG]
+    phi[:, 8] = envs[:, _I_HUM_DELTA]
+    phi[:, 9] = e_lap
+    phi[:, 10] = t_avg * e_lap
+    phi[:, 11] = t_delta * e_lap
+    return phi
+
+
+_ENV_STAT_COLUMNS = len(ENV_CHANNELS) + 6 * np.arange(len(ENV_CHANNELS))
+
+
+def _project_environment(env: np.ndarray, seconds_ahead: np.ndarray) -> np.ndarray:
+    """ENV_FIELDS rows with every channel carried ``seconds_ahead`` further along its stint slope.
+
+    A trend is extrapolated no further ahead than the stint has been observed;
+    beyond that the channel is held at the value it reached.
+    """
+    dt = np.asarray(seconds_ahead, dtype=float)[:, None]
+    rows = np.repeat(env[None, :], dt.shape[0], axis=0)
+    cols = _ENV_STAT_COLUMNS
+    elapsed = float(env[_ENV_DIM - 1])
+    avg, start, end, slope = env[cols], env[cols + 1], env[cols + 2], env[cols + 5]
+
+    trend_dt = np.minimum(dt, elapsed)
+    end_ahead = end + slope * trend_dt
+    # The stint average keeps integrating the projected path: the ramp, then the held value.
+    integral = end * dt + slope * (0.5 * trend_dt * trend_dt + trend_dt * (dt - trend_dt))
+    avg_ahead = (avg * elapsed + integral) / np.maximum(elapsed + dt, 1e-9)
+    rows[:, : len(ENV_CHANNELS)] = avg_ahead
+    rows[:, cols] = avg_ahead
+    rows[:, cols + 2] = end_ahead
+    rows[:, cols + 3] = end_ahead - start
+    rows[:, _ENV_DIM - 1] = elapsed + dt[:, 0]
+    return rows
+
+
+def forecast_crossings(forecast: np.ndarray, threshold: float) -> np.ndarray:
+    """Laps ahead at which each tire's tread reaches ``threshold``, from a TireMLModel.forecast array.
+
+    Returns an int array (3, tires) of [expected, earliest, latest] crossing
+    laps from the central line and the two band edges; -1 means not within
+    the forecast horizon.
+    """
+    mean, band = forecast[0], forecast[1]
+    below = np.stack([mean <= threshold, mean - band <= threshold, mean + band <= threshold])
+    return np.where(below.any(axis=1), below.argmax(axis=1), -1)
+
+
+def sector_wear(lap_energy_bins: np.ndarray, stint_energy_bins: np.ndarray, laps: int, rates_per_energy: np.ndarray) -> np.ndarray:
+    """Predicted tread loss per track sector and tire: [last lap, stint mean per lap], shape (2, SECTOR_BINS, tires)."""
+    energy = np.stack([lap_energy_bins, stint_energy_bins / max(1, laps)])
+    out = energy[:, :, None] * rates_per_energy[None, None, :]
+    out.setflags(write=False)
+    return out
+
+
+class MultiTargetRLS:
+    """Recursive least squares for several targets that share one feature vector.
 
-    def __init__(self, lam: float = 0.98, sigma0: float = 1e4):
+    Every target is updated with the same ``x`` and forgetting factor, so the
+    covariance ``P`` is identical across targets and is kept once. ``theta``
+    holds one column per target (the four tires today, per-zone tread later).
+    """
+
+    FORMAT_VERSION = 2
+    MAD_DECAY = 0.95
+    # Samples whose forgetting weight falls below lam**k ~ 1e-200 are dropped from batch fits.
+    MAX_LOG_FORGET = 460.0
+
+    def __init__(self, targets: Sequence[str] = TIRE_KEYS, lam: float = DEFAULT_LAM, sigma0: float = 1e4):
+        self.targets = tuple(targets)
         self.lam = float(lam)
-        self.theta = np.zeros(_PHI_DIM, dtype=float)
+        self.theta = np.zeros((_PHI_DIM, len(self.targets)), dtype=float)
         self.P = float(sigma0) * np.eye(_PHI_DIM, dtype=float)
         self.n_updates = 0
-        self.mad_error = 1e-4
+        self.mad_error = np.full(len(self.targets), 1e-4, dtype=float)
 
-    def update(self, x: np.ndarray, y: float) -> float:
+    def index(self, target: str) -> int:
+        return self.targets.index(target)
+
+    def update(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
         px = self.P @ x
         gain = px / (self.lam + float(x @ px))
-        error = float(y) - float(x @ self.theta)
-        self.theta += gain * error
+        error = np.asarray(y, dtype=float) - x @ self.theta
+        self.theta += np.outer(gain, error)
         self.P = (self.P - np.outer(gain, px)) / self.lam
         self.n_updates += 1
-        self.mad_error = 0.95 * self.mad_error + 0.05 * abs(error)
+        self.mad_error = self.MAD_DECAY * self.mad_error + (1.0 - self.MAD_DECAY) * np.abs(error)
         return error
 
-    def predict(self, x: np.ndarray) -> float:
-        return max(0.0, float(x @ self.theta))
+    @classmethod
+    def batch_solve(cls, X: np.ndarray, Y: np.ndarray, lam: float, sigma0: float = 1e4) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Closed-form equivalent of feeding ``X``/``Y`` row by row through ``update``.
+
+        RLS with forgetting solves the weighted normal equations
+        ``(lam**n / sigma0 * I + sum lam**(n-1-i) x_i x_i^T) theta = sum lam**(n-1-i) x_i y_i``,
+        so every prefix solution comes from cumulative sums and one batched
+        solve. Returns the final ``theta`` and ``P`` plus the a-priori error of
+        each row (the error ``update`` would have returned for it).
+        """
+        X = np.asarray(X, dtype=float)
+        Y = np.asarray(Y, dtype=float)
+        n, dim = X.shape
+        if n == 0:
+            return np.zeros((dim, Y.shape[1])), float(sigma0) * np.eye(dim), np.zeros_like(Y)
+
+        keep = n if lam >= 1.0 else min(n, int(cls.MAX_LOG_FORGET / -np.log(lam)))
+        X_fit, Y_fit = X[n - keep :], Y[n - keep :]
+        # Scaled by lam**-(i+1) so the cumulative sums need no per-prefix reweighting.
+        w = lam ** -np.arange(1.0, keep + 1.0)
+        A = np.cumsum(w[:, None, None] * X_fit[:, :, None] * X_fit[:, None, :], axis=0) + np.eye(dim) / sigma0
+        B = np.cumsum(w[:, None, None] * X_fit[:, :, None] * Y_fit[:, None, :], axis=0)
+
+        # Features are unscaled (temperatures next to energy products), so equilibrate first.
+        # Collinear features (a constant air temperature next to the bias) leave the system
+        # singular once the prior's weight underflows; the pseudo-inverse then gives the
+        # minimum-norm solution that the recursive form drifts towards.
+        d = 1.0 / np.sqrt(np.diagonal(A, axis1=1, axis2=2))
+        A_inv = np.linalg.pinv(A * d[:, :, None] * d[:, None, :], rcond=1e-12, hermitian=True)
+        thetas = d[:, :, None] * (A_inv @ (B * d[:, :, None]))
+
+        errors = np.empty_like(Y)
+        # Rows before the kept window (and its first row) are predicted from the zero prior.
+        errors[: n - keep + 1] = Y[: n - keep + 1]
+        errors[n - keep + 1 :] = Y_fit[1:] - np.einsum("ij,ijk->ik", X_fit[1:], thetas[:-1])
+        P = lam**-keep * (d[-1][:, None] * A_inv[-1] * d[-1][None, :])
+        return thetas[-1], P, errors
+
+    @classmethod
+    def fit(cls, X: np.ndarray, Y: np.ndarray, targets: Sequence[str] = TIRE_KEYS, lam: float = DEFAULT_LAM, sigma0: float = 1e4) -> "MultiTargetRLS":
+        """Estimator in the same state as after ``update`` over every row of ``X``/``Y``."""
+        obj = cls(targets, lam=lam, sigma0=sigma0)
+        n = len(X)
+        if n == 0:
+            return obj
+        obj.theta, obj.P, errors = cls.batch_solve(X, Y, lam, sigma0)
+        obj.n_updates = n
+        decay = cls.MAD_DECAY ** np.arange(n - 1, -1, -1, dtype=float)
+        obj.mad_error = cls.MAD_DECAY**n * obj.mad_error + (1.0 - cls.MAD_DECAY) * (decay @ np.abs(errors))
+        return obj
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        return np.maximum(0.0, x @ self.theta)
+
+    def prediction_variance(self, x: np.ndarray) -> float:
+        return float(x @ self.P @ x)
 
     @property
     def confidence(self) -> float:
@@ -231,40 +696,225 @@ class RLSEstimator:
 
     def to_dict(self) -> dict:
         return {
+            "format": self.FORMAT_VERSION,
+            "targets": list(self.targets),
             "theta": self.theta.tolist(),
-            "P": [r.tolist() for r in self.P],
+            "P": self.P.tolist(),
             "n_updates": int(self.n_updates),
             "lam": float(self.lam),
-            "mad_error": float(self.mad_error),
+            "mad_error": self.mad_error.tolist(),
         }
 
     @classmethod
-    def from_dict(cls, data: dict) -> "RLSEstimator":
-        obj = cls(lam=float(data.get("lam", 0.98)))
-        theta = np.array(data.get("theta", np.zeros(_PHI_DIM)), dtype=float)
-        P = np.array(data.get("P", np.eye(_PHI_DIM) * 1e4), dtype=float)
-        if theta.shape != (_PHI_DIM,) or P.shape != (_PHI_DIM, _PHI_DIM):
+    def from_dict(cls, data: dict, targets: Sequence[str] = TIRE_KEYS) -> "MultiTargetRLS":
+        if int(data.get("format", 1)) < cls.FORMAT_VERSION:
+            return cls.from_legacy(data, targets)
+
+        obj = cls(targets, lam=float(data.get("lam", DEFAULT_LAM)))
+        if list(data.get("targets", [])) != list(obj.targets):
+            return obj
+        theta = np.array(data.get("theta", obj.theta), dtype=float)
+        P = np.array(data.get("P", obj.P), dtype=float)
+        mad = np.array(data.get("mad_error", obj.mad_error), dtype=float)
+        if theta.shape != obj.theta.shape or P.shape != obj.P.shape or mad.shape != obj.mad_error.shape:
             return obj
         obj.theta = theta
         obj.P = P
         obj.n_updates = int(data.get("n_updates", 0))
-        obj.mad_error = max(1e-6, float(data.get("mad_error", 1e-4)))
+        obj.mad_error = np.maximum(1e-6, mad)
         return obj
 
+    @classmethod
+    def from_legacy(cls, data: dict, targets: Sequence[str] = TIRE_KEYS) -> "MultiTargetRLS":
+        """Migrate the old layout that stored one full estimator per tire."""
+        obj = cls(targets)
+        entries = [data.get(t) for t in obj.targets]
+        if not all(isinstance(e, dict) for e in entries):
+            return obj
+
+        thetas = [np.array(e.get("theta", []), dtype=float) for e in entries]
+        P = np.array(entries[0].get("P", []), dtype=float)
+        if any(t.shape != (_PHI_DIM,) for t in thetas) or P.shape != (_PHI_DIM, _PHI_DIM):
+            return obj
+
+        obj.lam = float(entries[0].get("lam", DEFAULT_LAM))
+        obj.theta = np.column_stack(thetas)
+        obj.P = P
+        obj.n_updates = min(int(e.get("n_updates", 0)) for e in entries)
+        obj.mad_error = np.array([max(1e-6, float(e.get("mad_error", 1e-4))) for e in entries], dtype=float)
+        return obj
+
+
+def _car_class_name(driver: dict) -> str:
+    # Short names ("GT3 Class") are missing from some payloads; the numeric id still groups cars.
+    name = str(driver.get("CarClassShortName") or "").strip()
+    if name:
+        return name
+    class_id = driver.get("CarClassID")
+    return f"class {class_id}" if class_id not in (None, "") else ""
+
+
+def _split_dataset_key(key: str) -> Optional[Tuple[str, str, str]]:
+    parts = key.split("+")
+    return (parts[0], parts[1], parts[2]) if len(parts) == 3 else None
+
+
+def _car_tokens(car: str) -> frozenset:
+    # "mx5_mx52016" -> {mx5, mx52016, mx}: the alphabetic stems match variants of one car family.
+    tokens = [t for t in re.split(r"[^a-z0-9]+", car) if t]
+    stems = [m.group(0) for m in (re.match(r"[a-z]+", t) for t in tokens) if m]
+    return frozenset(tokens + stems)
+
+
+class KeyPriorIndex:
+    """Fitted coefficients of every stored dataset key, for cold-start priors on unseen keys.
+
+    A key's neighbours are scored as car similarity (1 for the same car,
+    otherwise the token overlap of the car paths, raised to CLASS_SIMILARITY
+    when both cars are known to race in the same class) times a track factor
+    (1 for the same track and config, 0.88 for another config, 0.6 for
+    another track). The best TOP_K above MIN_SIMILARITY are averaged, weighted by
+    score and by their own RLS confidence. The blend is computed once per
+    queried key and cached.
+    """
+
+    TOP_K = 3
+    MIN_SIMILARITY = 0.25
+    CLASS_SIMILARITY = 0.7
+
+    def __init__(self, models: Sequence[Tuple[str, MultiTargetRLS]], classes: Optional[Dict[str, str]] = None):
+        self._entries: Dict[str, Tuple[Tuple[str, str, str], frozenset, np.ndarray, float]] = {}
+        self._priors: Dict[str, Optional[np.ndarray]] = {}
+        self._classes: Dict[str, str] = dict(classes or {})
+        for key, rls in models:
+            self.update(key, rls)
+
+    @classmethod
+    def from_store(cls, storage: ModelStore) -> "KeyPriorIndex":
+        models = []
+        for key, raw in storage.model_payloads():
+            rls = MultiTargetRLS.from_dict(raw, TIRE_KEYS)
+            if rls is not None:
+                models.append((key, rls))
+        return cls(models, storage.car_classes())
+
+    def set_class(self, key: str, car_class: str):
+        if car_class and self._classes.get(key) != car_class:
+            self._classes[key] = car_class
+            self._priors.clear()
+
+    def update(self, key: str, rls: MultiTargetRLS):
+        parts = _split_dataset_key(key)
+        if parts is None or rls.n_updates == 0:
+            return
+        self._entries[key] = (parts, _car_tokens(parts[2]), rls.theta.copy(), rls.confidence)
+        self._priors.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def neighbours(self, key: str) -> List[Tuple[str, float]]:
+        parts = _split_dataset_key(key)
+        if parts is None:
+            return []
+        track, config, car = parts
+        tokens = _car_tokens(car)
+        car_class = self._classes.get(key, "")
+        scored = []
+        for other, ((o_track, o_config, o_car), o_tokens, _, conf) in self._entries.items():
+            if other == key:
+                continue
+            if o_car == car:
+                car_sim = 1.0
+            else:
+                union = len(tokens | o_tokens)
+                car_sim = len(tokens & o_tokens) / union if union else 0.0
+                if car_class and self._classes.get(other) == car_class:
+                    car_sim = max(car_sim, self.CLASS_SIMILARITY)
+            track_sim = (1.0 if o_config == config else 0.88) if o_track == track else 0.6
+            score = car_sim * track_sim
+            if score >= self.MIN_SIMILARITY:
+                scored.append((other, score * conf))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[: self.TOP_K]
+
+    def prior_theta(self, key: str) -> Optional[np.ndarray]:
+        """Blended neighbour coefficients for ``key``, or None when nothing similar is known."""
+        if key in self._priors:
+            return self._priors[key]
+        picked = self.neighbours(key)
+        theta = None
+        if picked:
+            weights = np.array([w for _, w in picked], dtype=float)
+            thetas = np.stack([self._entries[other][2] for other, _ in picked])
+            theta = np.tensordot(weights / weights.sum(), thetas, axes=1)
+            theta.setflags(write=False)
+        self._priors[key] = theta
+        return theta
+
+
+@dataclass(frozen=True)
+class SampleStats:
+    """Aggregates over the stored stint samples of one dataset key."""
+
+    count: int
+    prior: np.ndarray
+    median_energy_per_lap: float
+
 
 class TireMLModel:
-    """Persistent online tire wear model powered by RLS per tire."""
+    """Persistent online tire wear model powered by one multi-target RLS over all tires.
 
-    def __init__(self, storage: DataStorage):
-        self.storage = storage
-        self._rls: Dict[str, RLSEstimator] = {t: RLSEstimator() for t in TIRE_KEYS}
+    The estimators of the last CACHE_SIZE dataset keys stay loaded, tagged with
+    the store's ``updated_at`` stamp they correspond to, so switching back to a
+    recent key is a lookup. A stamp mismatch (another process saved the key)
+    reloads the stored payload. ``prefetch`` fills the cache from another thread.
+    """
 
-    @staticmethod
-    def _rls_key(dataset_key: str) -> str:
-        return f"{dataset_key}::rls"
+    CACHE_SIZE = 8
+
+    def __init__(self, storage: ModelStore):
+        self.storage = storage
+        self._rls = MultiTargetRLS(TIRE_KEYS)
+        self._rls_key: Optional[str] = None
+        self._estimators: "OrderedDict[str, Tuple[Optional[float], MultiTargetRLS]]" = OrderedDict()
+        self._load_lock = threading.RLock()
+        self._prior_index: Optional[KeyPriorIndex] = None
+        self._stats: Dict[str, SampleStats] = {}
+        self._phi = np.empty(_PHI_DIM, dtype=float)
+
+    def _sample_stats(self, dataset_key: str) -> SampleStats:
+        stats = self._stats.get(dataset_key)
+        if stats is not None:
+            return stats
 
-    def _reset_estimators(self):
-        self._rls = {t: RLSEstimator() for t in TIRE_KEYS}
+        samples = self.storage.get_samples(dataset_key)
+        prior = np.zeros(len(TIRE_KEYS), dtype=float)
+        for i, tire in enumerate(TIRE_KEYS):
+            values = [float(s[tire]) for s in samples if tire in s]
+            if values:
+                prior[i] = float(np.median(values))
+        med_epl = float(np.median([float(s.get("energy_per_lap", 0.0)) for s in samples])) if samples else 0.0
+        stats = SampleStats(count=len(samples), prior=prior, median_energy_per_lap=med_epl)
+        self._stats[dataset_key] = stats
+        return stats
+
+    def invalidate_stats(self, dataset_key: Optional[str] = None):
+        if dataset_key is None:
+            self._stats.clear()
+        else:
+            self._stats.pop(dataset_key, None)
+
+    def clear(self):
+        """Clear the store and forget every loaded estimator and aggregate."""
+        with self._load_lock:
+            self.storage.clear()
+            self._estimators.clear()
+            self._stats.clear()
+            self._rls = MultiTargetRLS(TIRE_KEYS)
+            self._rls_key = None
+            if self._prior_index is not None:
+                self._prior_index = KeyPriorIndex([])
 
     def _sample_env_context(self, sample: dict) -> Dict[str, float]:
         return {
@@ -289,98 +939,257 @@ class TireMLModel:
     def _phi_from_sample(self, sample: dict) -> np.ndarray:
         return _phi_from_env_context(self._sample_env_context(sample), float(sample.get("energy_per_lap", 0.0)))
 
-    def _rebuild_rls_from_samples(self, dataset_key: str):
-        self._reset_estimators()
+    def _sample_targets(self, x: np.ndarray, sample: dict, rls: Optional[MultiTargetRLS] = None) -> np.ndarray:
+        # A tire missing from an old sample contributes zero error to its column.
+        rls = rls or self._rls
+        y = x @ rls.theta
+        for i, tire in enumerate(rls.targets):
+            if tire in sample:
+                y[i] = float(sample[tire])
+        return y
+
+    def forgetting_factor(self, dataset_key: str) -> float:
+        try:
+            return float(self.storage.get_meta(f"lam:{dataset_key}") or DEFAULT_LAM)
+        except ValueError:
+            return DEFAULT_LAM
+
+    def training_arrays(self, samples: Sequence[dict]) -> Tuple[np.ndarray, np.ndarray]:
+        X = np.array([self._phi_from_sample(s) for s in samples], dtype=float).reshape(len(samples), _PHI_DIM)
+        Y = np.array([[float(s[tire]) for tire in TIRE_KEYS] for s in samples], dtype=float).reshape(len(samples), len(TIRE_KEYS))
+        return X, Y
+
+    def _fit_from_samples(self, dataset_key: str) -> MultiTargetRLS:
         samples = self.storage.get_samples(dataset_key)
+        lam = self.forgetting_factor(dataset_key)
+        if all(tire in s for s in samples for tire in TIRE_KEYS):
+            return MultiTargetRLS.fit(*self.training_arrays(samples), TIRE_KEYS, lam=lam)
+
+        # Old samples missing a tire need the sequential replay (their target depends on the running fit).
+        rls = MultiTargetRLS(TIRE_KEYS, lam=lam)
         for sample in samples:
             x = self._phi_from_sample(sample)
-            for tire in TIRE_KEYS:
-                if tire in sample:
-                    self._rls[tire].update(x, float(sample[tire]))
+            rls.update(x, self._sample_targets(x, sample, rls))
+        return rls
+
+    def _rebuild_rls_from_samples(self, dataset_key: str):
+        self._rls = self._fit_from_samples(dataset_key)
+        self._rls_key = dataset_key
+
+    def _cache_estimator(self, dataset_key: str, stamp: Optional[float], rls: MultiTargetRLS):
+        self._estimators[dataset_key] = (stamp, rls)
+        self._estimators.move_to_end(dataset_key)
+        while len(self._estimators) > self.CACHE_SIZE:
+            evicted, _ = self._estimators.popitem(last=False)
+            if evicted != self._rls_key:
+                self._stats.pop(evicted, None)
+
+    def _loaded_estimator(self, dataset_key: str) -> MultiTargetRLS:
+        """The key's estimator from the cache, the stored payload or a refit, in that order."""
+        with self._load_lock:
+            stamp = self.storage.model_updated_at(dataset_key)
+            cached = self._estimators.get(dataset_key)
+            if cached is not None and cached[0] == stamp:
+                self._estimators.move_to_end(dataset_key)
+                return cached[1]
+
+            raw = self.storage.get_model(dataset_key) if stamp is not None else {}
+            rls = MultiTargetRLS.from_dict(raw, TIRE_KEYS) if raw else None
+            if rls is None or rls.n_updates == 0:
+                rls = self._fit_from_samples(dataset_key)
+                if self._sample_stats(dataset_key).count > 0:
+                    stamp = self.storage.put_model(dataset_key, rls.to_dict())
+            elif int(raw.get("format", 1)) < MultiTargetRLS.FORMAT_VERSION:
+                stamp = self.storage.put_model(dataset_key, rls.to_dict())
+            self._cache_estimator(dataset_key, stamp, rls)
+            return rls
 
     def load_rls(self, dataset_key: str):
-        with self.storage.lock:
-            raw = self.storage.data.get(self._rls_key(dataset_key), {})
-        valid_rls = bool(raw)
-        restored = {}
-        for tire in TIRE_KEYS:
-            est = RLSEstimator.from_dict(raw[tire]) if tire in raw else RLSEstimator()
-            restored[tire] = est
-            valid_rls = valid_rls and est.n_updates > 0
+        self._rls = self._loaded_estimator(dataset_key)
+        self._rls_key = dataset_key
 
-        if valid_rls:
-            self._rls = restored
-            return
+    def prefetch(self, dataset_key: str):
+        """Load a key's estimator and aggregates into the cache without switching to it."""
+        self._loaded_estimator(dataset_key)
+        self._sample_stats(dataset_key)
 
-        self._rebuild_rls_from_samples(dataset_key)
-        if self.sample_count(dataset_key) > 0:
-            self.save_rls(dataset_key)
+    def is_cached(self, dataset_key: str) -> bool:
+        return dataset_key in self._estimators
+
+    @property
+    def active_key(self) -> Optional[str]:
+        return self._rls_key
 
     def save_rls(self, dataset_key: str):
-        with self.storage.lock:
-            self.storage.data[self._rls_key(dataset_key)] = {t: self._rls[t].to_dict() for t in TIRE_KEYS}
-        self.storage.save()
+        stamp = self.storage.put_model(dataset_key, self._rls.to_dict())
+        with self._load_lock:
+            self._cache_estimator(dataset_key, stamp, self._rls)
+            if self._prior_index is not None:
+                self._prior_index.update(dataset_key, self._rls)
+
+    def build_prior_index(self):
+        """Index every stored key's fit so an unseen key can borrow from similar ones (see KeyPriorIndex)."""
+        index = KeyPriorIndex.from_store(self.storage)
+        with self._load_lock:
+            self._prior_index = index
+
+    def cold_start_theta(self, dataset_key: str) -> Optional[np.ndarray]:
+        index = self._prior_index
+        return index.prior_theta(dataset_key) if index is not None else None
+
+    def set_car_class(self, dataset_key: str, car_class: str):
+        """Record the class the key's car races in, so same-class cars can lend it a prior."""
+        if not car_class:
+            return
+        if self.storage.get_meta(f"class:{dataset_key}") != car_class:
+            self.storage.set_meta(f"class:{dataset_key}", car_class)
+        index = self._prior_index
+        if index is not None:
+            index.set_class(dataset_key, car_class)
 
     def add_stint_sample(self, dataset_key: str, sample: dict):
         self.storage.add_sample(dataset_key, sample)
+        self.invalidate_stats(dataset_key)
         x = self._phi_from_sample(sample)
-        for tire in TIRE_KEYS:
-            self._rls[tire].update(x, float(sample[tire]))
+        self._rls.update(x, self._sample_targets(x, sample))
         self.save_rls(dataset_key)
 
+    def add_stint_samples(self, dataset_key: str, samples: Sequence[dict]) -> int:
+        """Fit a batch of stint samples in order, skipping outliers; persist once."""
+        accepted = []
+        for sample in samples:
+            if self.is_outlier(dataset_key, sample):
+                continue
+            x = self._phi_from_sample(sample)
+            self._rls.update(x, self._sample_targets(x, sample))
+            accepted.append(sample)
+        if accepted:
+            self.storage.add_samples(dataset_key, accepted)
+            self.invalidate_stats(dataset_key)
+            self.save_rls(dataset_key)
+        return len(accepted)
+
     def is_outlier(self, dataset_key: str, candidate: dict) -> bool:
+        rls = self._rls
+        if rls.n_updates < 4:
+            return False
         x = self._phi_from_sample(candidate)
-        for tire in TIRE_KEYS:
-            rls = self._rls[tire]
-            if rls.n_updates < 4:
-                continue
-            pred = rls.predict(x)
-            pred_var = max(1e-10, float(x @ rls.P @ x) + rls.mad_error * rls.mad_error)
-            z = abs(float(candidate[tire]) - pred) / pred_var**0.5
+        pred = rls.predict(x)
+        x_var = rls.prediction_variance(x)
+        for i, tire in enumerate(rls.targets):
+            pred_var = max(1e-10, x_var + float(rls.mad_error[i]) ** 2)
+            z = abs(float(candidate[tire]) - float(pred[i])) / pred_var**0.5
             if z > 3.5:
                 return True
         return False
 
-    def get_rates(self, dataset_key: str, env_context: Dict[str, float], energy_per_lap: float) -> Tuple[Dict[str, float], float, int]:
-        sample_count = self.sample_count(dataset_key)
-        if self._rls["lf"].n_updates == 0:
-            return {t: 0.0 for t in TIRE_KEYS}, 0.0, sample_count
-
-        x = _phi_from_env_context(env_context, energy_per_lap)
-        samples = self.storage.get_samples(dataset_key)
-        rates = {}
-        for tire in TIRE_KEYS:
-            rls = self._rls[tire]
-            conf = rls.confidence
-            prior = float(np.median([float(s[tire]) for s in samples if tire in s])) if samples else 0.0
-            rates[tire] = max(0.0, conf * rls.predict(x) + (1.0 - conf) * prior)
-        return rates, self._rls["lf"].confidence, sample_count
+    def get_rates(self, dataset_key: str, env: np.ndarray, energy_per_lap: float) -> Tuple[Dict[str, float], float, int]:
+        stats = self._sample_stats(dataset_key)
+        rls = self._rls
+        x = _phi_from_env_vector(env, energy_per_lap, self._phi)
+        theta = self.cold_start_theta(dataset_key)
+        if rls.n_updates == 0:
+            # No stint learned for this key yet: borrow the fit of similar keys if there are any.
+            if theta is None:
+                return {t: 0.0 for t in TIRE_KEYS}, 0.0, stats.count
+            borrowed = np.maximum(0.0, x @ theta)
+            return {tire: float(borrowed[i]) for i, tire in enumerate(rls.targets)}, 0.0, stats.count
+
+        # While confidence is low the fit leans on the neighbours' fit when there
+        # is one, so a key's first stints refine the borrowed estimate instead
+        # of replacing it with their own median.
+        conf = rls.confidence
+        prior = stats.prior if theta is None else np.maximum(0.0, x @ theta)
+        blended = np.maximum(0.0, conf * rls.predict(x) + (1.0 - conf) * prior)
+        rates = {tire: float(blended[i]) for i, tire in enumerate(rls.targets)}
+        return rates, conf, stats.count
 
     def sample_count(self, key: str) -> int:
-        return len(self.storage.get_samples(key))
+        return self._sample_stats(key).count
 
-    def get_wear_per_lap_baseline(self, key: str, env_context: Dict[str, float]) -> Dict[str, float]:
-        samples = self.storage.get_samples(key)
-        if not samples:
+    def get_wear_per_lap_baseline(self, key: str, env: np.ndarray) -> Dict[str, float]:
+        stats = self._sample_stats(key)
+        if stats.count == 0:
             return {t: 0.0 for t in TIRE_KEYS}
 
-        med_epl = float(np.median([float(s.get("energy_per_lap", 0.0)) for s in samples]))
-        rates, _, _ = self.get_rates(key, env_context, med_epl)
+        med_epl = stats.median_energy_per_lap
+        rates, _, _ = self.get_rates(key, env, med_epl)
         return {t: rates[t] * med_epl for t in TIRE_KEYS}
 
+    def forecast(
+        self,
+        dataset_key: str,
+        env: np.ndarray,
+        energy_per_lap: float,
+        tread: np.ndarray,
+        baseline_wear_per_lap: np.ndarray,
+        seconds_per_lap: float,
+        laps: int = FORECAST_LAPS,
+    ) -> Optional[np.ndarray]:
+        """Tread per tire after each of the next ``laps`` laps, with a band half-width.
+
+        All laps are evaluated in one pass: the environment is carried forward
+        along its stint slope, rates come from ``Phi @ theta`` (blended with the
+        neighbour or sample prior exactly like get_rates). The band starts from the a-priori
+        residual level, which already contains the parameter error for
+        conditions like the current ones, and widens with ``diag(Phi P Phi^T)``
+        as the projected conditions drift away from them. The rate error of a
+        stint is systematic, so the band accumulates linearly with the wear.
+        Returns shape (2, laps + 1, tires): [tread, band], lap 0 being now.
+        """
+        rls = self._rls
+        if rls.n_updates == 0 or energy_per_lap <= 0.0:
+            return None
+        stats = self._sample_stats(dataset_key)
+
+        mid_lap = (np.arange(1, laps + 1, dtype=float) - 0.5) * max(0.0, float(seconds_per_lap))
+        X = _phi_rows_from_env(_project_environment(env, mid_lap), energy_per_lap)
+        conf = rls.confidence
+        theta = self.cold_start_theta(dataset_key)
+        prior = stats.prior if theta is None else np.maximum(0.0, X @ theta)
+        rates = np.maximum(0.0, conf * np.maximum(0.0, X @ rls.theta) + (1.0 - conf) * prior)
+        wear = np.maximum(rates * energy_per_lap, baseline_wear_per_lap)
+        x_var = np.maximum(0.0, np.einsum("ij,jk,ik->i", X, rls.P, X))
+        drift = np.sqrt((1.0 + x_var) / (1.0 + x_var[0]))
+        rate_sd = MAD_TO_SIGMA * rls.mad_error * drift[:, None]
+
+        out = np.empty((2, laps + 1, len(rls.targets)), dtype=float)
+        out[0, 0] = tread
+        out[0, 1:] = np.clip(tread - np.cumsum(wear, axis=0), 0.0, 100.0)
+        out[1, 0] = 0.0
+        out[1, 1:] = FORECAST_BAND_Z * np.cumsum(rate_sd * energy_per_lap, axis=0)
+        out.setflags(write=False)
+        return out
+
     def get_coefficients_report(self, dataset_key: str) -> str:
-        lines = [f"=== Coefficients: {dataset_key} ==="]
-        for tire in TIRE_KEYS:
-            rls = self._rls[tire]
-            lines.append(
-                f"\n[{tire.upper()}] n={rls.n_updates}  conf={rls.confidence:.1%}  "
-                f"P_trace={rls.uncertainty_trace:.2e}"
-            )
-            for name, coef in zip(FEATURE_NAMES, rls.theta):
+        rls = self._rls
+        lines = [
+            f"=== Coefficients: {dataset_key} ===",
+            f"n={rls.n_updates}  conf={rls.confidence:.1%}  P_trace={rls.uncertainty_trace:.2e} (shared)",
+        ]
+        for i, tire in enumerate(rls.targets):
+            lines.append(f"\n[{tire.upper()}] mad={float(rls.mad_error[i]):.2e}")
+            for name, coef in zip(FEATURE_NAMES, rls.theta[:, i]):
                 lines.append(f"  {name:20s}: {coef:+.6e}")
         return "\n".join(lines)
 
 
+def _prettify_name(text: Optional[str]) -> str:
+    cleaned = re.sub(r"[_\-]+", " ", str(text or "")).strip()
+    return cleaned.title()
+
+
+@lru_cache(maxsize=64)
+def _dataset_key(track_name: str, track_config: str, car_path: str) -> str:
+    def clean(text: str, fallback: str) -> str:
+        return (text or fallback).strip().lower().replace(" ", "_")
+
+    track = clean(track_name, "unknown_track")
+    config = clean(track_config, "default")
+    car = clean(car_path, "unknown_car")
+    return sys.intern(f"{track}+{config}+{car}")
+
+
 class StintTracker:
     """Detects stint boundaries and computes validated learning samples at pit-out.
 
@@ -406,6 +1215,12 @@ class StintTracker:
         self.env_integral = {"track_temp": 0.0, "air_temp": 0.0, "humidity": 0.0}
         self.env_sq_integral = {"track_temp": 0.0, "air_temp": 0.0, "humidity": 0.0}
         self.env_start = {"track_temp": 0.0, "air_temp": 0.0, "humidity": 0.0}
+        self._env = np.zeros(_ENV_DIM, dtype=float)
+
+        self.lap_energy_bins = np.zeros(SECTOR_BINS, dtype=float)
+        self.last_lap_energy_bins = np.zeros(SECTOR_BINS, dtype=float)
+        self.stint_energy_bins = np.zeros(SECTOR_BINS, dtype=float)
+        self.laps_binned = 0
 
         self.last_lap: Optional[int] = None
         self.last_lap_cross_time: Optional[float] = None
@@ -421,13 +1236,7 @@ class StintTracker:
 
     @staticmethod
     def make_dataset_key(s: TelemetrySnapshot) -> str:
-        def clean(text: str, fallback: str) -> str:
-            return (text or fallback).strip().lower().replace(" ", "_")
-
-        track = clean(s.track_name, "unknown_track")
-        config = clean(s.track_config, "default")
-        car = clean(s.car_path, "unknown_car")
-        return f"{track}+{config}+{car}"
+        return _dataset_key(s.track_name, s.track_config, s.car_path)
 
     @staticmethod
     def laps_in_stint(current: TelemetrySnapshot, previous: TelemetrySnapshot) -> float:
@@ -458,6 +1267,8 @@ class StintTracker:
         }
         self.lap_times = []
         self.min_speed_kmh = speed_kmh
+        self.stint_energy_bins[:] = 0.0
+        self.laps_binned = 0
         self.env_time_accum = 0.0
         self.env_integral = {"track_temp": 0.0, "air_temp": 0.0, "humidity": 0.0}
         self.env_sq_integral = {"track_temp": 0.0, "air_temp": 0.0, "humidity": 0.0}
@@ -493,86 +1304,64 @@ class StintTracker:
             self.env_sq_integral[key] += 0.5 * (prev_v * prev_v + curr_v * curr_v) * dt
         self.env_time_accum += dt
 
-    def _environment_summary(self, end_snapshot: Optional[TelemetrySnapshot] = None) -> Dict[str, float]:
-        source = end_snapshot or self.last_snapshot
-        if source is None:
-            source = TelemetrySnapshot(0.0, 0, 0.0, False, 0.0, 0.0, 0.0, 0.0, 0.0, 25.0, 50.0, 0, {t: 100.0 for t in TIRE_KEYS}, "", "", "")
-
-        end_vals = {
-            "track_temp": float(source.track_temp),
-            "air_temp": float(source.air_temp),
-            "humidity": float(source.humidity),
-        }
-        start_vals = dict(self.env_start or end_vals)
+    def environment_vector(self, snapshot: Optional[TelemetrySnapshot] = None, stint: Optional[bool] = None) -> np.ndarray:
+        """Fill the tracker's preallocated ENV_FIELDS vector in place and return it.
 
-        if self.env_time_accum > 1e-9:
-            avg_vals = {k: float(v) / self.env_time_accum for k, v in self.env_integral.items()}
-            mean_sq = {k: float(v) / self.env_time_accum for k, v in self.env_sq_integral.items()}
+        With ``stint`` false (default: outside a stint) every channel reports the
+        snapshot's current value instead of the accumulated stint summary.
+        The buffer is reused on the next call; copy it if it must be kept.
+        """
+        env = self._env
+        source = snapshot or self.last_snapshot
+        if source is None:
+            end_values = (0.0, 25.0, 50.0)
         else:
-            avg_vals = dict(end_vals)
-            mean_sq = {k: end_vals[k] * end_vals[k] for k in end_vals}
-
-        std_vals = {k: float(max(0.0, mean_sq[k] - avg_vals[k] * avg_vals[k])) ** 0.5 for k in avg_vals}
-        elapsed = max(self.env_time_accum, 1e-9)
+            end_values = (float(source.track_temp), float(source.air_temp), float(source.humidity))
+
+        in_stint = self.in_stint if stint is None else stint
+        accum = self.env_time_accum if in_stint else 0.0
+        elapsed = max(accum, 1e-9)
+        base = len(ENV_CHANNELS)
+        for c, channel in enumerate(ENV_CHANNELS):
+            end = end_values[c]
+            if not in_stint:
+                start = avg = end
+                std = 0.0
+            else:
+                start = float(self.env_start.get(channel, end)) if self.env_start else end
+                if accum > 1e-9:
+                    avg = self.env_integral[channel] / accum
+                    mean_sq = self.env_sq_integral[channel] / accum
+                else:
+                    avg = end
+                    mean_sq = end * end
+                std = max(0.0, mean_sq - avg * avg) ** 0.5
+            env[c] = avg
+            offset = base + 6 * c
+            env[offset] = avg
+            env[offset + 1] = start
+            env[offset + 2] = end
+            env[offset + 3] = end - start
+            env[offset + 4] = std
+            env[offset + 5] = (end - start) / elapsed if in_stint else 0.0
+        env[_ENV_DIM - 1] = accum
+        return env
 
-        return {
-            "track_temp": float(avg_vals["track_temp"]),
-            "air_temp": float(avg_vals["air_temp"]),
-            "humidity": float(avg_vals["humidity"]),
-            "track_temp_avg": float(avg_vals["track_temp"]),
-            "track_temp_start": float(start_vals["track_temp"]),
-            "track_temp_end": float(end_vals["track_temp"]),
-            "track_temp_delta": float(end_vals["track_temp"] - start_vals["track_temp"]),
-            "track_temp_std": float(std_vals["track_temp"]),
-            "track_temp_slope": float((end_vals["track_temp"] - start_vals["track_temp"]) / elapsed),
-            "air_temp_avg": float(avg_vals["air_temp"]),
-            "air_temp_start": float(start_vals["air_temp"]),
-            "air_temp_end": float(end_vals["air_temp"]),
-            "air_temp_delta": float(end_vals["air_temp"] - start_vals["air_temp"]),
-            "air_temp_std": float(std_vals["air_temp"]),
-            "air_temp_slope": float((end_vals["air_temp"] - start_vals["air_temp"]) / elapsed),
-            "humidity_avg": float(avg_vals["humidity"]),
-            "humidity_start": float(start_vals["humidity"]),
-            "humidity_end": float(end_vals["humidity"]),
-            "humidity_delta": float(end_vals["humidity"] - start_vals["humidity"]),
-            "humidity_std": float(std_vals["humidity"]),
-            "humidity_slope": float((end_vals["humidity"] - start_vals["humidity"]) / elapsed),
-            "env_elapsed": float(self.env_time_accum),
-        }
+    def _environment_summary(self, end_snapshot: Optional[TelemetrySnapshot] = None) -> Dict[str, float]:
+        return env_vector_to_dict(self.environment_vector(end_snapshot, stint=True))
 
     def current_environment_context(self, snapshot: TelemetrySnapshot) -> Dict[str, float]:
-        if not self.in_stint:
-            return {
-                "track_temp": float(snapshot.track_temp),
-                "air_temp": float(snapshot.air_temp),
-                "humidity": float(snapshot.humidity),
-                "track_temp_avg": float(snapshot.track_temp),
-                "track_temp_start": float(snapshot.track_temp),
-                "track_temp_end": float(snapshot.track_temp),
-                "track_temp_delta": 0.0,
-                "track_temp_std": 0.0,
-                "air_temp_avg": float(snapshot.air_temp),
-                "air_temp_start": float(snapshot.air_temp),
-                "air_temp_end": float(snapshot.air_temp),
-                "air_temp_delta": 0.0,
-                "air_temp_std": 0.0,
-                "humidity_avg": float(snapshot.humidity),
-                "humidity_start": float(snapshot.humidity),
-                "humidity_end": float(snapshot.humidity),
-                "humidity_delta": 0.0,
-                "humidity_std": 0.0,
-                "env_elapsed": 0.0,
-            }
-        return self._environment_summary(snapshot)
+        return env_vector_to_dict(self.environment_vector(snapshot))
 
     def _capture_pit_service_state(self, snapshot: TelemetrySnapshot, speed_kmh: float):
+        wear = snapshot.wear
         if self.pit_entry_wear is None:
-            self.pit_entry_wear = dict(snapshot.wear)
+            self.pit_entry_wear = dict(wear)
 
         if self.pit_final_stint_wear is None:
-            self.pit_final_stint_wear = dict(snapshot.wear)
+            self.pit_final_stint_wear = dict(wear)
         for tire in TIRE_KEYS:
-            current = float(snapshot.wear[tire])
+            current = float(wear[tire])
             self.pit_final_stint_wear[tire] = min(float(self.pit_final_stint_wear.get(tire, current)), current)
 
         flags = int(snapshot.pit_sv_flags)
@@ -587,7 +1376,7 @@ class StintTracker:
             for tire in TIRE_KEYS:
                 self.pit_tire_change_request[tire] = self.pit_tire_change_request[tire] or current_flags[tire]
 
-        self._infer_pit_tire_changes_from_wear(snapshot.wear)
+        self._infer_pit_tire_changes_from_wear(wear)
 
     def _build_stint_result(self, end_info: Dict[str, object], final_wear: Dict[str, float]) -> dict:
         start_lap_progress = float(self.start_data.get("lap_progress", float(end_info["lap_progress"])))
@@ -634,12 +1423,22 @@ class StintTracker:
                 post_pit_wear[tire] = 100.0
         return post_pit_wear
 
+    def _close_lap_bins(self):
+        # Once per lap: the finished lap's sector energy becomes the attribution input.
+        if self.in_stint:
+            self.last_lap_energy_bins[:] = self.lap_energy_bins
+            self.stint_energy_bins += self.lap_energy_bins
+            self.laps_binned += 1
+        self.lap_energy_bins[:] = 0.0
+
     def update(self, snapshot: TelemetrySnapshot) -> Optional[dict]:
         speed_kmh = snapshot.speed_mps * 3.6
 
+        energy = 0.0
         if self.last_snapshot is not None:
             dt = max(0.0, snapshot.session_time - self.last_snapshot.session_time)
-            self.current_energy += abs(snapshot.lat_accel) * snapshot.speed_mps * dt
+            energy = abs(snapshot.lat_accel) * snapshot.speed_mps * dt
+            self.current_energy += energy
             self._integrate_stint_environment(self.last_snapshot, snapshot)
 
         if self.in_stint:
@@ -655,6 +1454,10 @@ class StintTracker:
                     self.lap_times.append(lap_time)
             self.last_lap_cross_time = snapshot.session_time
             self.last_lap = snapshot.lap
+            self._close_lap_bins()
+        # LapDistPct is -1 while the car is not in the world; that energy belongs to no sector.
+        if snapshot.lap_dist_pct >= 0.0:
+            self.lap_energy_bins[min(SECTOR_BINS - 1, int(snapshot.lap_dist_pct * SECTOR_BINS))] += energy
 
         if self.prev_on_pit is None:
             self.prev_on_pit = snapshot.on_pit_road
@@ -709,6 +1512,34 @@ class StintTracker:
             return False
         return True
 
+    @staticmethod
+    def learning_sample(stint_end: dict) -> dict:
+        """Flatten a stint result into the sample stored and fitted by TireMLModel."""
+        return {
+            "track_temp": float(stint_end["track_temp"]),
+            "air_temp": float(stint_end["air_temp"]),
+            "humidity": float(stint_end.get("humidity", 50.0)),
+            "track_temp_avg": float(stint_end.get("track_temp_avg", stint_end["track_temp"])),
+            "track_temp_start": float(stint_end.get("track_temp_start", stint_end["track_temp"])),
+            "track_temp_end": float(stint_end.get("track_temp_end", stint_end["track_temp"])),
+            "track_temp_delta": float(stint_end.get("track_temp_delta", 0.0)),
+            "track_temp_std": float(stint_end.get("track_temp_std", 0.0)),
+            "air_temp_avg": float(stint_end.get("air_temp_avg", stint_end["air_temp"])),
+            "air_temp_start": float(stint_end.get("air_temp_start", stint_end["air_temp"])),
+            "air_temp_end": float(stint_end.get("air_temp_end", stint_end["air_temp"])),
+            "air_temp_delta": float(stint_end.get("air_temp_delta", 0.0)),
+            "humidity_avg": float(stint_end.get("humidity_avg", stint_end.get("humidity", 50.0))),
+            "humidity_start": float(stint_end.get("humidity_start", stint_end.get("humidity", 50.0))),
+            "humidity_end": float(stint_end.get("humidity_end", stint_end.get("humidity", 50.0))),
+            "humidity_delta": float(stint_end.get("humidity_delta", 0.0)),
+            "laps": int(stint_end["laps"]),
+            "energy_per_lap": float(stint_end["energy_per_lap"]),
+            "lf": float(stint_end["wear_per_energy"]["lf"]),
+            "rf": float(stint_end["wear_per_energy"]["rf"]),
+            "lr": float(stint_end["wear_per_energy"]["lr"]),
+            "rr": float(stint_end["wear_per_energy"]["rr"]),
+        }
+
     def current_energy_per_lap(self, snapshot: TelemetrySnapshot) -> float:
         if not self.in_stint or not self.start_data:
             return 0.0
@@ -726,7 +1557,7 @@ class StintTracker:
 
         start_energy = float(self.start_data.get("energy", self.current_energy))
         energy_used = max(0.0, self.current_energy - start_energy)
-        initial_wear = self.start_data.get("wear", snapshot.wear)
+        initial_wear = self.start_data.get("wear") or snapshot.wear
         start_lap_progress = float(self.start_data.get("lap_progress", float(snapshot.lap) + float(snapshot.lap_dist_pct)))
         current_lap_progress = float(snapshot.lap) + float(snapshot.lap_dist_pct)
         laps_progress = max(0.0, current_lap_progress - start_lap_progress)
@@ -744,8 +1575,6 @@ class StintTracker:
             "energy_used": energy_used,
             "laps_done": laps_done,
             "laps_progress": laps_progress,
-            "environment_context": self.current_environment_context(snapshot),
-            "environment_average": self._environment_summary(snapshot),
         }
 
 
@@ -758,6 +1587,9 @@ class TelemetryReader(threading.Thread):
         self.stop_event = stop_event
         self.ir = irsdk.IRSDK()
         self.last_meta = {"TrackName": "", "TrackConfigName": "", "CarPath": ""}
+        self._meta_update: Optional[int] = None
+        self._meta_checked_at = 0.0
+        self._wear = {t: 100.0 for t in TIRE_KEYS}
 
     @staticmethod
     def _safe_float(v, default=0.0) -> float:
@@ -782,9 +1614,7 @@ class TelemetryReader(threading.Thread):
             return False
 
     def _parse_metadata(self) -> Dict[str, str]:
-        def prettify(text: str) -> str:
-            cleaned = re.sub(r"[_\-]+", " ", str(text or "")).strip()
-            return cleaned.title()
+        prettify = _prettify_name
 
         # Primary source (same approach used in the main app): direct iRacing blocks.
         try:
@@ -818,6 +1648,9 @@ class TelemetryReader(threading.Thread):
                     ).strip()
                     if car_path:
                         self.last_meta["CarPath"] = prettify(car_path)
+                    car_class = _car_class_name(entry)
+                    if car_class:
+                        self.last_meta["CarClass"] = car_class
         except Exception:
             pass
 
@@ -858,6 +1691,9 @@ class TelemetryReader(threading.Thread):
                         or player_car.get("CarPath")
                         or ""
                     ).strip()
+                    car_class = _car_class_name(player_car)
+                    if car_class:
+                        self.last_meta["CarClass"] = car_class
 
                 track_name = prettify(track_name)
                 track_config = prettify(track_config)
@@ -910,6 +1746,30 @@ class TelemetryReader(threading.Thread):
         self.last_meta["CarPath"] = prettify(self.last_meta.get("CarPath", ""))
         return self.last_meta
 
+    def _current_metadata(self) -> Dict[str, str]:
+        """Re-parse session metadata only when iRacing bumps SessionInfoUpdate.
+
+        The strings are interned and reused by every snapshot until the next
+        change; without the counter we fall back to re-parsing once a second.
+        """
+        now = time.monotonic()
+        try:
+            update = self.ir["SessionInfoUpdate"]
+        except Exception:
+            update = None
+        if update is not None:
+            if update == self._meta_update:
+                return self.last_meta
+        elif now - self._meta_checked_at < 1.0:
+            return self.last_meta
+
+        meta = self._parse_metadata()
+        for name in ("TrackName", "TrackConfigName", "CarPath", "CarClass"):
+            meta[name] = sys.intern(str(meta.get(name, "")))
+        self._meta_update = update
+        self._meta_checked_at = now
+        return meta
+
     @staticmethod
     def _normalize_wear_value(value: float) -> float:
         # Depending on sdk/version tire wear can be [0..1] fraction or [0..100] percent.
@@ -922,36 +1782,12 @@ class TelemetryReader(threading.Thread):
             try:
                 if not self._connected():
                     # Push disconnected marker snapshot-less event through queue state.
+                    self._meta_update = None
                     self.out_queue.put_nowait((None, False))
                     time.sleep(1.0)
                     continue
 
-                meta = self._parse_metadata()
-                wear = {}
-                for tire, fields in WEAR_FIELDS.items():
-                    inner_index = INNER_WEAR_INDEX[tire]
-                    inner_field = fields[inner_index]
-                    wear[tire] = self._normalize_wear_value(self._safe_float(self.ir[inner_field], 100.0))
-
-                snap = TelemetrySnapshot(
-                    session_time=self._safe_float(self.ir["SessionTime"], 0.0),
-                    lap=self._safe_int(self.ir["Lap"], 0),
-                    lap_dist_pct=self._safe_float(self.ir["LapDistPct"], 0.0),
-                    on_pit_road=bool(self.ir["OnPitRoad"]),
-                    speed_mps=self._safe_float(self.ir["Speed"], 0.0),
-                    lat_accel=self._safe_float(self.ir["LatAccel"], 0.0),
-                    long_accel=self._safe_float(self.ir["LongAccel"], 0.0),
-                    steering=self._safe_float(self.ir["SteeringWheelAngle"], 0.0),
-                    track_temp=self._safe_float(self.ir["TrackTemp"], 0.0),
-                    air_temp=self._safe_float(self.ir["AirTemp"], 0.0),
-                    humidity=self._safe_float(self.ir["RelativeHumidity"], 0.0),
-                    pit_sv_flags=self._safe_int(self.ir["PitSvFlags"], 0),
-                    wear=wear,
-                    track_name=meta.get("TrackName", ""),
-                    track_config=meta.get("TrackConfigName", ""),
-                    car_path=meta.get("CarPath", ""),
-                )
-                self.out_queue.put_nowait((snap, True))
+                self.out_queue.put_nowait((self.read_snapshot(), True))
                 time.sleep(tick_s)
             except queue.Full:
                 time.sleep(tick_s)
@@ -959,39 +1795,518 @@ class TelemetryReader(threading.Thread):
                 # Telemetry can disappear mid-session; keep looping.
                 time.sleep(0.2)
 
+    def read_snapshot(self) -> TelemetrySnapshot:
+        meta = self._current_metadata()
+        wear = self._wear
+        for tire, fields in WEAR_FIELDS.items():
+            inner_field = fields[INNER_WEAR_INDEX[tire]]
+            wear[tire] = self._normalize_wear_value(self._safe_float(self.ir[inner_field], 100.0))
+
+        return TelemetrySnapshot(
+            session_time=self._safe_float(self.ir["SessionTime"], 0.0),
+            lap=self._safe_int(self.ir["Lap"], 0),
+            lap_dist_pct=self._safe_float(self.ir["LapDistPct"], 0.0),
+            on_pit_road=bool(self.ir["OnPitRoad"]),
+            speed_mps=self._safe_float(self.ir["Speed"], 0.0),
+            lat_accel=self._safe_float(self.ir["LatAccel"], 0.0),
+            long_accel=self._safe_float(self.ir["LongAccel"], 0.0),
+            steering=self._safe_float(self.ir["SteeringWheelAngle"], 0.0),
+            track_temp=self._safe_float(self.ir["TrackTemp"], 0.0),
+            air_temp=self._safe_float(self.ir["AirTemp"], 0.0),
+            humidity=self._safe_float(self.ir["RelativeHumidity"], 0.0),
+            pit_sv_flags=self._safe_int(self.ir["PitSvFlags"], 0),
+            wear=wear,
+            track_name=meta.get("TrackName", ""),
+            track_config=meta.get("TrackConfigName", ""),
+            car_path=meta.get("CarPath", ""),
+            captured_at=time.perf_counter(),
+            car_class=meta.get("CarClass", ""),
+        )
+
+
+@dataclass(frozen=True)
+class OverlayState:
+    """One published view of the model output; never mutated after it is handed over."""
+
+    version: int = 0
+    tread: Dict[str, float] = field(default_factory=lambda: {t: 100.0 for t in TIRE_KEYS})
+    wear_per_lap: Dict[str, float] = field(default_factory=lambda: {t: 0.0 for t in TIRE_KEYS})
+    estimate_ready: bool = False
+    connected: bool = False
+    key: str = ""
+    model_confidence: float = 0.0
+    sample_count: int = 0
+    track_temp: float = 0.0
+    air_temp: float = 0.0
+    humidity: float = 0.0
+    track_name: str = ""
+    track_config: str = ""
+    car_path: str = ""
+    env: np.ndarray = field(default_factory=lambda: np.zeros(_ENV_DIM, dtype=float))
+    forecast: Optional[np.ndarray] = None
+    forecast_progress: float = 0.0
+    sector_wear: Optional[np.ndarray] = None
+    sector_wear_laps: int = 0
+    estimate_captured_at: float = 0.0
+    updated_at: float = 0.0
+
+
+def _same_value(a, b) -> bool:
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return a is b or np.array_equal(a, b)
+    return a == b
+
+
+class StatePublisher:
+    """Single-slot handoff of OverlayState from the model thread to the Qt thread.
+
+    Writers build a new state and swap the reference; readers just take
+    ``current`` without locking. ``version`` only moves when a field really
+    changed, so the HUD can skip a refresh when nothing new was published.
+    """
+
+    def __init__(self):
+        self._write_lock = threading.Lock()
+        self.current = OverlayState(updated_at=time.time())
+        self.reset_requested = threading.Event()
+
+    def publish(self, **changes) -> OverlayState:
+        with self._write_lock:
+            state = self.current
+            changes = {name: value for name, value in changes.items() if not _same_value(getattr(state, name), value)}
+            if changes:
+                state = replace(state, version=state.version + 1, updated_at=time.time(), **changes)
+                self.current = state
+        return state
+
+
+SNAPSHOT_RING_SIZE = 1200
+STATE_RING_SIZE = 8
+_NAME_BYTES = 96
+
+SNAPSHOT_DTYPE = np.dtype(
+    [
+        ("connected", "?"),
+        ("session_time", "f8"),
+        ("lap", "i8"),
+        ("lap_dist_pct", "f8"),
+        ("on_pit_road", "?"),
+        ("speed_mps", "f8"),
+        ("lat_accel", "f8"),
+        ("long_accel", "f8"),
+        ("steering", "f8"),
+        ("track_temp", "f8"),
+        ("air_temp", "f8"),
+        ("humidity", "f8"),
+        ("pit_sv_flags", "i8"),
+        ("wear", "f8", (len(TIRE_KEYS),)),
+        ("track_name", f"S{_NAME_BYTES}"),
+        ("track_config", f"S{_NAME_BYTES}"),
+        ("car_path", f"S{_NAME_BYTES}"),
+        ("captured_at", "f8"),
+        ("car_class", f"S{_NAME_BYTES}"),
+    ]
+)
+
+STATE_DTYPE = np.dtype(
+    [
+        ("version", "i8"),
+        ("tread", "f8", (len(TIRE_KEYS),)),
+        ("wear_per_lap", "f8", (len(TIRE_KEYS),)),
+        ("estimate_ready", "?"),
+        ("connected", "?"),
+        ("key", f"S{3 * _NAME_BYTES}"),
+        ("model_confidence", "f8"),
+        ("sample_count", "i8"),
+        ("track_temp", "f8"),
+        ("air_temp", "f8"),
+        ("humidity", "f8"),
+        ("track_name", f"S{_NAME_BYTES}"),
+        ("track_config", f"S{_NAME_BYTES}"),
+        ("car_path", f"S{_NAME_BYTES}"),
+        ("env", "f8", (_ENV_DIM,)),
+        ("forecast", "f8", (2, FORECAST_LAPS + 1, len(TIRE_KEYS))),
+        ("forecast_progress", "f8"),
+        ("sector_wear", "f8", (2, SECTOR_BINS, len(TIRE_KEYS))),
+        ("sector_wear_laps", "i4"),
+        ("estimate_captured_at", "f8"),
+        ("updated_at", "f8"),
+    ]
+)
+
+
+class SharedRecordRing:
+    """Lock-free single-producer/single-consumer ring of fixed-size records in shared memory.
+
+    The header holds two uint64 counters: records written (stored only by the
+    producer) and records read (stored only by the consumer). A slot is
+    filled before ``written`` moves past it, and aligned 8-byte stores are
+    atomic, so neither side ever needs a lock.
+    """
+
+    HEADER_BYTES = 64
+
+    def __init__(self, shm: shared_memory.SharedMemory, dtype: np.dtype, capacity: int, owner: bool):
+        self.shm = shm
+        self.capacity = int(capacity)
+        self.owner = owner
+        self._counters = np.ndarray((2,), dtype=np.uint64, buffer=shm.buf)
+        self.records = np.ndarray((self.capacity,), dtype=dtype, buffer=shm.buf, offset=self.HEADER_BYTES)
+
+    @classmethod
+    def create(cls, dtype: np.dtype, capacity: int) -> "SharedRecordRing":
+        shm = shared_memory.SharedMemory(create=True, size=cls.HEADER_BYTES + dtype.itemsize * int(capacity))
+        ring = cls(shm, dtype, capacity, owner=True)
+        ring._counters[:] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name: str, dtype: np.dtype, capacity: int) -> "SharedRecordRing":
+        # Spawned children share the creator's resource tracker, so attaching does not change
+        # who unlinks the segment: only the owning ring does, in close().
+        return cls(shared_memory.SharedMemory(name=name), dtype, capacity, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def written(self) -> int:
+        return int(self._counters[0])
+
+    def push(self, record: tuple, overwrite: bool = False) -> bool:
+        """Append one record; without ``overwrite`` a full ring rejects it."""
+        written = int(self._counters[0])
+        if not overwrite and written - int(self._counters[1]) >= self.capacity:
+            return False
+        self.records[written % self.capacity] = record
+        self._counters[0] = written + 1
+        return True
+
+    def pop_all(self) -> np.ndarray:
+        """Copy out every unread record and mark them read."""
+        written = int(self._counters[0])
+        read = int(self._counters[1])
+        if written == read:
+            return self.records[:0].copy()
+        out = self.records[np.arange(read, written) % self.capacity]
+        self._counters[1] = written
+        return out
+
+    def latest(self) -> Optional[np.void]:
+        """Copy of the newest record, for rings used as an overwrite-only mailbox."""
+        for _ in range(3):
+            written = int(self._counters[0])
+            if written == 0:
+                return None
+            record = self.records[(written - 1) % self.capacity].copy()
+            # Valid unless the producer lapped the slot while it was being copied.
+            if int(self._counters[0]) - written < self.capacity - 1:
+                return record
+        return None
+
+    def close(self):
+        # The NumPy views must go before the mapping can be closed.
+        self._counters = None
+        self.records = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class _NameCodec:
+    """Fixed-width UTF-8 fields for the interned track/car strings, cached both ways."""
+
+    def __init__(self):
+        self._encoded: Dict[str, bytes] = {}
+        self._decoded: Dict[bytes, str] = {}
+
+    def encode(self, text: str) -> bytes:
+        raw = self._encoded.get(text)
+        if raw is None:
+            raw = self._encoded[text] = str(text).encode("utf-8")[:_NAME_BYTES]
+        return raw
+
+    def decode(self, raw: bytes) -> str:
+        text = self._decoded.get(raw)
+        if text is None:
+            text = self._decoded[raw] = sys.intern(raw.decode("utf-8", errors="ignore"))
+        return text
+
+
+class SnapshotRingWriter:
+    """Producer end of the snapshot ring, with the ``put_nowait`` of the queue it replaces.
+
+    ``ready`` is a multiprocessing Event set after every push, so the reader
+    can block instead of polling.
+    """
+
+    _DISCONNECTED = (False, 0.0, 0, 0.0, False, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0, (100.0,) * len(TIRE_KEYS), b"", b"", b"", 0.0, b"")
+
+    def __init__(self, ring: SharedRecordRing, ready):
+        self.ring = ring
+        self.ready = ready
+        self._names = _NameCodec()
+
+    def put_nowait(self, item: Tuple[Optional[TelemetrySnapshot], bool]):
+        snap, _connected = item
+        if snap is None:
+            record = self._DISCONNECTED
+        else:
+            names = self._names
+            record = (
+                True,
+                snap.session_time,
+                snap.lap,
+                snap.lap_dist_pct,
+                snap.on_pit_road,
+                snap.speed_mps,
+                snap.lat_accel,
+                snap.long_accel,
+                snap.steering,
+                snap.track_temp,
+                snap.air_temp,
+                snap.humidity,
+                snap.pit_sv_flags,
+                (snap.wear_lf, snap.wear_rf, snap.wear_lr, snap.wear_rr),
+                names.encode(snap.track_name),
+                names.encode(snap.track_config),
+                names.encode(snap.car_path),
+                snap.captured_at,
+                names.encode(snap.car_class),
+            )
+        if not self.ring.push(record):
+            raise queue.Full
+        self.ready.set()
+
+
+class SnapshotRingReader:
+    """Consumer end of the snapshot ring, with the ``get``/``get_nowait`` of the queue it replaces."""
+
+    def __init__(self, ring: SharedRecordRing, ready):
+        self.ring = ring
+        self.ready = ready
+        self._pending: Deque[Tuple[Optional[TelemetrySnapshot], bool]] = deque()
+        self._names = _NameCodec()
+
+    def _fill(self):
+        decode = self._names.decode
+        for row in self.ring.pop_all().tolist():
+            if not row[0]:
+                self._pending.append((None, False))
+                continue
+            wear = row[13]
+            snap = TelemetrySnapshot(
+                row[1],
+                row[2],
+                row[3],
+                row[4],
+                row[5],
+                row[6],
+                row[7],
+                row[8],
+                row[9],
+                row[10],
+                row[11],
+                row[12],
+                {"lf": wear[0], "rf": wear[1], "lr": wear[2], "rr": wear[3]},
+                decode(row[14]),
+                decode(row[15]),
+                decode(row[16]),
+                row[17],
+                decode(row[18]),
+            )
+            self._pending.append((snap, True))
+
+    def get_nowait(self) -> Tuple[Optional[TelemetrySnapshot], bool]:
+        if not self._pending:
+            self._fill()
+        if not self._pending:
+            raise queue.Empty
+        return self._pending.popleft()
+
+    def get(self, timeout: Optional[float] = None) -> Tuple[Optional[TelemetrySnapshot], bool]:
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            try:
+                return self.get_nowait()
+            except queue.Empty:
+                pass
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0.0:
+                raise queue.Empty
+            self.ready.clear()
+            # A push between the empty check and clear() must not be slept through.
+            try:
+                return self.get_nowait()
+            except queue.Empty:
+                pass
+            self.ready.wait(remaining)
+
+
+class SharedStateWriter(StatePublisher):
+    """StatePublisher that also mirrors every new version into a shared-memory state ring."""
+
+    # Optional arrays travel as all-NaN blocks when absent.
+    _ABSENT = {name: np.full(STATE_DTYPE[name].shape, np.nan) for name in ("forecast", "sector_wear")}
+
+    def __init__(self, ring: SharedRecordRing, reset_requested):
+        super().__init__()
+        self.ring = ring
+        self.reset_requested = reset_requested
+        self._names = _NameCodec()
+
+    def publish(self, **changes) -> OverlayState:
+        previous = self.current
+        state = super().publish(**changes)
+        if state is not previous:
+            names = self._names
+            self.ring.push(
+                (
+                    state.version,
+                    [state.tread.get(t, 100.0) for t in TIRE_KEYS],
+                    [state.wear_per_lap.get(t, 0.0) for t in TIRE_KEYS],
+                    state.estimate_ready,
+                    state.connected,
+                    str(state.key).encode("utf-8")[: 3 * _NAME_BYTES],
+                    state.model_confidence,
+                    state.sample_count,
+                    state.track_temp,
+                    state.air_temp,
+                    state.humidity,
+                    names.encode(state.track_name),
+                    names.encode(state.track_config),
+                    names.encode(state.car_path),
+                    state.env,
+                    self._ABSENT["forecast"] if state.forecast is None else state.forecast,
+                    state.forecast_progress,
+                    self._ABSENT["sector_wear"] if state.sector_wear is None else state.sector_wear,
+                    state.sector_wear_laps,
+                    state.estimate_captured_at,
+                    state.updated_at,
+                ),
+                overwrite=True,
+            )
+        return state
+
+
+class SharedStateReader:
+    """UI end of the state ring; ``current`` and ``reset_requested`` mirror StatePublisher."""
+
+    @staticmethod
+    def _optional_array(value: np.ndarray, previous: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        # Keeps the previous object while unchanged so the UI's per-array caches stay valid.
+        if np.isnan(value.flat[0]):
+            return None
+        if previous is not None and np.array_equal(previous, value):
+            return previous
+        array = np.array(value, dtype=float)
+        array.setflags(write=False)
+        return array
+
+    def __init__(self, ring: SharedRecordRing, reset_requested):
+        self.ring = ring
+        self.reset_requested = reset_requested
+        self._names = _NameCodec()
+        self._state = OverlayState(updated_at=time.time())
+        self._seen_written = 0
+
+    @property
+    def current(self) -> OverlayState:
+        written = self.ring.written
+        if written == self._seen_written:
+            return self._state
+        record = self.ring.latest()
+        if record is None:
+            return self._state
+
+        decode = self._names.decode
+        env = np.array(record["env"], dtype=float)
+        env.setflags(write=False)
+        self._state = OverlayState(
+            version=int(record["version"]),
+            tread=dict(zip(TIRE_KEYS, record["tread"].tolist())),
+            wear_per_lap=dict(zip(TIRE_KEYS, record["wear_per_lap"].tolist())),
+            estimate_ready=bool(record["estimate_ready"]),
+            connected=bool(record["connected"]),
+            key=bytes(record["key"]).decode("utf-8", errors="ignore"),
+            model_confidence=float(record["model_confidence"]),
+            sample_count=int(record["sample_count"]),
+            track_temp=float(record["track_temp"]),
+            air_temp=float(record["air_temp"]),
+            humidity=float(record["humidity"]),
+            track_name=decode(bytes(record["track_name"])),
+            track_config=decode(bytes(record["track_config"])),
+            car_path=decode(bytes(record["car_path"])),
+            env=env,
+            forecast=self._optional_array(record["forecast"], self._state.forecast),
+            forecast_progress=float(record["forecast_progress"]),
+            sector_wear=self._optional_array(record["sector_wear"], self._state.sector_wear),
+            sector_wear_laps=int(record["sector_wear_laps"]),
+            estimate_captured_at=float(record["estimate_captured_at"]),
+            updated_at=float(record["updated_at"]),
+        )
+        self._seen_written = written
+        return self._state
+
 
 class ModelWorker(threading.Thread):
-    """Model thread that performs live estimation and incremental learning."""
+    """Model thread that performs live estimation and incremental learning.
+
+    Every snapshot is integrated into the stint tracker (cheap running sums),
+    while the live estimate is computed from the newest snapshot at most
+    ``estimate_hz`` times per second, so a stall never leaves a backlog of
+    stale estimates for the HUD.
+    """
 
-    def __init__(self, in_queue: queue.Queue, state: dict, state_lock: threading.Lock, stop_event: threading.Event):
+    def __init__(self, in_queue: queue.Queue, shared: StatePublisher, stop_event: threading.Event, estimate_hz: float = ESTIMATE_HZ):
         super().__init__(daemon=True)
         self.in_queue = in_queue
-        self.state = state
-        self.state_lock = state_lock
+        self.shared = shared
+        self._pending: Dict[str, object] = {}
         self.stop_event = stop_event
-        self.storage = DataStorage(MODEL_PATH)
+        self.estimate_interval_s = 1.0 / max(0.1, float(estimate_hz))
+        self.storage = ModelStore(MODEL_PATH)
         self.model = TireMLModel(self.storage)
         self._last_key = ""
         self.stints = StintTracker()
         self.smoothed_wear_per_lap = {t: 0.0 for t in TIRE_KEYS}
+        self._last_estimate_session_time: Optional[float] = None
+        self._forecast_token: Optional[tuple] = None
+        self._sector_laps = 0
+        self._prefetch_keys: "queue.Queue[str]" = queue.Queue()
+        self._prefetch_requested: Optional[str] = None
+        self._prefetch_failed: Optional[str] = None
 
     def _update_state(self, **kwargs):
-        with self.state_lock:
-            self.state.update(kwargs)
-            self.state["updated_at"] = time.time()
+        # Collected per loop pass and published as one state by _flush_state.
+        self._pending.update(kwargs)
+
+    def _flush_state(self):
+        if self._pending:
+            self.shared.publish(**self._pending)
+            self._pending = {}
 
     def _consume_reset_request(self) -> bool:
-        with self.state_lock:
-            if not self.state.get("reset_requested", False):
-                return False
-            self.state["reset_requested"] = False
-            return True
+        if not self.shared.reset_requested.is_set():
+            return False
+        self.shared.reset_requested.clear()
+        return True
 
     def _reset_runtime_memory(self):
-        self.storage.data = {}
-        self.storage.save()
+        self.model.clear()
+        self._last_key = ""
         self.stints = StintTracker()
         self.smoothed_wear_per_lap = {t: 0.0 for t in TIRE_KEYS}
+        self._last_estimate_session_time = None
+        self._forecast_token = None
+        self._sector_laps = 0
+        # The cleared model has to load the current key again.
+        self._prefetch_requested = None
+        self._prefetch_failed = None
         self._update_state(
             tread={t: 100.0 for t in TIRE_KEYS},
             wear_per_lap={t: 0.0 for t in TIRE_KEYS},
@@ -999,128 +2314,543 @@ class ModelWorker(threading.Thread):
             model_confidence=0.0,
             sample_count=0,
             estimate_ready=False,
+            forecast=None,
+            sector_wear=None,
+            sector_wear_laps=0,
         )
 
-    def run(self):
+    def _drain_queue(self, timeout: float) -> List[tuple]:
+        try:
+            batch = [self.in_queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                batch.append(self.in_queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _prefetch_loop(self):
+        try:
+            self.model.build_prior_index()
+        except Exception:
+            pass
         while not self.stop_event.is_set():
             try:
-                payload = self.in_queue.get(timeout=0.5)
+                key = self._prefetch_keys.get(timeout=0.5)
             except queue.Empty:
                 continue
+            try:
+                self.model.prefetch(key)
+            except Exception:
+                # _activate_model loads this key synchronously on its next call instead.
+                self._prefetch_failed = key
+                if self._prefetch_requested == key:
+                    self._prefetch_requested = None
+
+    def _activate_model(self, key: str, wait: bool = False) -> bool:
+        """Switch the model to ``key`` if it is loaded (or ``wait``); otherwise ask the prefetcher."""
+        if self.model.active_key == key:
+            return True
+        if wait or self.model.is_cached(key) or key == self._prefetch_failed:
+            self._prefetch_failed = None
+            self.model.load_rls(key)
+            return True
+        if key != self._prefetch_requested:
+            self._prefetch_requested = key
+            self._prefetch_keys.put(key)
+        return False
 
-            snap, connected = payload
-            self._update_state(connected=bool(connected))
-            if self._consume_reset_request():
-                self._reset_runtime_memory()
-            if snap is None:
-                continue
+    def run(self):
+        # Warm the cache with the keys driven most recently; a session-info change
+        # to one of them is then a lookup, and any other key loads in the background.
+        threading.Thread(target=self._prefetch_loop, name="ModelPrefetch", daemon=True).start()
+        for key in self.storage.recent_model_keys(TireMLModel.CACHE_SIZE):
+            self._prefetch_keys.put(key)
+
+        latest: Optional[TelemetrySnapshot] = None
+        next_estimate_at = 0.0
+        while not self.stop_event.is_set():
+            wait = max(0.0, next_estimate_at - time.perf_counter()) if latest is not None else 0.5
+            batch = self._drain_queue(wait)
+
+            if batch:
+                connected = bool(batch[-1][1])
+                self._update_state(connected=connected)
+                if self._consume_reset_request():
+                    self._reset_runtime_memory()
+                for snap, _ in batch:
+                    if snap is not None:
+                        self._integrate(snap)
+                        latest = snap
+
+            if latest is not None and time.perf_counter() >= next_estimate_at:
+                self._publish_estimate(latest)
+                latest = None
+                next_estimate_at = time.perf_counter() + self.estimate_interval_s
+
+            self._flush_state()
+
+        self.storage.close()
+
+    def _integrate(self, snap: TelemetrySnapshot):
+        key = StintTracker.make_dataset_key(snap)
+        if key != self._last_key:
+            self._last_key = key
+            self._activate_model(key)
+            self.model.set_car_class(key, snap.car_class)
+
+        stint_end = self.stints.update(snap)
+        if stint_end:
+            self._learn_from_stint(stint_end, key)
+
+    def _publish_estimate(self, snap: TelemetrySnapshot):
+        key = self._last_key
+        if not self._activate_model(key):
+            self._update_state(key=key, estimate_ready=False, forecast=None)
+            return
+        live_energy_per_lap = self.stints.current_energy_per_lap(snap)
+        env = self.stints.environment_vector(snap)
 
-            key = StintTracker.make_dataset_key(snap)
-            if key != self._last_key:
-                self.model.load_rls(key)
-                self._last_key = key
+        rates_energy, model_confidence, sample_count = self.model.get_rates(
+            key,
+            env,
+            live_energy_per_lap,
+        )
+        baseline_wear_per_lap = self.model.get_wear_per_lap_baseline(
+            key,
+            env,
+        )
+        env = env.copy()
+        env.setflags(write=False)
+        has_base_samples = sample_count >= 1 or self.model.cold_start_theta(key) is not None
+        self._update_state(
+            key=key,
+            track_temp=snap.track_temp,
+            air_temp=snap.air_temp,
+            humidity=snap.humidity,
+            env=env,
+            model_confidence=model_confidence,
+            sample_count=sample_count,
+            track_name=snap.track_name,
+            track_config=snap.track_config,
+            car_path=snap.car_path,
+            estimate_captured_at=snap.captured_at,
+            estimate_ready=has_base_samples,
+        )
 
-            stint_end = self.stints.update(snap)
-            live_energy_per_lap = self.stints.current_energy_per_lap(snap)
-            env_context = self.stints.current_environment_context(snap)
+        live = self.stints.build_live_estimate(snap, rates_energy, baseline_wear_per_lap) if has_base_samples else None
+        if live:
+            laps_done = max(1e-6, live.get("laps_progress", float(live["laps_done"])))
+            energy_per_lap_live = live["energy_used"] / laps_done
+            current_wpl = {t: rates_energy[t] * energy_per_lap_live for t in TIRE_KEYS}
+            for t in TIRE_KEYS:
+                current_wpl[t] = max(current_wpl[t], baseline_wear_per_lap.get(t, 0.0))
 
-            rates_energy, model_confidence, sample_count = self.model.get_rates(
-                key,
-                env_context,
-                live_energy_per_lap,
+            # Exponential smoothing for stable wear rate estimate. The 0.8 decay is per
+            # 60 Hz tick, so it is scaled by the telemetry time covered since the last estimate.
+            decay = 0.8 ** self._ticks_since_last_estimate(snap)
+            for t in TIRE_KEYS:
+                self.smoothed_wear_per_lap[t] = decay * self.smoothed_wear_per_lap[t] + (1.0 - decay) * current_wpl[t]
+
+            self._update_state(
+                tread=dict(live["estimated_tread"]),
+                wear_per_lap=dict(self.smoothed_wear_per_lap),
             )
-            baseline_wear_per_lap = self.model.get_wear_per_lap_baseline(
+            self._update_forecast(snap, key, env, live, energy_per_lap_live, baseline_wear_per_lap, sample_count)
+            self._update_sector_wear(rates_energy)
+        elif not has_base_samples:
+            self._update_state(wear_per_lap={t: 0.0 for t in TIRE_KEYS})
+
+    def _update_forecast(
+        self,
+        snap: TelemetrySnapshot,
+        key: str,
+        env: np.ndarray,
+        live: dict,
+        energy_per_lap: float,
+        baseline_wear_per_lap: Dict[str, float],
+        sample_count: int,
+    ):
+        # The horizon forecast only changes meaningfully once per lap, so it is
+        # recomputed on lap/stint/model changes and otherwise left as published.
+        laps_progress = float(live["laps_progress"])
+        settled = laps_progress >= 0.5  # energy/lap from less than half a lap is too noisy to extrapolate
+        token = (key, snap.lap, sample_count, self.stints.start_data.get("lap_progress"), settled)
+        if token == self._forecast_token:
+            return
+        self._forecast_token = token
+        forecast = None
+        if settled:
+            forecast = self.model.forecast(
                 key,
-                env_context,
-            )
-            self._update_state(
-                key=key,
-                track_temp=snap.track_temp,
-                air_temp=snap.air_temp,
-                humidity=snap.humidity,
-                env_track_temp=env_context["track_temp_avg"],
-                env_air_temp=env_context["air_temp_avg"],
-                env_humidity=env_context["humidity_avg"],
-                env_track_temp_start=env_context["track_temp_start"],
-                env_track_temp_end=env_context["track_temp_end"],
-                env_track_temp_delta=env_context["track_temp_delta"],
-                env_track_temp_std=env_context["track_temp_std"],
-                env_air_temp_start=env_context["air_temp_start"],
-                env_air_temp_end=env_context["air_temp_end"],
-                env_air_temp_delta=env_context["air_temp_delta"],
-                env_humidity_start=env_context["humidity_start"],
-                env_humidity_end=env_context["humidity_end"],
-                env_humidity_delta=env_context["humidity_delta"],
-                env_humidity_std=env_context["humidity_std"],
-                model_confidence=model_confidence,
-                sample_count=sample_count,
-                track_name=snap.track_name,
-                track_config=snap.track_config,
-                car_path=snap.car_path,
+                env,
+                energy_per_lap,
+                np.array([live["estimated_tread"][t] for t in TIRE_KEYS], dtype=float),
+                np.array([baseline_wear_per_lap.get(t, 0.0) for t in TIRE_KEYS], dtype=float),
+                seconds_per_lap=float(env[_ENV_DIM - 1]) / laps_progress,
             )
+        self._update_state(forecast=forecast, forecast_progress=float(snap.lap) + float(snap.lap_dist_pct))
 
-            has_base_samples = sample_count >= 1
-            self._update_state(estimate_ready=has_base_samples)
-
-            live = self.stints.build_live_estimate(snap, rates_energy, baseline_wear_per_lap) if has_base_samples else None
-            if live:
-                laps_done = max(1e-6, live.get("laps_progress", float(live["laps_done"])))
-                energy_per_lap_live = live["energy_used"] / laps_done
-                current_wpl = {t: rates_energy[t] * energy_per_lap_live for t in TIRE_KEYS}
-                for t in TIRE_KEYS:
-                    current_wpl[t] = max(current_wpl[t], baseline_wear_per_lap.get(t, 0.0))
-
-                # Exponential smoothing for stable wear rate estimate.
-                for t in TIRE_KEYS:
-                    self.smoothed_wear_per_lap[t] = 0.8 * self.smoothed_wear_per_lap[t] + 0.2 * current_wpl[t]
-
-                self._update_state(
-                    tread=dict(live["estimated_tread"]),
-                    wear_per_lap=dict(self.smoothed_wear_per_lap),
-                )
-            elif not has_base_samples:
-                self._update_state(wear_per_lap={t: 0.0 for t in TIRE_KEYS})
-
-            if not stint_end:
-                continue
+    def _update_sector_wear(self, rates_energy: Dict[str, float]):
+        # The tracker closes its sector bins once per lap; attribute them when a new lap arrives.
+        laps = self.stints.laps_binned
+        if laps == self._sector_laps:
+            return
+        self._sector_laps = laps
+        attributed = None
+        if laps > 0:
+            rates = np.array([rates_energy[t] for t in TIRE_KEYS], dtype=float)
+            attributed = sector_wear(self.stints.last_lap_energy_bins, self.stints.stint_energy_bins, laps, rates)
+        self._update_state(sector_wear=attributed, sector_wear_laps=laps)
+
+    def _ticks_since_last_estimate(self, snap: TelemetrySnapshot) -> float:
+        previous = self._last_estimate_session_time
+        self._last_estimate_session_time = float(snap.session_time)
+        if previous is None:
+            return 1.0
+        return min(600.0, max(1.0, (float(snap.session_time) - previous) * 60.0))
+
+    def _learn_from_stint(self, stint_end: dict, key: str):
+        if not self.stints.stint_is_valid(stint_end):
+            return
+        self._activate_model(key, wait=True)
 
-            if not self.stints.stint_is_valid(stint_end):
-                continue
+        sample = StintTracker.learning_sample(stint_end)
+
+        if self.model.is_outlier(str(stint_end["key"]), sample):
+            return
 
-            sample = {
-                "track_temp": float(stint_end["track_temp"]),
-                "air_temp": float(stint_end["air_temp"]),
-                "humidity": float(stint_end.get("humidity", 50.0)),
-                "track_temp_avg": float(stint_end.get("track_temp_avg", stint_end["track_temp"])),
-                "track_temp_start": float(stint_end.get("track_temp_start", stint_end["track_temp"])),
-                "track_temp_end": float(stint_end.get("track_temp_end", stint_end["track_temp"])),
-                "track_temp_delta": float(stint_end.get("track_temp_delta", 0.0)),
-                "track_temp_std": float(stint_end.get("track_temp_std", 0.0)),
-                "air_temp_avg": float(stint_end.get("air_temp_avg", stint_end["air_temp"])),
-                "air_temp_start": float(stint_end.get("air_temp_start", stint_end["air_temp"])),
-                "air_temp_end": float(stint_end.get("air_temp_end", stint_end["air_temp"])),
-                "air_temp_delta": float(stint_end.get("air_temp_delta", 0.0)),
-                "humidity_avg": float(stint_end.get("humidity_avg", stint_end.get("humidity", 50.0))),
-                "humidity_start": float(stint_end.get("humidity_start", stint_end.get("humidity", 50.0))),
-                "humidity_end": float(stint_end.get("humidity_end", stint_end.get("humidity", 50.0))),
-                "humidity_delta": float(stint_end.get("humidity_delta", 0.0)),
-                "laps": int(stint_end["laps"]),
-                "energy_per_lap": float(stint_end["energy_per_lap"]),
-                "lf": float(stint_end["wear_per_energy"]["lf"]),
-                "rf": float(stint_end["wear_per_energy"]["rf"]),
-                "lr": float(stint_end["wear_per_energy"]["lr"]),
-                "rr": float(stint_end["wear_per_energy"]["rr"]),
+        self.model.add_stint_sample(str(stint_end["key"]), sample)
+        self._update_state(
+            sample_count=self.model.sample_count(key),
+            model_confidence=self.model._rls.confidence,
+            estimate_ready=self.model.sample_count(key) >= 1,
+        )
+
+
+def _model_process_main(snapshot_ring: str, state_ring: str, snapshots_ready, stop_event, reset_requested):
+    """Entry point of the model process; module level so the spawn start method can import it."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    parent = multiprocessing.parent_process()
+    if parent is not None:
+        # Also stop if the UI process dies without reaching shutdown().
+        threading.Thread(target=lambda: (parent.join(), stop_event.set()), daemon=True).start()
+
+    snapshots = SharedRecordRing.attach(snapshot_ring, SNAPSHOT_DTYPE, SNAPSHOT_RING_SIZE)
+    states = SharedRecordRing.attach(state_ring, STATE_DTYPE, STATE_RING_SIZE)
+    try:
+        ModelWorker(SnapshotRingReader(snapshots, snapshots_ready), SharedStateWriter(states, reset_requested), stop_event).run()
+    finally:
+        snapshots.close()
+        states.close()
+
+
+IBT_CHANNELS = {
+    "session_time": "SessionTime",
+    "lap": "Lap",
+    "lap_dist_pct": "LapDistPct",
+    "on_pit_road": "OnPitRoad",
+    "speed_mps": "Speed",
+    "lat_accel": "LatAccel",
+    "track_temp": "TrackTemp",
+    "air_temp": "AirTemp",
+    "humidity": "RelativeHumidity",
+    "pit_sv_flags": "PitSvFlags",
+}
+IBT_FALLBACK_CHANNELS = {"track_temp": "TrackTempCrew"}
+
+
+def session_metadata_from_info(info: dict) -> Dict[str, str]:
+    """Track, config, player car and car class names from a parsed session-info dict."""
+    weekend = info.get("WeekendInfo") or {}
+    driver_info = info.get("DriverInfo") or {}
+    player_idx = driver_info.get("DriverCarIdx")
+    car: dict = {}
+    for entry in driver_info.get("Drivers") or []:
+        if isinstance(entry, dict) and entry.get("CarIdx") == player_idx:
+            car = entry
+            break
+    return {
+        "TrackName": _prettify_name(weekend.get("TrackDisplayName") or weekend.get("TrackName")),
+        "TrackConfigName": _prettify_name(weekend.get("TrackConfigName")),
+        "CarPath": _prettify_name(car.get("CarScreenName") or car.get("CarScreenNameShort") or car.get("CarPath")),
+        "CarClass": _car_class_name(car),
+    }
+
+
+def _ibt_session_info(ibt) -> dict:
+    # pyirsdk's IBT reader does not parse the session YAML, so read it from the file header.
+    # Failures raise: without track and car names the file's stints have no key to go to.
+    import yaml
+
+    try:
+        header = ibt._header
+        start = int(header.session_info_offset)
+        raw = bytes(ibt._shared_mem[start : start + int(header.session_info_len)])
+    except (AttributeError, TypeError, ValueError) as exc:
+        raise ValueError(f"cannot read the session info block ({type(exc).__name__}: {exc})") from exc
+    try:
+        info = yaml.safe_load(raw.rstrip(b"\x00").decode("latin-1"))
+    except yaml.YAMLError as exc:
+        raise ValueError(f"unreadable session info ({type(exc).__name__})") from exc
+    if not isinstance(info, dict):
+        raise ValueError("session info is empty")
+    return info
+
+
+def read_ibt_channels(path: str) -> Tuple[Dict[str, np.ndarray], Dict[str, str]]:
+    """Load the channels StintTracker needs from an .ibt file as full-length arrays."""
+    ibt = irsdk.IBT()
+    ibt.open(path)
+    try:
+        names = set(ibt.var_headers_names or [])
+        channels: Dict[str, np.ndarray] = {}
+        for field, var in IBT_CHANNELS.items():
+            if var not in names:
+                var = IBT_FALLBACK_CHANNELS.get(field, var)
+            if var not in names:
+                raise ValueError(f"missing channel {var}")
+            channels[field] = np.asarray(ibt.get_all(var), dtype=float)
+
+        count = channels["session_time"].size
+        for tire, fields in WEAR_FIELDS.items():
+            var = fields[INNER_WEAR_INDEX[tire]]
+            values = np.maximum(0.0, np.asarray(ibt.get_all(var), dtype=float)) if var in names else np.full(count, 100.0)
+            # Same normalisation as TelemetryReader: fractions become percent.
+            channels[f"wear_{tire}"] = np.where(values <= 1.5, values * 100.0, values)
+        meta = session_metadata_from_info(_ibt_session_info(ibt))
+    finally:
+        ibt.close()
+    missing = [name for name, field in (("track", "TrackName"), ("car", "CarPath")) if not meta[field]]
+    if missing:
+        raise ValueError(f"session info has no {' or '.join(missing)} name")
+    return channels, meta
+
+
+def _snapshot_at(channels: Dict[str, np.ndarray], i: int) -> TelemetrySnapshot:
+    return TelemetrySnapshot(
+        float(channels["session_time"][i]),
+        int(channels["lap"][i]),
+        float(channels["lap_dist_pct"][i]),
+        bool(channels["on_pit_road"][i] > 0.5),
+        float(channels["speed_mps"][i]),
+        float(channels["lat_accel"][i]),
+        0.0,
+        0.0,
+        float(channels["track_temp"][i]),
+        float(channels["air_temp"][i]),
+        float(channels["humidity"][i]),
+        int(channels["pit_sv_flags"][i]),
+        {tire: float(channels[f"wear_{tire}"][i]) for tire in TIRE_KEYS},
+        "",
+        "",
+        "",
+    )
+
+
+def reconstruct_stints(channels: Dict[str, np.ndarray], key: str) -> List[dict]:
+    """Rebuild the stint results StintTracker would emit for a whole recording.
+
+    Energy, environment and lap timing are cumulative sums over the full
+    arrays, so each stint is a few differences; only pit-road transitions are
+    walked in Python. The boundary rules (stint frozen at pit entry, wear
+    finalised from the pit stop, tire changes from PitSvFlags after stopping
+    or a wear jump) match StintTracker.update.
+    """
+    t = channels["session_time"]
+    n = t.size
+    if n < 2:
+        return []
+
+    pit = channels["on_pit_road"] > 0.5
+    speed = channels["speed_mps"]
+    dt = np.zeros(n)
+    dt[1:] = np.maximum(0.0, np.diff(t))
+    energy = np.cumsum(np.abs(channels["lat_accel"]) * speed * dt)
+
+    env_dt = np.where(dt > 1e-9, dt, 0.0)
+    env_time = np.cumsum(env_dt)
+    env_cum: Dict[str, np.ndarray] = {}
+    env_sq_cum: Dict[str, np.ndarray] = {}
+    for channel in ENV_CHANNELS:
+        v = channels[channel]
+        step = np.zeros(n)
+        step_sq = np.zeros(n)
+        step[1:] = 0.5 * (v[:-1] + v[1:]) * env_dt[1:]
+        step_sq[1:] = 0.5 * (v[:-1] * v[:-1] + v[1:] * v[1:]) * env_dt[1:]
+        env_cum[channel] = np.cumsum(step)
+        env_sq_cum[channel] = np.cumsum(step_sq)
+
+    lap = channels["lap"].astype(np.int64)
+    progress = lap + channels["lap_dist_pct"]
+    crossings = np.flatnonzero(lap[1:] > np.maximum.accumulate(lap)[:-1]) + 1
+    lap_time = t[crossings] - t[np.concatenate(([0], crossings[:-1]))]
+    timed = (lap_time >= 20.0) & (lap_time <= 500.0)
+
+    wear = np.column_stack([channels[f"wear_{tire}"] for tire in TIRE_KEYS])
+    flags = channels["pit_sv_flags"].astype(np.int64)
+    flag_bits = np.array([PIT_TIRE_CHANGE_FLAGS[tire] for tire in TIRE_KEYS], dtype=np.int64)
+
+    tracker = StintTracker()
+    stints: List[dict] = []
+    in_stint = not pit[0]
+    stint_start = 0
+    start_wear = wear[0]
+    pit_entry: Optional[int] = None
+    window_start = 0
+
+    for k in np.flatnonzero(pit[1:] != pit[:-1]) + 1:
+        if pit[k]:
+            if in_stint:
+                in_stint = False
+                pit_entry = int(k)
+            continue
+
+        pit_ticks = window_start + np.flatnonzero(pit[window_start:k])
+        final_wear = wear[pit_ticks].min(axis=0) if pit_ticks.size else wear[k]
+        changed = np.zeros(len(TIRE_KEYS), dtype=bool)
+        if pit_ticks.size:
+            changed |= ((wear[pit_ticks] - wear[pit_ticks[0]]) >= StintTracker.PIT_WEAR_RESET_THRESHOLD).any(axis=0)
+            stopped = np.flatnonzero(speed[pit_ticks] * 3.6 < 1.0)
+            if stopped.size:
+                serviced = flags[pit_ticks[stopped[0] :]]
+                changed |= ((serviced[:, None] & flag_bits) != 0).any(axis=0)
+
+        if pit_entry is not None:
+            s, p = stint_start, pit_entry
+            tracker.env_time_accum = float(env_time[p] - env_time[s])
+            tracker.env_integral = {c: float(env_cum[c][p] - env_cum[c][s]) for c in ENV_CHANNELS}
+            tracker.env_sq_integral = {c: float(env_sq_cum[c][p] - env_sq_cum[c][s]) for c in ENV_CHANNELS}
+            tracker.env_start = {c: float(channels[c][s]) for c in ENV_CHANNELS}
+            tracker.start_data = {
+                "wear": dict(zip(TIRE_KEYS, start_wear.tolist())),
+                "lap_progress": float(progress[s]),
+                "energy": float(energy[s]),
+                "key": key,
+            }
+            in_window = (crossings > s) & (crossings <= p) & timed
+            end_info = {
+                "key": key,
+                "session_time": float(t[p]),
+                "lap": int(lap[p]),
+                "lap_progress": float(progress[p]),
+                "energy": float(energy[p]),
+                "env": tracker._environment_summary(_snapshot_at(channels, p)),
+                "lap_times": lap_time[in_window].tolist(),
+                "min_speed_kmh": float(speed[s : p + 1].min() * 3.6),
             }
+            stints.append(tracker._build_stint_result(end_info, dict(zip(TIRE_KEYS, final_wear.tolist()))))
 
-            if self.model.is_outlier(str(stint_end["key"]), sample):
-                continue
+        in_stint = True
+        stint_start = window_start = int(k)
+        start_wear = np.where(changed, 100.0, final_wear)
+        pit_entry = None
 
-            self.model.add_stint_sample(str(stint_end["key"]), sample)
-            self._update_state(
-                sample_count=self.model.sample_count(key),
-                model_confidence=self.model._rls["lf"].confidence,
-                estimate_ready=self.model.sample_count(key) >= 1,
-            )
+    return stints
+
+
+def _train_ibt_file(path: str) -> Tuple[str, str, str, List[dict], str]:
+    """Process-pool entry point: (path, dataset key, car class, learning samples, error)."""
+    try:
+        channels, meta = read_ibt_channels(path)
+    except Exception as exc:
+        return path, "", "", [], str(exc) or type(exc).__name__
+    key = _dataset_key(meta["TrackName"], meta["TrackConfigName"], meta["CarPath"])
+    tracker = StintTracker()
+    samples = [StintTracker.learning_sample(stint) for stint in reconstruct_stints(channels, key) if tracker.stint_is_valid(stint)]
+    return path, key, meta.get("CarClass", ""), samples, ""
+
+
+def train_from_ibt_folder(folder: str, workers: Optional[int] = None) -> int:
+    """Learn every stint found in a folder tree of .ibt files into the model store.
+
+    Files are parsed in parallel worker processes; stints are then fitted per
+    dataset key in recording order. Each file is remembered by path, size and
+    mtime so a second run only picks up new recordings.
+    """
+    files = sorted(Path(folder).rglob("*.ibt"), key=lambda p: p.stat().st_mtime)
+    storage = ModelStore(MODEL_PATH)
+    todo = []
+    for path in files:
+        stat = path.stat()
+        token = f"ibt:{path.resolve()}:{stat.st_size}:{int(stat.st_mtime)}"
+        if storage.get_meta(token) is None:
+            todo.append((str(path), token))
+    print(f"{len(files)} .ibt files found, {len(todo)} not imported yet")
+
+    by_key: Dict[str, List[dict]] = {}
+    classes: Dict[str, str] = {}
+    imported = []
+    started = time.perf_counter()
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for (path, key, car_class, samples, error), (_, token) in zip(pool.map(_train_ibt_file, [p for p, _ in todo]), todo):
+                if error:
+                    print(f"  skipped {os.path.basename(path)}: {error}")
+                    continue
+                print(f"  {os.path.basename(path)}: {len(samples)} valid stints  [{key}]")
+                by_key.setdefault(key, []).extend(samples)
+                if car_class:
+                    classes[key] = car_class
+                imported.append(token)
+
+    model = TireMLModel(storage)
+    for key, car_class in classes.items():
+        model.set_car_class(key, car_class)
+    for key, samples in by_key.items():
+        model.load_rls(key)
+        accepted = model.add_stint_samples(key, samples)
+        print(f"{key}: learned {accepted} of {len(samples)} stints, {model.sample_count(key)} samples total")
+    for token in imported:
+        storage.set_meta(token, str(time.time()))
+    storage.close()
+    print(f"done in {time.perf_counter() - started:.1f} s")
+    return 0
+
+
+def _score_forgetting_factor(job: Tuple[str, float, np.ndarray, np.ndarray]) -> Tuple[str, float, float]:
+    """Process-pool entry point: mean one-step-ahead error of ``lam`` on one key's stints."""
+    key, lam, X, Y = job
+    _, _, errors = MultiTargetRLS.batch_solve(X, Y, lam)
+    return key, lam, float(np.mean(np.abs(errors[LAM_TUNE_BURN_IN:])))
+
+
+def tune_forgetting_factors(workers: Optional[int] = None, candidates: Sequence[float] = LAM_CANDIDATES) -> int:
+    """Choose each dataset key's RLS forgetting factor from its own stint history.
+
+    A candidate is scored by predicting every stint from the fit on the
+    stints before it only, which is exactly the trade-off ``lam`` controls:
+    remembering more history versus following a setup or rubber change.
+    The winner is stored per key and the key's model is refitted with it.
+    """
+    storage = ModelStore(MODEL_PATH)
+    model = TireMLModel(storage)
+    data: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    for key in storage.dataset_keys():
+        samples = [s for s in storage.get_samples(key) if all(tire in s for tire in TIRE_KEYS)]
+        if len(samples) < LAM_TUNE_MIN_SAMPLES:
+            print(f"{key}: {len(samples)} stints, need {LAM_TUNE_MIN_SAMPLES} to tune")
+            continue
+        data[key] = model.training_arrays(samples)
+
+    scores: Dict[str, Dict[float, float]] = {}
+    jobs = [(key, float(lam), X, Y) for key, (X, Y) in data.items() for lam in candidates]
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for key, lam, score in pool.map(_score_forgetting_factor, jobs, chunksize=len(candidates)):
+                scores.setdefault(key, {})[lam] = score
+
+    for key, by_lam in scores.items():
+        previous = model.forgetting_factor(key)
+        best = min(by_lam, key=by_lam.__getitem__)
+        storage.set_meta(f"lam:{key}", repr(best))
+        model._rebuild_rls_from_samples(key)
+        model.save_rls(key)
+        table = "  ".join(f"{lam:g}:{err:.2e}" for lam, err in sorted(by_lam.items()))
+        print(f"{key}: lam {previous:g} -> {best:g}  [{table}]")
+    storage.close()
+    return 0
 
 
 class InfoDialog(QtWidgets.QDialog):
@@ -1273,6 +3003,12 @@ class SettingsDialog(QtWidgets.QDialog):
         self.h_spin.setRange(120, 600)
         self.h_spin.setValue(parent.settings["height"])
 
+        self.forecast_spin = QtWidgets.QSpinBox()
+        self.forecast_spin.setRange(5, 95)
+        self.forecast_spin.setSuffix(" %")
+        self.forecast_spin.setValue(int(parent.settings.get("forecast_threshold", 60)))
+        self.forecast_spin.setToolTip("Full mode shows the lap the first tire is forecast to reach this tread")
+
         btn_quick_start = QtWidgets.QPushButton("Quick start guide")
         btn_quick_start.clicked.connect(parent.open_quick_start)
         btn_help = QtWidgets.QPushButton("?")
@@ -1301,6 +3037,7 @@ class SettingsDialog(QtWidgets.QDialog):
         size_row.addWidget(QtWidgets.QLabel("H"))
         size_row.addWidget(self.h_spin)
         form.addRow("Overlay size", size_row)
+        form.addRow("Forecast threshold", self.forecast_spin)
 
         bottom = QtWidgets.QHBoxLayout()
         bottom.addWidget(btn_help)
@@ -1338,20 +3075,147 @@ class SettingsDialog(QtWidgets.QDialog):
         self.parent_overlay.settings["font_size"] = int(self.font_spin.value())
         self.parent_overlay.settings["width"] = int(self.w_spin.value())
         self.parent_overlay.settings["height"] = int(self.h_spin.value())
+        self.parent_overlay.settings["forecast_threshold"] = int(self.forecast_spin.value())
         self.parent_overlay.apply_settings()
         self.parent_overlay.save_settings()
 
 
+class HudPanel(QtWidgets.QWidget):
+    """Painted HUD text block: one cached QStaticText per row, repainted per changed row.
+
+    The widget reserves room for the most rows the display mode can show and
+    only paints the background behind the rows in use, so the overlay window
+    keeps its size while lines come and go. It grows wider when a line no
+    longer fits and is re-measured when the font or mode changes.
+    """
+
+    # Border + padding + rich-text document margin of the QLabel this replaced.
+    PADDING = 17
+    RADIUS = 12.0
+
+    def __init__(self, parent: QtWidgets.QWidget):
+        super().__init__(parent)
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents, True)
+        self.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        self._font = QtGui.QFont()
+        self._metrics = QtGui.QFontMetrics(self._font)
+        self._background = QtGui.QColor(0, 0, 0, 160)
+        self._border = QtGui.QPen(QtGui.QColor(255, 255, 255, 26), 1.0)
+        self._colors: Dict[str, QtGui.QColor] = {}
+        self._rows = 0
+        self._line_height = 0
+        self._min_text_width = 0
+        self._text_width = 0
+        self._lines: List[Tuple[str, str]] = []
+        self._static: List[QtGui.QStaticText] = []
+        self._content_width = 0
+
+    def set_style(self, font_size: int, bg_alpha: int, rows: int, min_text: Sequence[str] = ()):
+        """Font, background and reserved row count; the only calls that re-measure the layout."""
+        font = QtGui.QFont("Consolas")
+        font.setStyleHint(QtGui.QFont.Monospace)
+        font.setPixelSize(max(6, int(font_size)))
+        font.setBold(True)
+        self._font = font
+        self._metrics = QtGui.QFontMetrics(font)
+        self._line_height = self._metrics.lineSpacing()
+        self._background = QtGui.QColor(0, 0, 0, max(0, min(255, int(bg_alpha))))
+        self._rows = max(1, int(rows))
+        self._min_text_width = max([self._metrics.horizontalAdvance(text) for text in min_text] or [0])
+        self._text_width = self._min_text_width
+        lines, self._lines, self._static = self._lines, [], []
+        self._content_width = 0
+        self.set_lines(lines)
+        self.updateGeometry()
+        self.adjustSize()
+        self.update()
+
+    def sizeHint(self) -> QtCore.QSize:
+        pad = 2 * self.PADDING
+        return QtCore.QSize(self._text_width + pad + 2, self._rows * self._line_height + pad + 2)
+
+    def _color(self, name: str) -> QtGui.QColor:
+        color = self._colors.get(name)
+        if color is None:
+            color = self._colors[name] = QtGui.QColor(name)
+        return color
+
+    def _row_rect(self, row: int) -> QtCore.QRect:
+        return QtCore.QRect(self.PADDING, self.PADDING + row * self._line_height, self._text_width + 2, self._line_height)
+
+    def _panel_rect(self) -> QtCore.QRectF:
+        used = max(1, len(self._lines))
+        return QtCore.QRectF(0.5, 0.5, self._content_width + 2 * self.PADDING, used * self._line_height + 2 * self.PADDING)
+
+    def set_lines(self, lines: Sequence[Tuple[str, str]]) -> bool:
+        """Show ``(text, color)`` rows; returns True when the widget needs more width."""
+        lines = list(lines[: self._rows])
+        if lines == self._lines:
+            return False
+
+        old_count = len(self._lines)
+        dirty: List[int] = []
+        for row, (text, color) in enumerate(lines):
+            if row < old_count and self._lines[row] == (text, color):
+                continue
+            if row >= old_count or self._lines[row][0] != text:
+                static = QtGui.QStaticText(text)
+                static.setTextFormat(QtCore.Qt.PlainText)
+                static.prepare(QtGui.QTransform(), self._font)
+                if row < len(self._static):
+                    self._static[row] = static
+                else:
+                    self._static.append(static)
+            dirty.append(row)
+        del self._static[len(lines) :]
+        self._lines = lines
+
+        content_width = max(int(np.ceil(st.size().width())) for st in self._static) if self._static else 0
+        grew = content_width > self._text_width
+        if grew:
+            self._text_width = content_width
+            self.updateGeometry()
+            self.adjustSize()
+
+        if grew or len(lines) != old_count or content_width != self._content_width:
+            # Background outline changes shape: repaint the whole panel once.
+            self._content_width = content_width
+            self.update()
+        else:
+            for row in dirty:
+                self.update(self._row_rect(row))
+        return grew
+
+    def paintEvent(self, e: QtGui.QPaintEvent):
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        painter.setPen(self._border)
+        painter.setBrush(self._background)
+        painter.drawRoundedRect(self._panel_rect(), self.RADIUS, self.RADIUS)
+
+        painter.setFont(self._font)
+        dirty = e.rect()
+        for row, ((_, color), static) in enumerate(zip(self._lines, self._static)):
+            rect = self._row_rect(row)
+            if not rect.intersects(dirty):
+                continue
+            painter.setPen(self._color(color))
+            painter.drawStaticText(rect.topLeft(), static)
+        painter.end()
+
+
 class OverlayUI(QtWidgets.QWidget):
     """Transparent HUD with mini menu (settings/info), updated at 10 Hz."""
 
-    def __init__(self, state: dict, state_lock: threading.Lock):
+    MAX_TOASTS_SHOWN = 2
+
+    def __init__(self, shared: StatePublisher):
         super().__init__()
-        self.state = state
-        self.state_lock = state_lock
+        self.shared = shared
+        self._shown_version = -1
         self.drag_origin: Optional[QtCore.QPoint] = None
         self.settings = self.load_settings()
-        self.model_ref = TireMLModel(DataStorage(MODEL_PATH))
+        self.model_ref = TireMLModel(ModelStore(MODEL_PATH, legacy_json_path=None))
         self.toasts: List[dict] = []
         self.last_connected: Optional[bool] = None
         self.last_dataset_token = ""
@@ -1359,11 +3223,12 @@ class OverlayUI(QtWidgets.QWidget):
         self.last_sample_count = 0
         self._last_auto_size: Tuple[int, int] = (0, 0)
         self.controls_visible = True
+        self._last_estimate_stamp = 0.0
+        self._latency_ms: Deque[float] = deque(maxlen=300)
+        self._forecast_line_key: Optional[tuple] = None
+        self._forecast_line: Optional[Tuple[str, str]] = None
 
-        self.label = QtWidgets.QLabel(self)
-        self.label.setAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop)
-        self.label.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents, True)
-        self.label.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        self.panel = HudPanel(self)
 
         self.top_bar = QtWidgets.QFrame(self)
         self.top_bar.setObjectName("TopBar")
@@ -1399,7 +3264,7 @@ class OverlayUI(QtWidgets.QWidget):
 
         layout = QtWidgets.QVBoxLayout(self)
         layout.addWidget(self.top_bar, 0, QtCore.Qt.AlignRight)
-        layout.addWidget(self.label)
+        layout.addWidget(self.panel)
         layout.setContentsMargins(6, 6, 6, 6)
         layout.setSpacing(6)
         self.setLayout(layout)
@@ -1418,6 +3283,13 @@ class OverlayUI(QtWidgets.QWidget):
         self.timer.timeout.connect(self.refresh)
         self.timer.start(100)
 
+    def attach_state(self, shared: StatePublisher, notice: str = ""):
+        """Switch to another state source, e.g. after the model moved to a thread."""
+        self.shared = shared
+        self._shown_version = -1
+        if notice:
+            self._push_toast(notice, "#FF9F1C", 8.0)
+
     @staticmethod
     def _color_for_value(v: float) -> str:
         if v > 80.0:
@@ -1435,6 +3307,7 @@ class OverlayUI(QtWidgets.QWidget):
             "font_size": 18,
             "width": 340,
             "height": 220,
+            "forecast_threshold": 60,
             "x": 120,
             "y": 120,
         }
@@ -1501,7 +3374,7 @@ class OverlayUI(QtWidgets.QWidget):
         self._set_controls_visible(False)
 
     def _fit_to_content(self, force: bool = False):
-        self.label.adjustSize()
+        self.panel.adjustSize()
         layout = self.layout()
         if layout is not None:
             layout.activate()
@@ -1536,20 +3409,11 @@ class OverlayUI(QtWidgets.QWidget):
         font_size = int(self.settings["font_size"])
         alpha = int(self.settings["bg_alpha"])
         panel_alpha = min(235, alpha + 28)
-        self.label.setStyleSheet(
-            f"""
-            QLabel {{
-                color: white;
-                font-family: Consolas, monospace;
-                font-size: {font_size}px;
-                font-weight: bold;
-                background-color: rgba(0, 0, 0, {alpha});
-                border: 1px solid rgba(255, 255, 255, 26);
-                border-radius: 12px;
-                padding: 12px;
-            }}
-            """
-        )
+        if self._is_minimal_mode():
+            self.panel.set_style(font_size, alpha, len(TIRE_KEYS) + self.MAX_TOASTS_SHOWN, ("LF 100.0%",))
+        else:
+            self.panel.set_style(font_size, alpha, len(TIRE_KEYS) + 7, ("Model confidence: 100%", "LF 60% on lap 100 ±10"))
+        self._shown_version = -1
         self.top_bar.setStyleSheet(
             f"""
             QFrame#TopBar {{
@@ -1619,26 +3483,25 @@ class OverlayUI(QtWidgets.QWidget):
     def _active_toasts(self) -> List[dict]:
         now = time.time()
         self.toasts = [t for t in self.toasts if t["expires"] > now]
-        return self.toasts[-2:]
+        return self.toasts[-self.MAX_TOASTS_SHOWN :]
 
     def open_info(self):
-        with self.state_lock:
-            key = self.state.get("key", "unknown")
-            connected = self.state.get("connected", False)
-            temp = float(self.state.get("track_temp", 0.0))
-            air = float(self.state.get("air_temp", 0.0))
-            humidity = float(self.state.get("humidity", 0.0))
-            env_t_avg = float(self.state.get("env_track_temp", temp))
-            env_t_start = float(self.state.get("env_track_temp_start", temp))
-            env_t_end = float(self.state.get("env_track_temp_end", temp))
-            env_t_delta = float(self.state.get("env_track_temp_delta", 0.0))
-            env_t_std = float(self.state.get("env_track_temp_std", 0.0))
-            env_h_avg = float(self.state.get("env_humidity", humidity))
-            env_h_start = float(self.state.get("env_humidity_start", humidity))
-            env_h_end = float(self.state.get("env_humidity_end", humidity))
-            env_h_delta = float(self.state.get("env_humidity_delta", 0.0))
-            model_conf = float(self.state.get("model_confidence", 0.0))
-            samples = int(self.state.get("sample_count", 0))
+        state = self.shared.current
+        key = state.key
+        connected = state.connected
+        temp, air, humidity = state.track_temp, state.air_temp, state.humidity
+        env = state.env
+        env_t_avg = float(env[ENV_INDEX["track_temp_avg"]])
+        env_t_start = float(env[ENV_INDEX["track_temp_start"]])
+        env_t_end = float(env[ENV_INDEX["track_temp_end"]])
+        env_t_delta = float(env[ENV_INDEX["track_temp_delta"]])
+        env_t_std = float(env[ENV_INDEX["track_temp_std"]])
+        env_h_avg = float(env[ENV_INDEX["humidity_avg"]])
+        env_h_start = float(env[ENV_INDEX["humidity_start"]])
+        env_h_end = float(env[ENV_INDEX["humidity_end"]])
+        env_h_delta = float(env[ENV_INDEX["humidity_delta"]])
+        model_conf = state.model_confidence
+        samples = state.sample_count
 
         msg = (
             f"Connection: {'Connected' if connected else 'Disconnected'}\n"
@@ -1650,14 +3513,25 @@ class OverlayUI(QtWidgets.QWidget):
             f"Track transition: {env_t_start:.1f} → {env_t_end:.1f} °C  (Δ {env_t_delta:+.1f}, σ {env_t_std:.2f})\n"
             f"Humidity transition: {env_h_start:.1f} → {env_h_end:.1f} %  (Δ {env_h_delta:+.1f})\n"
             f"Samples: {samples}\n"
-            f"Model confidence: {model_conf:.1%}\n\n"
+            f"Model confidence: {model_conf:.1%}\n"
+            f"{self._latency_report()}\n\n"
         )
+        msg += self._sector_wear_report(state)
         self.model_ref.load_rls(str(key))
         msg += self.model_ref.get_coefficients_report(str(key))
         self.info_dialog.set_info(msg)
         self.info_dialog.show()
         self.info_dialog.raise_()
 
+    def _latency_report(self) -> str:
+        if not self._latency_ms:
+            return "HUD latency: no live estimates yet"
+        values = np.fromiter(self._latency_ms, dtype=float)
+        return (
+            f"HUD latency (tick → display): median {np.median(values):.0f} ms, "
+            f"p95 {np.percentile(values, 95):.0f} ms, max {values.max():.0f} ms  (n={values.size})"
+        )
+
     def open_settings(self):
         self.settings_dialog.show()
         self.settings_dialog.raise_()
@@ -1691,44 +3565,111 @@ class OverlayUI(QtWidgets.QWidget):
         self.last_sample_count = sample_count
 
     def refresh(self):
-        with self.state_lock:
-            tread = dict(self.state.get("tread", {t: 100.0 for t in TIRE_KEYS}))
-            connected = bool(self.state.get("connected", False))
-            track_name = str(self.state.get("track_name", "") or "-")
-            track_config = str(self.state.get("track_config", "") or "-")
-            car_path = str(self.state.get("car_path", "") or "-")
-            estimate_ready = bool(self.state.get("estimate_ready", False))
-            model_confidence = float(self.state.get("model_confidence", 0.0))
-            sample_count = int(self.state.get("sample_count", 0))
+        state = self.shared.current
+        if state.version == self._shown_version and not (self.toasts and self._is_minimal_mode()):
+            return
+        self._shown_version = state.version
+
+        tread = state.tread
+        connected = state.connected
+        track_name = state.track_name or "-"
+        track_config = state.track_config or "-"
+        car_path = state.car_path or "-"
+        estimate_ready = state.estimate_ready
+        model_confidence = state.model_confidence
+        sample_count = state.sample_count
+        estimate_stamp = state.estimate_captured_at
+
+        if estimate_stamp > self._last_estimate_stamp:
+            # Telemetry tick -> HUD text, including the wait for this refresh timer.
+            self._latency_ms.append((time.perf_counter() - estimate_stamp) * 1000.0)
+            self._last_estimate_stamp = estimate_stamp
 
         self._update_toasts_from_state(connected, track_name, track_config, car_path, model_confidence, sample_count)
 
-        tire_lines = [
-            f"<span style='color:{self._color_for_value(tread.get('lf', 100.0))}'>LF {tread.get('lf', 100.0):5.1f}%</span>",
-            f"<span style='color:{self._color_for_value(tread.get('rf', 100.0))}'>RF {tread.get('rf', 100.0):5.1f}%</span>",
-            f"<span style='color:{self._color_for_value(tread.get('lr', 100.0))}'>LR {tread.get('lr', 100.0):5.1f}%</span>",
-            f"<span style='color:{self._color_for_value(tread.get('rr', 100.0))}'>RR {tread.get('rr', 100.0):5.1f}%</span>",
-        ]
-
-        if not estimate_ready and self.settings.get("display_mode", "full") == "full":
-            tire_lines.append("<span style='color:#9AA0A6'>Learning model…</span>")
-
-        lines = list(tire_lines)
-        if self.settings.get("display_mode", "full") == "full":
+        full_mode = self.settings.get("display_mode", "full") == "full"
+        lines = [(f"{tire.upper()} {tread.get(tire, 100.0):.1f}%", self._color_for_value(tread.get(tire, 100.0))) for tire in TIRE_KEYS]
+        if not estimate_ready and full_mode:
+            lines.append(("Learning model…", "#9AA0A6"))
+        elif sample_count == 0 and full_mode:
+            lines.append(("Learning model… (using similar cars/tracks)", "#9AA0A6"))
+
+        if full_mode:
+            for extra in (self._forecast_text(state), self._hot_sector_text(state)):
+                if extra is not None:
+                    lines.append(extra)
             lines.extend(
                 [
-                    f"<span style='color:#B8E0FF'>Track: {track_name} ({track_config})</span>",
-                    f"<span style='color:#B8E0FF'>Car: {car_path}</span>",
-                    f"<span style='color:#FFD166'>Model confidence: {model_confidence:.0%}</span>",
-                    f"<span style='color:{'#7CFC00' if connected else '#FF4C4C'}'>SDK: {'ONLINE' if connected else 'OFFLINE'}</span>",
+                    (f"Track: {track_name} ({track_config})", "#B8E0FF"),
+                    (f"Car: {car_path}", "#B8E0FF"),
+                    (f"Model confidence: {model_confidence:.0%}", "#FFD166"),
+                    (f"SDK: {'ONLINE' if connected else 'OFFLINE'}", "#7CFC00" if connected else "#FF4C4C"),
                 ]
             )
         else:
-            for toast in self._active_toasts():
-                lines.append(f"<span style='color:{toast['color']}'>{toast['text']}</span>")
+            lines.extend((toast["text"], toast["color"]) for toast in self._active_toasts())
+
+        if self.panel.set_lines(lines):
+            self._fit_to_content()
+
+    def _forecast_text(self, state: OverlayState) -> Optional[Tuple[str, str]]:
+        # A new forecast arrives about once per lap; the line is cached until then.
+        threshold = float(self.settings.get("forecast_threshold", 60))
+        cache_key = (state.key, state.forecast_progress, threshold, state.forecast is None)
+        if cache_key == self._forecast_line_key:
+            return self._forecast_line
+        self._forecast_line_key = cache_key
+        self._forecast_line = None
+        if state.forecast is None:
+            return None
+
+        expected, earliest, latest = forecast_crossings(state.forecast, threshold)
+        horizon = state.forecast.shape[1] - 1
+        if (expected < 0).all():
+            self._forecast_line = (f"All tires > {threshold:.0f}% for {horizon}+ laps", "#9AA0A6")
+            return self._forecast_line
+
+        laps_ahead = np.where(expected < 0, horizon + 1, expected)
+        tire = int(np.argmin(laps_ahead))
+        lap = int(np.floor(state.forecast_progress + expected[tire]))
+        late = latest[tire] if latest[tire] >= 0 else horizon
+        spread = int(np.ceil(max(expected[tire] - earliest[tire], late - expected[tire])))
+        self._forecast_line = (f"{TIRE_KEYS[tire].upper()} {threshold:.0f}% on lap {lap} ±{spread}", "#FFD166")
+        return self._forecast_line
 
-        self.label.setText("<br>".join(lines))
-        self._fit_to_content()
+    @staticmethod
+    def _sector_label(sector: int) -> str:
+        width = 100.0 / SECTOR_BINS
+        return f"{sector * width:.0f}–{(sector + 1) * width:.0f}%"
+
+    def _hot_sector_text(self, state: OverlayState) -> Optional[Tuple[str, str]]:
+        attributed = state.sector_wear
+        if attributed is None:
+            return None
+        per_lap = attributed[1]
+        tire = int(np.argmax(per_lap.sum(axis=0)))
+        total = float(per_lap[:, tire].sum())
+        if total <= 0.0:
+            return None
+        sector = int(np.argmax(per_lap[:, tire]))
+        share = float(per_lap[sector, tire]) / total
+        return (f"{TIRE_KEYS[tire].upper()} hot spot {self._sector_label(sector)}: {share:.0%} of wear", "#FF9F1C")
+
+    def _sector_wear_report(self, state: OverlayState) -> str:
+        attributed = state.sector_wear
+        if attributed is None:
+            return "Wear by lap sector: no completed lap in this stint yet\n\n"
+        per_lap = attributed[1]
+        totals = per_lap.sum(axis=0)
+        head = "  ".join(f"{t.upper():>6}" for t in TIRE_KEYS)
+        lines = [f"Wear by lap sector (mean of {state.sector_wear_laps} laps, % tread per lap):", f"{'sector':>9}  {head}  share"]
+        for sector in np.argsort(per_lap.sum(axis=1))[::-1][:8]:
+            cells = "  ".join(f"{per_lap[sector, i]:6.3f}" for i in range(len(TIRE_KEYS)))
+            share = float(per_lap[sector].sum() / max(1e-12, totals.sum()))
+            lines.append(f"{self._sector_label(int(sector)):>9}  {cells}  {share:5.1%}")
+        lines.append(f"{'lap':>9}  " + "  ".join(f"{v:6.3f}" for v in totals))
+        lines.append(f"{'(last)':>9}  " + "  ".join(f"{v:6.3f}" for v in attributed[0].sum(axis=0)))
+        return "\n".join(lines) + "\n\n"
 
     def reset_all_data(self):
         confirm_box = self._build_light_message_box(
@@ -1741,23 +3682,16 @@ class OverlayUI(QtWidgets.QWidget):
         if confirm_box.exec_() != QtWidgets.QMessageBox.Yes:
             return
 
-        for path in (MODEL_PATH, MODEL_PATH + ".tmp"):
+        # The model database itself is cleared by the worker, which owns the open connection.
+        for path in (LEGACY_MODEL_PATH, LEGACY_MODEL_PATH + ".tmp"):
             try:
                 if os.path.exists(path):
                     os.remove(path)
             except Exception:
                 pass
 
-        with self.state_lock:
-            self.state.update(
-                tread={t: 100.0 for t in TIRE_KEYS},
-                wear_per_lap={t: 0.0 for t in TIRE_KEYS},
-                key="",
-                model_confidence=0.0,
-                sample_count=0,
-                estimate_ready=False,
-                reset_requested=True,
-            )
+        # The worker clears its memory and publishes the emptied state on its next pass.
+        self.shared.reset_requested.set()
 
         self.toasts.clear()
         self.last_conf_bucket = -1
@@ -1836,54 +3770,91 @@ class OverlayUI(QtWidgets.QWidget):
 
 
 class MainApp:
-    """Application coordinator: starts telemetry/model threads and Qt UI."""
+    """Application coordinator: starts telemetry thread, model process and Qt UI.
+
+    The model runs in its own process, fed through a shared-memory snapshot
+    ring and publishing back through a state ring, so fitting and database
+    writes never compete with the HUD for this interpreter's GIL. If no
+    process can be started, or the process dies later, the model falls back
+    to a thread in this process.
+    """
 
     def __init__(self):
         self.stop_event = threading.Event()
-        self.telemetry_queue: queue.Queue = queue.Queue(maxsize=1200)
-        self.state_lock = threading.Lock()
-        self.state = {
-            "tread": {t: 100.0 for t in TIRE_KEYS},
-            "wear_per_lap": {t: 0.0 for t in TIRE_KEYS},
-            "estimate_ready": False,
-            "connected": False,
-            "key": "",
-            "model_confidence": 0.0,
-            "sample_count": 0,
-            "track_temp": 0.0,
-            "air_temp": 0.0,
-            "humidity": 0.0,
-            "track_name": "",
-            "track_config": "",
-            "car_path": "",
-            "env_track_temp": 0.0,
-            "env_air_temp": 0.0,
-            "env_humidity": 0.0,
-            "env_track_temp_start": 0.0,
-            "env_track_temp_end": 0.0,
-            "env_track_temp_delta": 0.0,
-            "env_track_temp_std": 0.0,
-            "env_air_temp_start": 0.0,
-            "env_air_temp_end": 0.0,
-            "env_air_temp_delta": 0.0,
-            "env_humidity_start": 0.0,
-            "env_humidity_end": 0.0,
-            "env_humidity_delta": 0.0,
-            "env_humidity_std": 0.0,
-            "reset_requested": False,
-            "updated_at": time.time(),
-        }
+        self.rings: List[SharedRecordRing] = []
+        self.model_stop = None
+        self.model_process = None
+        self.model_thread: Optional[ModelWorker] = None
+        self.telemetry_queue = None
+        self.shared = None
+        self.telemetry_thread: Optional[TelemetryReader] = None
+        self.overlay: Optional[OverlayUI] = None
+
+    def _start_model(self):
+        ctx = multiprocessing.get_context("spawn")
+        try:
+            snapshots = SharedRecordRing.create(SNAPSHOT_DTYPE, SNAPSHOT_RING_SIZE)
+            self.rings.append(snapshots)
+            states = SharedRecordRing.create(STATE_DTYPE, STATE_RING_SIZE)
+            self.rings.append(states)
+            self.model_stop = ctx.Event()
+            reset_requested = ctx.Event()
+            snapshots_ready = ctx.Event()
+            self.model_process = ctx.Process(
+                target=_model_process_main,
+                args=(snapshots.name, states.name, snapshots_ready, self.model_stop, reset_requested),
+                name="TireWearModel",
+                daemon=True,
+            )
+            self.model_process.start()
+        except (OSError, RuntimeError, ValueError):
+            # Non-fatal: keep the model on a thread in this process.
+            self.model_process = None
+            self._close_rings()
+            self._start_model_thread()
+            return
 
-        self.telemetry_thread = TelemetryReader(self.telemetry_queue, self.stop_event)
-        self.model_thread = ModelWorker(self.telemetry_queue, self.state, self.state_lock, self.stop_event)
+        self.telemetry_queue = SnapshotRingWriter(snapshots, snapshots_ready)
+        self.shared = SharedStateReader(states, reset_requested)
+
+    def _start_model_thread(self):
+        self.telemetry_queue = queue.Queue(maxsize=SNAPSHOT_RING_SIZE)
+        self.shared = StatePublisher()
+        self.model_thread = ModelWorker(self.telemetry_queue, self.shared, self.stop_event)
+        self.model_thread.start()
+
+    def _check_model_process(self):
+        process = self.model_process
+        if process is None or process.is_alive() or self.stop_event.is_set():
+            return
+        # The process died on its own (import error in a frozen build, a crash in
+        # ModelWorker.run): nothing would drain the ring or publish state again.
+        self.model_process = None
+        self._start_model_thread()
+        if self.telemetry_thread is not None:
+            self.telemetry_thread.out_queue = self.telemetry_queue
+        if self.overlay is not None:
+            self.overlay.attach_state(
+                self.shared,
+                f"Model process stopped (exit code {process.exitcode}); running it in the HUD process",
+            )
+
+    def _close_rings(self):
+        for ring in self.rings:
+            ring.close()
+        self.rings = []
 
     def start(self) -> int:
+        self._start_model()
+        self.telemetry_thread = TelemetryReader(self.telemetry_queue, self.stop_event)
         self.telemetry_thread.start()
-        self.model_thread.start()
 
         app = QtWidgets.QApplication([])
-        overlay = OverlayUI(self.state, self.state_lock)
+        overlay = self.overlay = OverlayUI(self.shared)
         overlay.show()
+        watchdog = QtCore.QTimer()
+        watchdog.timeout.connect(self._check_model_process)
+        watchdog.start(1000)
 
         def handle_signal(*_):
             self.shutdown()
@@ -1894,21 +3865,128 @@ class MainApp:
 
         code = app.exec_()
         self.shutdown()
+        # Only now: a queued HUD refresh may still read the state ring until the event loop exits.
+        self._close_rings()
         return int(code)
 
     def shutdown(self):
         if self.stop_event.is_set():
             return
         self.stop_event.set()
+        if self.model_stop is not None:
+            self.model_stop.set()
         for t in (self.telemetry_thread, self.model_thread):
-            if t.is_alive():
+            if t is not None and t.is_alive():
                 t.join(timeout=2.0)
+        if self.model_process is not None:
+            # The model process closes its database on the way out; give it a moment.
+            self.model_process.join(timeout=3.0)
+            if self.model_process.is_alive():
+                self.model_process.terminate()
+
+
+class _BenchTelemetry:
+    """Fixed, connected telemetry for --bench-alloc; each tick advances SessionTime by 1/60 s."""
+
+    is_initialized = True
+    is_connected = True
+
+    def __init__(self):
+        self.session_time = 0.0
+        self.values = {
+            "Lap": 3,
+            "LapDistPct": 0.5,
+            "OnPitRoad": False,
+            "Speed": 50.0,
+            "LatAccel": 5.0,
+            "LongAccel": 0.1,
+            "SteeringWheelAngle": 0.1,
+            "TrackTemp": 31.0,
+            "AirTemp": 22.0,
+            "RelativeHumidity": 0.5,
+            "PitSvFlags": 0,
+            "PlayerCarIdx": 0,
+            "SessionInfoUpdate": 7,
+            "WeekendInfo": {"TrackDisplayName": "Watkins_Glen", "TrackConfigName": "Boot"},
+            "DriverInfo": {"DriverCarIdx": 0, "Drivers": [{"CarScreenName": "Porsche 911 GT3 R"}]},
+        }
+        for fields in WEAR_FIELDS.values():
+            for name in fields:
+                self.values[name] = 0.95
+
+    def __getitem__(self, key):
+        if key == "SessionTime":
+            return self.session_time * 1.0
+        value = self.values.get(key)
+        # The SDK unpacks a new float object on every read; do the same here.
+        return value * 1.0 if isinstance(value, float) else value
+
+
+def bench_tick_allocations(ticks: int = 6000) -> int:
+    """Print the bytes a telemetry tick allocates, measured with tracemalloc.
+
+    One tick is what the two processes do per 60 Hz sample: read_snapshot,
+    the dataset key, StintTracker.update and the environment vector. The
+    figure is the tracemalloc peak above the memory in use when the tick
+    started, so objects freed again within the tick still count.
+    """
+    reader = TelemetryReader(queue.Queue(maxsize=1), threading.Event())
+    reader.ir = _BenchTelemetry()
+    tracker = StintTracker()
+
+    def tick():
+        reader.ir.session_time += 1.0 / 60.0
+        snapshot = reader.read_snapshot()
+        StintTracker.make_dataset_key(snapshot)
+        tracker.update(snapshot)
+        tracker.environment_vector(snapshot)
+
+    for _ in range(600):
+        tick()
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    peaks = np.empty(ticks, dtype=np.int64)
+    tracemalloc.start()
+    try:
+        for i in range(ticks):
+            in_use = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            tick()
+            peaks[i] = tracemalloc.get_traced_memory()[1] - in_use
+    finally:
+        tracemalloc.stop()
+        if gc_was_enabled:
+            gc.enable()
+
+    started = time.perf_counter()
+    for _ in range(ticks):
+        tick()
+    tick_us = (time.perf_counter() - started) / ticks * 1e6
+    print(
+        f"{ticks} ticks: {int(np.median(peaks))} B/tick median, {int(peaks.max())} B max, "
+        f"{tick_us:.1f} us/tick without tracing"
+    )
+    return 0
 
 
 def main():
+    parser = argparse.ArgumentParser(description="iRacing tire wear learning overlay")
+    parser.add_argument("--train-ibt", metavar="FOLDER", help="learn stints from every .ibt file under FOLDER, then exit")
+    parser.add_argument("--tune-lam", action="store_true", help="pick each car/track's forgetting factor from its stint history, then exit")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for --train-ibt/--tune-lam (default: CPU count)")
+    parser.add_argument("--bench-alloc", action="store_true", help="measure the memory allocated per telemetry tick, then exit")
+    args, _unknown = parser.parse_known_args()
+    if args.bench_alloc:
+        raise SystemExit(bench_tick_allocations())
+    if args.train_ibt or args.tune_lam:
+        status = train_from_ibt_folder(args.train_ibt, args.workers) if args.train_ibt else 0
+        raise SystemExit(status or (tune_forgetting_factors(args.workers) if args.tune_lam else 0))
+
     app = MainApp()
     raise SystemExit(app.start())
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
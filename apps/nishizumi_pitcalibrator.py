@@ -6,22 +6,568 @@ Behavior:
 - during that armed stop, the app shows live timers for total, service, and base
 - after leaving pit road, values freeze on screen so the user can write them down
 - optional manual tire timing with one button
-- no profile saving, no history, no automatic magic
+- every tick of the armed stop is recorded; after pit exit the stop is split
+  into phases (entry, limiter, stall approach, service, tire, fuel, exit) and
+  can be exported tick by tick as CSV
+- every finished stop is kept in %APPDATA%/NishizumiTools (or ~/.config/NishizumiTools);
+  the median and MAD of the stops for the current car and track are shown
+- the fuel fill rate is learned per car as a function of litres already added,
+  so the fill time of the pending PitSvFuel amount can be shown before the stop
+- outside a stop, the rejoin gap to the cars ahead and behind is projected for a
+  whole sweep of pit losses (splash to full tank, with and without tires), each
+  costed from the stored base and tire medians and the car's fill curve
 """
 
 from __future__ import annotations
 
+import csv
 import math
+import os
+import sqlite3
 import time
 import tkinter as tk
-from typing import Optional, Tuple
+from pathlib import Path
+from tkinter import filedialog
+from typing import Dict, Optional, Tuple
 
 import irsdk
+import numpy as np
 
-UPDATE_MS = 16
+# Timing comes from SessionTime, so the poll rate only bounds how fresh the display is.
+# While armed, and through the stop, polling follows every sim tick so the pit entry
+# and exit edges are bracketed by consecutive ticks and the timeline is complete.
+UPDATE_MS = 100
+STOP_UPDATE_MS = 16
 MAX_REASONABLE_RATE_LPS = 8.0
 MIN_REASONABLE_RATE_LPS = 0.05
 
+# Ten minutes of 60 Hz ticks; a longer stop overwrites its oldest ticks.
+TIMELINE_CAPACITY = 60 * 60 * 10
+TIMELINE_DTYPE = np.dtype(
+    [
+        ("SessionTime", "f8"),
+        ("Speed", "f4"),
+        ("OnPitRoad", "?"),
+        ("PitstopActive", "?"),
+        ("PlayerCarPitSvStatus", "i2"),
+        ("FuelLevel", "f4"),
+        ("PitSvFlags", "u4"),
+    ]
+)
+TIRE_SERVICE_FLAGS = 0x0F  # LF/RF/LR/RR tire change bits of PitSvFlags
+STOPPED_SPEED_MPS = 0.3
+MIN_LIMITER_SPEED_MPS = 5.0
+PHASE_NAMES = ("entry", "limiter", "stall approach", "service", "tire", "fuel", "exit")
+
+
+def _get_appdata_dir() -> Path:
+    root = Path(os.getenv("APPDATA") or Path.home() / ".config")
+    path = root / "NishizumiTools"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+HISTORY_PATH = str(_get_appdata_dir() / "nishizumi_pitcalibrator.sqlite3")
+HISTORY_METRICS = ("total", "service", "base", "tire", "fuel_rate")
+HISTORY_WINDOW = 50
+FUEL_BIN_LITERS = 2.0
+MIN_FUEL_BIN_SAMPLES = 2
+FUEL_BIN_WINDOW = 20
+
+# Rejoin projection. The loss defaults stand in until the car and track have stored stops.
+DEFAULT_BASE_LOSS_S = 20.0
+DEFAULT_FILL_RATE_LPS = 2.2
+DEFAULT_LAP_TIME_S = 90.0
+MIN_LAP_TIME_S = 20.0
+GREEN_GAP_S = 5.0
+YELLOW_GAP_S = 1.5
+NO_GAP_S = 99.0
+SWEEP_STEPS = 41
+CURVE_HEIGHT = 64
+
+
+class StopTimeline:
+    """Per-tick record of one armed stop in a preallocated NumPy ring.
+
+    Each sim tick is one structured row written in place, so recording costs
+    the same at the first tick and the ten-thousandth; ``rows`` returns the
+    ticks in order for segmentation and export.
+    """
+
+    def __init__(self, capacity: int = TIMELINE_CAPACITY) -> None:
+        self._rows = np.zeros(capacity, dtype=TIMELINE_DTYPE)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, len(self._rows))
+
+    def clear(self) -> None:
+        self._count = 0
+
+    @property
+    def last_session_time(self) -> Optional[float]:
+        if self._count == 0:
+            return None
+        return float(self._rows["SessionTime"][(self._count - 1) % len(self._rows)])
+
+    def append(
+        self,
+        session_time: float,
+        speed: float,
+        on_pit_road: bool,
+        pitstop_active: bool,
+        pit_sv_status: int,
+        fuel_level: Optional[float],
+        pit_sv_flags: int,
+    ) -> None:
+        self._rows[self._count % len(self._rows)] = (
+            session_time,
+            speed,
+            on_pit_road,
+            pitstop_active,
+            pit_sv_status,
+            math.nan if fuel_level is None else fuel_level,
+            pit_sv_flags,
+        )
+        self._count += 1
+
+    def rows(self) -> np.ndarray:
+        size = len(self._rows)
+        if self._count <= size:
+            return self._rows[: self._count].copy()
+        head = self._count % size
+        return np.concatenate((self._rows[head:], self._rows[:head]))
+
+
+def _first_index(mask: np.ndarray) -> Optional[int]:
+    hits = np.flatnonzero(mask)
+    return int(hits[0]) if hits.size else None
+
+
+def _last_index(mask: np.ndarray) -> Optional[int]:
+    hits = np.flatnonzero(mask)
+    return int(hits[-1]) if hits.size else None
+
+
+def segment_stop(rows: np.ndarray, sampled_before: Optional[float] = None) -> Dict[str, Tuple[float, float]]:
+    """Split a recorded stop into named (start, end) SessionTime spans.
+
+    Edges come from the tick arrays in one pass each: pit road, service
+    (PitstopActive or PlayerCarPitSvStatus == 1), the car standing still,
+    limiter speed (median moving speed before the stall), fuel level rising,
+    and the tire-change bits of PitSvFlags clearing. Each edge is placed
+    halfway between the last tick before it and the first tick after it;
+    ``sampled_before`` is the SessionTime of the last poll before the first
+    recorded row. Phases the data cannot show are left out.
+    """
+    if len(rows) == 0:
+        return {}
+    t = rows["SessionTime"]
+    speed = rows["Speed"]
+    pit = rows["OnPitRoad"]
+    service = pit & (rows["PitstopActive"] | (rows["PlayerCarPitSvStatus"] == 1))
+
+    first = _first_index(pit)
+    last = _last_index(pit)
+    if first is None or last is None:
+        return {}
+    def edge(index: int) -> float:
+        # The change observed at tick ``index`` happened after the tick before it.
+        if index >= len(t):
+            return float(t[-1])
+        if index == 0:
+            return float(t[0]) if sampled_before is None else 0.5 * (sampled_before + float(t[0]))
+        return 0.5 * float(t[index - 1] + t[index])
+
+    def end_time(index: int) -> float:
+        return edge(index + 1)
+
+    last_t = end_time(last)
+
+    index = np.arange(len(rows))
+    in_pit = (index >= first) & (index <= last)
+    stall = _first_index(in_pit & (speed < STOPPED_SPEED_MPS))
+    service_start = _first_index(service)
+    service_end = _last_index(service)
+    arrive = min(i for i in (stall, service_start, last) if i is not None)
+
+    phases: Dict[str, Tuple[float, float]] = {}
+    moving = speed[first:arrive]
+    moving = moving[moving > MIN_LIMITER_SPEED_MPS]
+    if moving.size:
+        limiter = float(np.median(moving))
+        before_stall = in_pit & (index < arrive)
+        on_limiter = _first_index(before_stall & (speed <= limiter * 1.03))
+        braking = _last_index(before_stall & (speed >= limiter * 0.9))
+        if on_limiter is not None and braking is not None and braking >= on_limiter:
+            phases["entry"] = (edge(first), edge(on_limiter))
+            phases["limiter"] = (edge(on_limiter), end_time(braking))
+            phases["stall approach"] = (end_time(braking), edge(arrive))
+    if "entry" not in phases:
+        phases["entry"] = (edge(first), edge(arrive))
+
+    if service_start is not None and service_end is not None:
+        phases["service"] = (edge(service_start), end_time(service_end))
+        servicing = service & (index >= service_start) & (index <= service_end)
+        tires_pending = _last_index(servicing & ((rows["PitSvFlags"] & TIRE_SERVICE_FLAGS) != 0))
+        if tires_pending is not None and tires_pending < service_end:
+            phases["tire"] = (edge(service_start), end_time(tires_pending))
+        fuel = rows["FuelLevel"].astype(float)
+        rising = np.zeros(len(rows), dtype=bool)
+        rising[1:] = np.diff(fuel) > 0.0
+        fuel_first = _first_index(servicing & rising)
+        fuel_last = _last_index(servicing & rising)
+        if fuel_first is not None and fuel_last is not None:
+            phases["fuel"] = (edge(fuel_first), end_time(fuel_last))
+        phases["exit"] = (end_time(service_end), last_t)
+    else:
+        phases["exit"] = (edge(arrive), last_t)
+    return {name: phases[name] for name in PHASE_NAMES if name in phases}
+
+
+def fuel_fill_points(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(litres added, L/s) at the middle of every full-rate fuelling interval.
+
+    The first and last rising intervals are dropped: fuel only flowed for part
+    of them, so their rate understates the pump.
+    """
+    empty = (np.empty(0), np.empty(0))
+    if len(rows) < 2:
+        return empty
+    t = rows["SessionTime"]
+    fuel = rows["FuelLevel"].astype(float)
+    service = rows["OnPitRoad"] & (rows["PitstopActive"] | (rows["PlayerCarPitSvStatus"] == 1))
+    df = np.diff(fuel)
+    dt = np.diff(t)
+    rising = np.flatnonzero((df > 0.0) & (dt > 0.0) & service[1:] & service[:-1])
+    if rising.size < 3:
+        return empty
+    start_level = fuel[rising[0]]
+    full = rising[1:-1]
+    rate = df[full] / dt[full]
+    added = 0.5 * (fuel[full] + fuel[full + 1]) - start_level
+    keep = (rate >= MIN_REASONABLE_RATE_LPS) & (rate <= MAX_REASONABLE_RATE_LPS)
+    return added[keep], rate[keep]
+
+
+def _bin_medians(bins: np.ndarray, values: np.ndarray, min_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices of the bins holding at least ``min_count`` values, and each one's median value."""
+    counts = np.bincount(bins)
+    populated = np.flatnonzero(counts >= min_count)
+    order = np.argsort(bins, kind="stable")
+    groups = np.split(values[order], np.cumsum(counts)[:-1])
+    return populated, np.array([float(np.median(groups[b])) for b in populated])
+
+
+def fuel_bin_rates(added: np.ndarray, rate: np.ndarray, bin_liters: float = FUEL_BIN_LITERS) -> Tuple[np.ndarray, np.ndarray]:
+    """One fill's median rate per fuel bin, for the bins with at least MIN_FUEL_BIN_SAMPLES samples."""
+    bins = np.floor_divide(np.asarray(added, dtype=float), bin_liters).astype(int)
+    valid = bins >= 0
+    if not valid.any():
+        return np.empty(0, dtype=int), np.empty(0)
+    return _bin_medians(bins[valid], np.asarray(rate, dtype=float)[valid], MIN_FUEL_BIN_SAMPLES)
+
+
+class FuelFillModel:
+    """Piecewise-constant fill rate over litres added, compiled for O(1) fill times.
+
+    ``rates[i]`` is the pump rate while litres ``i * bin_liters`` to
+    ``(i + 1) * bin_liters`` go in. The time to reach every bin edge is
+    precomputed, so a fill time is one bin index plus one linear step. Amounts
+    past the learned range continue at the last bin's rate.
+    """
+
+    def __init__(self, rates: np.ndarray, bin_liters: float = FUEL_BIN_LITERS) -> None:
+        self.bin_liters = float(bin_liters)
+        self.rates = np.asarray(rates, dtype=float)
+        self.edge_times = np.concatenate(([0.0], np.cumsum(self.bin_liters / self.rates)))
+        self._last_bin = len(self.rates) - 1
+
+    @classmethod
+    def from_bins(cls, bins: np.ndarray, rates: np.ndarray, bin_liters: float = FUEL_BIN_LITERS) -> Optional["FuelFillModel"]:
+        """Model from the rates of the populated bins; gaps are interpolated between neighbours."""
+        if len(bins) == 0:
+            return None
+        return cls(np.interp(np.arange(bins[-1] + 1), bins, rates), bin_liters)
+
+    def fill_time(self, liters: float) -> float:
+        if liters <= 0.0:
+            return 0.0
+        index = min(int(liters / self.bin_liters), self._last_bin)
+        return float(self.edge_times[index] + (liters - index * self.bin_liters) / self.rates[index])
+
+    def fill_times(self, liters: np.ndarray) -> np.ndarray:
+        """``fill_time`` for a whole array of amounts in one pass."""
+        liters = np.maximum(np.asarray(liters, dtype=float), 0.0)
+        index = np.minimum((liters // self.bin_liters).astype(int), self._last_bin)
+        return self.edge_times[index] + (liters - index * self.bin_liters) / self.rates[index]
+
+
+def usable_lap_time(lap_time_s: float) -> float:
+    """The lap time to wrap with: anything under MIN_LAP_TIME_S (or NaN) is not a lap."""
+    return lap_time_s if lap_time_s >= MIN_LAP_TIME_S else DEFAULT_LAP_TIME_S
+
+
+def wrap_car_deltas(
+    car_est,
+    player_idx: int,
+    lap_time_s: float,
+    on_pit_road=None,
+    track_surface=None,
+) -> np.ndarray:
+    """CarIdxEstTime of every other running car relative to the player, wrapped to half a lap.
+
+    Cars on pit road, off the world (negative CarIdxTrackSurface) or without
+    a finite estimate are masked out in the same pass. A lap time under
+    MIN_LAP_TIME_S (e.g. LapCurrentLapTime just after the line) is replaced
+    by DEFAULT_LAP_TIME_S (see usable_lap_time).
+    """
+    est = np.asarray(car_est, dtype=float)
+    if est.ndim != 1 or not 0 <= player_idx < est.size:
+        return np.empty(0)
+    keep = np.isfinite(est)
+    keep[player_idx] = False
+    if on_pit_road is not None:
+        pit = np.asarray(on_pit_road, dtype=bool)
+        if pit.shape == est.shape:
+            keep &= ~pit
+    if track_surface is not None:
+        surface = np.asarray(track_surface, dtype=float)
+        if surface.shape == est.shape:
+            keep &= surface >= 0
+    lap_time_s = usable_lap_time(lap_time_s)
+    half_lap = lap_time_s / 2.0
+    delta = est[keep] - est[player_idx]
+    return np.mod(delta + half_lap, lap_time_s) - half_lap
+
+
+def rejoin_gap_curve(deltas: np.ndarray, losses: np.ndarray, lap_time_s: float) -> np.ndarray:
+    """Front and rear rejoin gaps for every candidate pit loss.
+
+    Each car's delta plus the loss is wrapped back into half a lap, so a car
+    the stop lets past counts as behind, however long the stop is. Returns an
+    array of shape ``(2,) + losses.shape``: the smallest gap to a car ahead
+    and to a car behind after losing each amount of time, with NO_GAP_S where
+    there is nobody on that side.
+
+    A car 14 s ahead on a 60 s lap rejoins 1 s behind after a 45 s stop:
+
+    >>> rejoin_gap_curve(np.array([14.0]), np.array([45.0]), 60.0)[:, 0].tolist()
+    [99.0, 1.0]
+    """
+    lap_time_s = usable_lap_time(lap_time_s)
+    half_lap = lap_time_s / 2.0
+    losses = np.asarray(losses, dtype=float)
+    projected = np.mod(np.asarray(deltas, dtype=float) + losses[..., None] + half_lap, lap_time_s) - half_lap
+    ahead = projected >= 0
+    front = np.where(ahead, projected, np.inf).min(axis=-1, initial=np.inf)
+    rear = -np.where(ahead, -np.inf, projected).max(axis=-1, initial=-np.inf)
+    return np.minimum(np.stack((front, rear)), NO_GAP_S)
+
+
+def export_stop_csv(path: str, rows: np.ndarray, phases: Dict[str, Tuple[float, float]]) -> None:
+    """Write one line per recorded tick plus the phases each tick falls in."""
+    t = rows["SessionTime"]
+    membership = {name: (t >= start) & (t < end) for name, (start, end) in phases.items()}
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(list(TIMELINE_DTYPE.names) + ["Phases"])
+        for i, row in enumerate(rows.tolist()):
+            writer.writerow(list(row) + ["+".join(name for name, mask in membership.items() if mask[i])])
+        writer.writerow([])
+        writer.writerow(["Phase", "Start", "End", "Duration"])
+        for name, (start, end) in phases.items():
+            writer.writerow([name, f"{start:.4f}", f"{end:.4f}", f"{end - start:.4f}"])
+
+
+class ViewBinder:
+    """Push widget options and variable values to Tk only when they change.
+
+    The last applied value of every bound field is kept per Tk name, so an
+    unchanged field costs a dict lookup instead of a configure/set call and
+    the geometry pass Tk schedules after it.
+    """
+
+    def __init__(self) -> None:
+        self._applied: Dict[Tuple[str, str], object] = {}
+
+    def config(self, widget: tk.Misc, **options: object) -> bool:
+        name = str(widget)
+        changed = {
+            option: value
+            for option, value in options.items()
+            if (name, option) not in self._applied or self._applied[(name, option)] != value
+        }
+        if not changed:
+            return False
+        widget.configure(**changed)
+        for option, value in changed.items():
+            self._applied[(name, option)] = value
+        return True
+
+    def set(self, variable: tk.Variable, value: object) -> bool:
+        key = (str(variable), "value")
+        if key in self._applied and self._applied[key] == value:
+            return False
+        variable.set(value)
+        self._applied[key] = value
+        return True
+
+
+class StopHistory:
+    """SQLite history of finished stops with robust aggregates per car and track.
+
+    Stops are append-only rows indexed by (car, track). Each insert refreshes
+    the median and MAD of that one car/track's metrics in a small summary
+    table, so reading the aggregates at session start is a single keyed
+    lookup no matter how many stops are stored. The aggregates are exact over
+    the car/track's most recent HISTORY_WINDOW stops only: an insert reads at
+    most that many rows, and pit rules or car updates from long ago stop
+    counting.
+    """
+
+    def __init__(self, path: str = HISTORY_PATH) -> None:
+        self.path = path
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        columns = ", ".join(f"{metric} REAL" for metric in HISTORY_METRICS)
+        schema = f"""
+            CREATE TABLE IF NOT EXISTS stops (
+                id INTEGER PRIMARY KEY,
+                car_id TEXT NOT NULL,
+                track_id TEXT NOT NULL,
+                recorded_at REAL NOT NULL,
+                fuel_added REAL,
+                {columns}
+            );
+            CREATE INDEX IF NOT EXISTS idx_stops_car_track ON stops (car_id, track_id);
+            CREATE TABLE IF NOT EXISTS stop_stats (
+                car_id TEXT NOT NULL,
+                track_id TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                n INTEGER NOT NULL,
+                median REAL NOT NULL,
+                mad REAL NOT NULL,
+                PRIMARY KEY (car_id, track_id, metric)
+            );
+            CREATE TABLE IF NOT EXISTS fuel_bin_stops (
+                id INTEGER PRIMARY KEY,
+                car_id TEXT NOT NULL,
+                bin INTEGER NOT NULL,
+                rate REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_fuel_bin_stops_car_bin ON fuel_bin_stops (car_id, bin);
+            CREATE TABLE IF NOT EXISTS fuel_bins (
+                car_id TEXT NOT NULL,
+                bin INTEGER NOT NULL,
+                rate REAL NOT NULL,
+                PRIMARY KEY (car_id, bin)
+            );
+        """
+        try:
+            conn = sqlite3.connect(self.path, timeout=2.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(schema)
+            return conn
+        except sqlite3.Error:
+            # Non-fatal: the history then only lives for this session.
+            conn = sqlite3.connect(":memory:")
+            conn.executescript(schema)
+            return conn
+
+    def add(self, car_id: str, track_id: str, values: Dict[str, Optional[float]]) -> Dict[str, Tuple[int, float, float]]:
+        """Store one stop and return the refreshed aggregates of its car and track."""
+        names = ("fuel_added",) + HISTORY_METRICS
+        try:
+            with self._conn:
+                self._conn.execute(
+                    f"INSERT INTO stops (car_id, track_id, recorded_at, {', '.join(names)}) VALUES (?, ?, ?{', ?' * len(names)})",
+                    (car_id, track_id, time.time(), *(values.get(name) for name in names)),
+                )
+                # Metric names come from HISTORY_METRICS, never from user input.
+                rows = self._conn.execute(
+                    f"SELECT {', '.join(HISTORY_METRICS)} FROM stops WHERE car_id = ? AND track_id = ? ORDER BY id DESC LIMIT ?",
+                    (car_id, track_id, HISTORY_WINDOW),
+                ).fetchall()
+                recent = np.array(rows, dtype=float).reshape(-1, len(HISTORY_METRICS))
+                for metric, column in zip(HISTORY_METRICS, recent.T):
+                    data = column[~np.isnan(column)]
+                    if data.size == 0:
+                        continue
+                    median = float(np.median(data))
+                    mad = float(np.median(np.abs(data - median)))
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO stop_stats (car_id, track_id, metric, n, median, mad) VALUES (?, ?, ?, ?, ?, ?)",
+                        (car_id, track_id, metric, int(data.size), median, mad),
+                    )
+        except sqlite3.Error:
+            pass
+        return self.summary(car_id, track_id)
+
+    def summary(self, car_id: str, track_id: str) -> Dict[str, Tuple[int, float, float]]:
+        """(count, median, MAD) per metric for one car and track."""
+        try:
+            rows = self._conn.execute(
+                "SELECT metric, n, median, mad FROM stop_stats WHERE car_id = ? AND track_id = ?",
+                (car_id, track_id),
+            ).fetchall()
+        except sqlite3.Error:
+            return {}
+        return {str(metric): (int(n), float(median), float(mad)) for metric, n, median, mad in rows}
+
+    def add_fuel_fill(self, car_id: str, added: np.ndarray, rate: np.ndarray) -> Optional[FuelFillModel]:
+        """Fold one stop's full-rate fill samples into the car's fill curve.
+
+        A stop is reduced to one median rate per fuel bin, and only the last
+        FUEL_BIN_WINDOW stops of each bin are kept, so a refit reads at most
+        that many rows per bin. A bin's rate is the median over those stops.
+        """
+        touched, medians = fuel_bin_rates(added, rate)
+        if touched.size:
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO fuel_bin_stops (car_id, bin, rate) VALUES (?, ?, ?)",
+                        [(car_id, int(b), float(q)) for b, q in zip(touched, medians)],
+                    )
+                    self._conn.executemany(
+                        """
+                        DELETE FROM fuel_bin_stops WHERE car_id = ? AND bin = ? AND id <= (
+                            SELECT id FROM fuel_bin_stops WHERE car_id = ? AND bin = ? ORDER BY id DESC LIMIT 1 OFFSET ?
+                        )
+                        """,
+                        [(car_id, int(b), car_id, int(b), FUEL_BIN_WINDOW) for b in touched],
+                    )
+                    rows = self._conn.execute("SELECT bin, rate FROM fuel_bin_stops WHERE car_id = ?", (car_id,)).fetchall()
+                    stored = np.array(rows, dtype=float).reshape(-1, 2)
+                    model = FuelFillModel.from_bins(*_bin_medians(stored[:, 0].astype(int), stored[:, 1], 1))
+                    if model is not None:
+                        self._conn.execute("DELETE FROM fuel_bins WHERE car_id = ?", (car_id,))
+                        self._conn.executemany(
+                            "INSERT INTO fuel_bins (car_id, bin, rate) VALUES (?, ?, ?)",
+                            [(car_id, index, float(value)) for index, value in enumerate(model.rates)],
+                        )
+            except sqlite3.Error:
+                pass
+        return self.fuel_model(car_id)
+
+    def fuel_model(self, car_id: str) -> Optional[FuelFillModel]:
+        """The compiled fill curve of one car, or None before its first full-rate fill."""
+        try:
+            rows = self._conn.execute("SELECT rate FROM fuel_bins WHERE car_id = ? ORDER BY bin", (car_id,)).fetchall()
+        except sqlite3.Error:
+            return None
+        if not rows:
+            return None
+        return FuelFillModel(np.array([row[0] for row in rows], dtype=float))
+
+    def close(self) -> None:
+        try:
+            self._conn.close()
+        except sqlite3.Error:
+            pass
+
 
 class PitCalibratorApp:
     BG = "#0f1115"
@@ -33,6 +579,10 @@ class PitCalibratorApp:
     ACCENT = "#8ff0a4"
     BTN = "#243041"
     BTN_ACTIVE = "#7f1d1d"
+    GOOD = "#15803d"
+    WARN = "#ca8a04"
+    BAD = "#b91c1c"
+    ENTRY_BG = "#101826"
 
     def __init__(self) -> None:
         self.ir = irsdk.IRSDK()
@@ -43,11 +593,12 @@ class PitCalibratorApp:
         self.root.overrideredirect(True)
         self.root.attributes("-topmost", True)
         self.root.attributes("-alpha", 0.97)
-        self.root.geometry("450x390+80+80")
+        self.root.geometry("450x640+80+80")
         self.root.minsize(420, 340)
 
         self._drag_offset_x = 0
         self._drag_offset_y = 0
+        self._view = ViewBinder()
 
         self.connection_var = tk.StringVar(value="Connecting to iRacing…")
         self.context_var = tk.StringVar(value="Car: -- | Track: --")
@@ -68,14 +619,27 @@ class PitCalibratorApp:
         self.saved_fuel_var = tk.StringVar(value="Saved fuel added: --")
         self.saved_rate_var = tk.StringVar(value="Saved fuel rate: --")
         self.saved_tire_var = tk.StringVar(value="Saved tire time: --")
+        self.saved_phases_var = tk.StringVar(value="Saved phases: --")
+        self.history_var = tk.StringVar(value="History: --")
+
+        self.rejoin_status_var = tk.StringVar(value="Rejoin: --")
+        self.rejoin_loss_var = tk.StringVar(value="Pit loss: --")
+        self.rejoin_curve_var = tk.StringVar(value="Rejoin gap: --")
 
         self.active_car_name = "Unknown car"
         self.active_track_name = "Unknown track"
+        self.active_identity: Optional[Tuple[str, str]] = None
+        self.fuel_model: Optional[FuelFillModel] = None
+        self.history = StopHistory()
+        self.history_summary: Dict[str, Tuple[int, float, float]] = {}
+        self._rejoin_at: Optional[float] = None
 
         self.armed = False
         self.stop: Optional[dict] = None
-        self._last_wall_time: Optional[float] = None
+        self._prev_sample: Optional[Tuple[float, bool, bool]] = None
         self._last_fuel_level: Optional[float] = None
+        self.timeline = StopTimeline()
+        self.last_stop: Optional[Tuple[np.ndarray, Dict[str, Tuple[float, float]]]] = None
 
         self._build_ui()
 
@@ -152,6 +716,22 @@ class PitCalibratorApp:
         )
         self.tire_btn.pack(side="left", padx=(0, 4))
 
+        self.export_btn = tk.Button(
+            btns,
+            text="CSV",
+            command=self._export_last_stop,
+            bg=self.BTN,
+            fg=self.TEXT,
+            activebackground="#334155",
+            activeforeground="white",
+            relief="flat",
+            bd=0,
+            width=4,
+            cursor="hand2",
+            font=("Segoe UI", 9, "bold"),
+        )
+        self.export_btn.pack(side="left", padx=(0, 4))
+
         close_btn = tk.Button(
             btns,
             text="✕",
@@ -174,6 +754,28 @@ class PitCalibratorApp:
         tk.Label(top, textvariable=self.context_var, bg=self.PANEL_ALT, fg=self.TEXT, font=("Segoe UI", 9, "bold")).pack(anchor="w", pady=(2, 0))
         tk.Label(top, textvariable=self.arm_state_var, bg=self.PANEL_ALT, fg=self.ACCENT, font=("Segoe UI", 10, "bold")).pack(anchor="w", pady=(6, 0))
         tk.Label(top, textvariable=self.status_var, bg=self.PANEL_ALT, fg=self.TEXT, font=("Segoe UI", 9), wraplength=410, justify="left").pack(anchor="w", pady=(2, 0))
+        tk.Label(top, textvariable=self.history_var, bg=self.PANEL_ALT, fg=self.MUTED, font=("Segoe UI", 8), wraplength=410, justify="left").pack(anchor="w", pady=(4, 0))
+
+        rejoin = tk.Frame(shell, bg=self.PANEL, padx=12, pady=10, highlightthickness=1, highlightbackground=self.BORDER)
+        rejoin.pack(fill="x", padx=10, pady=(0, 8))
+        tk.Label(rejoin, text="Rejoin projection", bg=self.PANEL, fg=self.MUTED, font=("Segoe UI", 8, "bold")).pack(anchor="w")
+        self.rejoin_status_label = tk.Label(
+            rejoin, textvariable=self.rejoin_status_var, bg=self.PANEL, fg=self.TEXT, font=("Segoe UI", 10, "bold"), anchor="w"
+        )
+        self.rejoin_status_label.pack(fill="x", pady=(4, 0))
+        for var in (self.rejoin_loss_var, self.rejoin_curve_var):
+            tk.Label(rejoin, textvariable=var, bg=self.PANEL, fg=self.TEXT, font=("Segoe UI", 9), anchor="w").pack(fill="x", pady=(2, 0))
+        self.curve_canvas = tk.Canvas(rejoin, bg=self.ENTRY_BG, height=CURVE_HEIGHT, highlightthickness=0, bd=0)
+        self.curve_canvas.pack(fill="x", pady=(4, 0))
+        self.curve_bands = {
+            gap: self.curve_canvas.create_line(0, 0, 0, 0, fill=color, dash=(2, 3))
+            for gap, color in ((GREEN_GAP_S, self.GOOD), (YELLOW_GAP_S, self.WARN))
+        }
+        self.curve_lines = (
+            self.curve_canvas.create_line(0, 0, 0, 0, fill=self.ACCENT, width=2),
+            self.curve_canvas.create_line(0, 0, 0, 0, fill=self.MUTED, width=2),
+        )
+        self.curve_plan = self.curve_canvas.create_line(0, 0, 0, 0, fill=self.TEXT)
 
         live = tk.Frame(shell, bg=self.PANEL, padx=12, pady=10, highlightthickness=1, highlightbackground=self.BORDER)
         live.pack(fill="x", padx=10, pady=(0, 8))
@@ -201,6 +803,9 @@ class PitCalibratorApp:
             self.saved_tire_var,
         ):
             tk.Label(saved, textvariable=var, bg=self.PANEL, fg=self.TEXT, font=("Segoe UI", 10, "bold"), anchor="w").pack(fill="x", pady=(4, 0))
+        tk.Label(
+            saved, textvariable=self.saved_phases_var, bg=self.PANEL, fg=self.MUTED, font=("Segoe UI", 8), anchor="w", justify="left", wraplength=410
+        ).pack(fill="x", pady=(4, 0))
 
     def _start_move(self, event: tk.Event) -> None:
         self._drag_offset_x = event.x_root - self.root.winfo_x()
@@ -261,6 +866,59 @@ class PitCalibratorApp:
             ok = False
         return bool(ok and self.ir.is_initialized and self.ir.is_connected)
 
+    def _estimate_lap_time(self) -> float:
+        # Prefer YAML estimate if present, then class estimate, then live lap timings.
+        driver_info = self._read_yaml("DriverInfo") or {}
+        for candidate in (
+            driver_info.get("DriverCarEstLapTime"),
+            self._extract_player_class_est_lap(driver_info),
+            self._read_var("LapBestLapTime"),
+            self._read_var("LapCurrentLapTime"),
+        ):
+            if isinstance(candidate, (float, int)) and candidate > 1.0:
+                return float(candidate)
+        return DEFAULT_LAP_TIME_S
+
+    @staticmethod
+    def _extract_player_class_est_lap(driver_info: dict) -> Optional[float]:
+        driver_car_idx = driver_info.get("DriverCarIdx")
+        drivers = driver_info.get("Drivers")
+        if not isinstance(drivers, list):
+            return None
+        for entry in drivers:
+            if not isinstance(entry, dict) or entry.get("CarIdx") != driver_car_idx:
+                continue
+            value = entry.get("CarClassEstLapTime")
+            if isinstance(value, (float, int)) and value > 1.0:
+                return float(value)
+        return None
+
+    def _driver_fuel_max_liters(self) -> Optional[float]:
+        driver_info = self._read_yaml("DriverInfo") or {}
+        tank = driver_info.get("DriverCarFuelMaxLtr")
+        max_pct = driver_info.get("DriverCarMaxFuelPct")
+        if isinstance(tank, (float, int)) and tank > 0:
+            if isinstance(max_pct, (float, int)) and max_pct > 0:
+                return float(tank) * float(max_pct)
+            return float(tank)
+        return None
+
+    def _collect_car_deltas(self, lap_time_s: float) -> np.ndarray:
+        player_idx = self._read_var("PlayerCarIdx")
+        car_est = self._read_var("CarIdxEstTime")
+        if player_idx is None or car_est is None:
+            return np.empty(0)
+        try:
+            return wrap_car_deltas(
+                car_est,
+                int(player_idx),
+                lap_time_s,
+                self._read_var("CarIdxOnPitRoad"),
+                self._read_var("CarIdxTrackSurface"),
+            )
+        except (TypeError, ValueError):
+            return np.empty(0)
+
     def _driver_identity(self) -> Tuple[str, str]:
         driver_info = self._read_yaml("DriverInfo") or {}
         driver_car_idx = driver_info.get("DriverCarIdx")
@@ -290,14 +948,118 @@ class PitCalibratorApp:
         status = self._safe_float(self._read_var("PlayerCarPitSvStatus"), default=None)
         return status is not None and int(status) == 1
 
+    def _show_history(self, summary: Dict[str, Tuple[int, float, float]]) -> None:
+        self.history_summary = summary
+        if not summary:
+            self._view.set(self.history_var, "History: no stops stored for this car and track yet")
+            return
+        count = max(n for n, _, _ in summary.values())
+        parts = []
+        for metric, label, unit in (("base", "base", "s"), ("service", "service", "s"), ("tire", "tire", "s"), ("fuel_rate", "fuel", " L/s")):
+            if metric in summary:
+                _, median, mad = summary[metric]
+                digits = 3 if metric == "fuel_rate" else 2
+                parts.append(f"{label} {median:.{digits}f}±{mad:.{digits}f}{unit}")
+        self._view.set(self.history_var, f"History (last {count} stops, median±MAD): " + " | ".join(parts))
+
+    def _pending_fuel_text(self, pending: Optional[float]) -> str:
+        text = f"Pending pit fuel: {self._format_liters(pending)}"
+        if pending is not None and pending > 0.0 and self.fuel_model is not None:
+            text += f" | fill ≈ {self._format_seconds(self.fuel_model.fill_time(pending))}"
+        return text
+
+    def _draw_rejoin_curve(self, fuel_sweep: np.ndarray, curve: np.ndarray, planned_fuel: float) -> None:
+        """Plot the smaller of the front/rear gaps over the fuel sweep, without and with tires."""
+        canvas = self.curve_canvas
+        width = max(canvas.winfo_width(), 2)
+        span = max(float(fuel_sweep[-1]), 1e-6)
+        top = GREEN_GAP_S * 2.0
+
+        def y(gap):
+            return CURVE_HEIGHT - 2 - (CURVE_HEIGHT - 4) * np.clip(gap, 0.0, top) / top
+
+        xs = (width - 1) * fuel_sweep / span
+        for gap, item in self.curve_bands.items():
+            level = float(y(gap))
+            canvas.coords(item, 0, level, width, level)
+        for item, gaps in zip(self.curve_lines, np.minimum(curve[0], curve[1])):
+            canvas.coords(item, *np.column_stack((xs, y(gaps))).ravel().tolist())
+        x_plan = (width - 1) * min(planned_fuel, span) / span
+        canvas.coords(self.curve_plan, x_plan, 0, x_plan, CURVE_HEIGHT)
+
+    def _status_from_gaps(self, front_gap: float, rear_gap: float) -> Tuple[str, str, float]:
+        min_gap = min(front_gap, rear_gap)
+        score = max(0.0, min(100.0, (min_gap / GREEN_GAP_S) * 100.0))
+        if min_gap >= GREEN_GAP_S:
+            return "GREEN", self.GOOD, score
+        if min_gap >= YELLOW_GAP_S:
+            return "YELLOW", self.WARN, score
+        return "RED", self.BAD, score
+
+    def _update_rejoin(self, now: float, fuel_level: Optional[float], pending: Optional[float]) -> None:
+        """Project the rejoin gaps for a splash-to-full sweep and for the stop set in the pit menu.
+
+        Base and tire losses are the stored medians for this car and track;
+        the fuel part of every loss comes from the car's fill curve, or the
+        median fill rate before the curve has been learned.
+        """
+        if self._rejoin_at is not None and 0.0 <= now - self._rejoin_at < UPDATE_MS / 1000.0:
+            return
+        self._rejoin_at = now
+
+        summary = self.history_summary
+        base_loss = summary["base"][1] if "base" in summary else DEFAULT_BASE_LOSS_S
+        tire_loss = summary["tire"][1] if "tire" in summary else 0.0
+        fuel_max = self._driver_fuel_max_liters()
+        full_add = max(0.0, fuel_max - (fuel_level or 0.0)) if fuel_max else 0.0
+        planned_fuel = pending if pending is not None and pending > 0.0 else full_add
+        planned_tires = int(bool(int(self._safe_float(self._read_var("PitSvFlags"), default=0.0)) & TIRE_SERVICE_FLAGS))
+
+        # Candidate stops from a splash to a full tank, without and with tires,
+        # plus the planned stop as the last column: all evaluated in one broadcast.
+        fuel_sweep = np.linspace(0.0, max(planned_fuel, full_add), SWEEP_STEPS)
+        amounts = np.append(fuel_sweep, planned_fuel)
+        if self.fuel_model is not None:
+            fuel_times = self.fuel_model.fill_times(amounts)
+            rate_text = "fill curve"
+        else:
+            fill_rate = summary["fuel_rate"][1] if "fuel_rate" in summary else DEFAULT_FILL_RATE_LPS
+            fuel_times = amounts / fill_rate
+            rate_text = f"{fill_rate:.2f} L/s"
+        losses = base_loss + np.array([[0.0], [tire_loss]]) + fuel_times
+
+        lap_time_s = self._estimate_lap_time()
+        curve = rejoin_gap_curve(self._collect_car_deltas(lap_time_s), losses, lap_time_s)
+        front_gap = float(curve[0, planned_tires, -1])
+        rear_gap = float(curve[1, planned_tires, -1])
+        curve = curve[:, :, :-1]
+        status, color, score = self._status_from_gaps(front_gap, rear_gap)
+
+        fuel_time = float(fuel_times[-1])
+        tire_time = tire_loss if planned_tires else 0.0
+        self._view.set(self.rejoin_status_var, f"Rejoin: {status} {score:.0f}% | Front {front_gap:.2f}s | Rear {rear_gap:.2f}s")
+        self._view.config(self.rejoin_status_label, fg=color)
+        self._view.set(
+            self.rejoin_loss_var,
+            f"Pit loss {planned_fuel:.1f} L: base {base_loss:.2f}s + tires {tire_time:.2f}s"
+            f" + fuel {fuel_time:.2f}s ({rate_text}) = {base_loss + tire_time + fuel_time:.2f}s",
+        )
+        worst = np.minimum(curve[0], curve[1])
+        self._view.set(
+            self.rejoin_curve_var,
+            f"Rejoin gap 0–{fuel_sweep[-1]:.0f} L: no tires {worst[0].min():.1f}–{worst[0].max():.1f}s"
+            f" | tires {worst[1].min():.1f}–{worst[1].max():.1f}s | lap {lap_time_s:.1f}s",
+        )
+        self._draw_rejoin_curve(fuel_sweep, curve, planned_fuel)
+
     def _clear_live(self) -> None:
-        self.live_total_var.set("Live total: --")
-        self.live_service_var.set("Live service: --")
-        self.live_base_var.set("Live base: --")
-        self.live_fuel_var.set("Live fuel added: --")
-        self.live_rate_var.set("Live fuel rate: --")
-        self.live_tire_var.set("Live manual tire time: --")
-        self.pending_fuel_var.set("Pending pit fuel: --")
+        self._view.set(self.live_total_var, "Live total: --")
+        self._view.set(self.live_service_var, "Live service: --")
+        self._view.set(self.live_base_var, "Live base: --")
+        self._view.set(self.live_fuel_var, "Live fuel added: --")
+        self._view.set(self.live_rate_var, "Live fuel rate: --")
+        self._view.set(self.live_tire_var, "Live manual tire time: --")
+        self._view.set(self.pending_fuel_var, "Pending pit fuel: --")
 
     # ---------------------------- actions ----------------------------
 
@@ -305,38 +1067,55 @@ class PitCalibratorApp:
         self.armed = not self.armed
         if self.armed:
             self.arm_btn.configure(bg=self.BTN_ACTIVE)
-            self.arm_state_var.set("Arming: ON — next stop is the one that counts")
-            self.status_var.set("Armed. Enter pit lane and watch the numbers move live. Press TIRE when the tire change finishes.")
+            self._view.set(self.arm_state_var, "Arming: ON — next stop is the one that counts")
+            self._view.set(self.status_var, "Armed. Enter pit lane and watch the numbers move live. Press TIRE when the tire change finishes.")
             self.stop = None
-            self._last_wall_time = None
             self._last_fuel_level = None
             self._clear_live()
         else:
             self.arm_btn.configure(bg=self.BTN)
-            self.arm_state_var.set("Arming: off")
-            self.status_var.set("Arm cancelled.")
+            self._view.set(self.arm_state_var, "Arming: off")
+            self._view.set(self.status_var, "Arm cancelled.")
             self.stop = None
-            self._last_wall_time = None
             self._last_fuel_level = None
             self._clear_live()
 
     def _mark_tire_done(self) -> None:
         if not self.stop or not self.stop.get("active"):
-            self.status_var.set("No armed stop running. TIRE only works during the armed stop.")
+            self._view.set(self.status_var, "No armed stop running. TIRE only works during the armed stop.")
             return
         tire_time = float(self.stop.get("live_service", 0.0))
         self.stop["manual_tire_time"] = tire_time
-        self.live_tire_var.set(f"Live manual tire time: {self._format_seconds(tire_time)}")
-        self.status_var.set(f"Manual tire time captured at {tire_time:.2f}s.")
+        self._view.set(self.live_tire_var, f"Live manual tire time: {self._format_seconds(tire_time)}")
+        self._view.set(self.status_var, f"Manual tire time captured at {tire_time:.2f}s.")
+
+    def _export_last_stop(self) -> None:
+        if self.last_stop is None:
+            self._view.set(self.status_var, "No finished armed stop to export yet.")
+            return
+        path = filedialog.asksaveasfilename(
+            title="Export stop timeline",
+            defaultextension=".csv",
+            initialfile=f"pitstop_{time.strftime('%Y%m%d_%H%M%S')}.csv",
+            filetypes=[("CSV", "*.csv"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        rows, phases = self.last_stop
+        try:
+            export_stop_csv(path, rows, phases)
+        except OSError as exc:
+            self._view.set(self.status_var, f"Export failed: {exc}")
+            return
+        self._view.set(self.status_var, f"Exported {len(rows)} ticks to {path}")
 
     # ---------------------------- stop flow ----------------------------
 
     def _start_armed_stop(self, now: float, fuel_level: Optional[float]) -> None:
         self.stop = {
             "active": True,
-            "entry_wall": now,
-            "service_wall_start": None,
-            "service_running": False,
+            "entry_time": now,
+            "sampled_before": self._prev_sample[0] if self._prev_sample is not None else None,
             "live_total": 0.0,
             "live_service": 0.0,
             "live_base": 0.0,
@@ -346,25 +1125,23 @@ class PitCalibratorApp:
             "manual_tire_time": None,
             "pending_fuel_at_entry": self._safe_float(self._read_var("PitSvFuel"), default=None),
         }
-        self._last_wall_time = now
+        self.timeline.clear()
         self._last_fuel_level = fuel_level
-        self.status_var.set("Armed stop started. Total, service and base are now counting live.")
+        self._view.set(self.status_var, "Armed stop started. Total, service and base are now counting live.")
 
-    def _update_armed_stop(self, now: float, fuel_level: Optional[float], on_pit_road: bool) -> None:
+    def _update_armed_stop(self, now: float, fuel_level: Optional[float], on_pit_road: bool, service_now: bool) -> None:
         if not self.stop:
             return
 
         stop = self.stop
-        dt = 0.0
-        if self._last_wall_time is not None:
-            dt = max(0.0, now - self._last_wall_time)
-
-        service_now = self._service_active(on_pit_road)
-
-        if on_pit_road:
-            stop["live_total"] += dt
-            if service_now:
-                stop["live_service"] += dt
+        prev = self._prev_sample
+        dt = max(0.0, now - prev[0]) if prev is not None else 0.0
+
+        # A pit-road or service edge between two samples is placed halfway between
+        # them, so each interval counts by the mean of the states at its ends.
+        if prev is not None:
+            stop["live_total"] += dt * (int(prev[1]) + int(on_pit_road)) / 2.0
+            stop["live_service"] += dt * (int(prev[2]) + int(service_now)) / 2.0
             stop["live_base"] = max(0.0, float(stop["live_total"]) - float(stop["live_service"]))
 
         if fuel_level is not None and stop.get("fuel_start") is not None:
@@ -385,21 +1162,44 @@ class PitCalibratorApp:
         samples = stop.get("fuel_rate_samples") or []
         avg_rate = (sum(samples) / len(samples)) if samples else None
 
-        self.live_total_var.set(f"Live total: {self._format_seconds(stop.get('live_total'))}")
-        self.live_service_var.set(f"Live service: {self._format_seconds(stop.get('live_service'))}")
-        self.live_base_var.set(f"Live base: {self._format_seconds(stop.get('live_base'))}")
-        self.live_fuel_var.set(f"Live fuel added: {self._format_liters(stop.get('fuel_added'))}")
-        self.live_rate_var.set(f"Live fuel rate: {self._format_rate(avg_rate)}")
-        self.live_tire_var.set(f"Live manual tire time: {self._format_seconds(stop.get('manual_tire_time'))}")
-        self.pending_fuel_var.set(f"Pending pit fuel: {self._format_liters(stop.get('pending_fuel_at_entry'))}")
+        self._view.set(self.live_total_var, f"Live total: {self._format_seconds(stop.get('live_total'))}")
+        self._view.set(self.live_service_var, f"Live service: {self._format_seconds(stop.get('live_service'))}")
+        self._view.set(self.live_base_var, f"Live base: {self._format_seconds(stop.get('live_base'))}")
+        self._view.set(self.live_fuel_var, f"Live fuel added: {self._format_liters(stop.get('fuel_added'))}")
+        self._view.set(self.live_rate_var, f"Live fuel rate: {self._format_rate(avg_rate)}")
+        self._view.set(self.live_tire_var, f"Live manual tire time: {self._format_seconds(stop.get('manual_tire_time'))}")
+        self._view.set(self.pending_fuel_var, f"Pending pit fuel: {self._format_liters(stop.get('pending_fuel_at_entry'))}")
 
-        self._last_wall_time = now
         self._last_fuel_level = fuel_level
 
+    def _record_tick(self, fuel_level: Optional[float], on_pit_road: bool) -> None:
+        session_time = self._safe_float(self._read_var("SessionTime"), default=None)
+        if session_time is None or session_time == self.timeline.last_session_time:
+            return
+        status = self._safe_float(self._read_var("PlayerCarPitSvStatus"), default=None)
+        flags = self._safe_float(self._read_var("PitSvFlags"), default=None)
+        self.timeline.append(
+            session_time,
+            self._safe_float(self._read_var("Speed"), default=0.0) or 0.0,
+            on_pit_road,
+            bool(self._read_var("PitstopActive", 0)),
+            -1 if status is None else int(status),
+            fuel_level,
+            0 if flags is None else int(flags),
+        )
+
     def _finish_armed_stop(self) -> None:
         if not self.stop:
             return
 
+        rows = self.timeline.rows()
+        phases = segment_stop(rows, self.stop.get("sampled_before"))
+        self.last_stop = (rows, phases)
+        self._view.set(
+            self.saved_phases_var,
+            "Saved phases: " + (" | ".join(f"{name} {end - start:.2f}s" for name, (start, end) in phases.items()) or "--"),
+        )
+
         stop = self.stop
         samples = stop.get("fuel_rate_samples") or []
         avg_rate = (sum(samples) / len(samples)) if samples else None
@@ -408,57 +1208,88 @@ class PitCalibratorApp:
         base = self._safe_float(stop.get("live_base"), default=None)
         fuel_added = self._safe_float(stop.get("fuel_added"), default=None)
         tire = self._safe_float(stop.get("manual_tire_time"), default=None)
-
-        self.saved_total_var.set(f"Saved total: {self._format_seconds(total)}")
-        self.saved_service_var.set(f"Saved service: {self._format_seconds(service)}")
-        self.saved_base_var.set(f"Saved base: {self._format_seconds(base)}")
-        self.saved_fuel_var.set(f"Saved fuel added: {self._format_liters(fuel_added)}")
-        self.saved_rate_var.set(f"Saved fuel rate: {self._format_rate(avg_rate)}")
-        self.saved_tire_var.set(f"Saved tire time: {self._format_seconds(tire)}")
-
-        self.status_var.set("Armed stop finished. Values are frozen on screen so you can write them down.")
+        if tire is None and "tire" in phases:
+            start, end = phases["tire"]
+            tire = end - start
+
+        if self.active_identity is not None:
+            car_id, track_id = self.active_identity
+            added, rates = fuel_fill_points(rows)
+            self.fuel_model = self.history.add_fuel_fill(car_id, added, rates)
+            self._show_history(
+                self.history.add(
+                    car_id,
+                    track_id,
+                    {"total": total, "service": service, "base": base, "tire": tire, "fuel_rate": avg_rate, "fuel_added": fuel_added},
+                )
+            )
+
+        self._view.set(self.saved_total_var, f"Saved total: {self._format_seconds(total)}")
+        self._view.set(self.saved_service_var, f"Saved service: {self._format_seconds(service)}")
+        self._view.set(self.saved_base_var, f"Saved base: {self._format_seconds(base)}")
+        self._view.set(self.saved_fuel_var, f"Saved fuel added: {self._format_liters(fuel_added)}")
+        self._view.set(self.saved_rate_var, f"Saved fuel rate: {self._format_rate(avg_rate)}")
+        self._view.set(self.saved_tire_var, f"Saved tire time: {self._format_seconds(tire)}")
+
+        self._view.set(self.status_var, "Armed stop finished. Values are frozen on screen so you can write them down.")
         self.arm_btn.configure(bg=self.BTN)
-        self.arm_state_var.set("Arming: off")
+        self._view.set(self.arm_state_var, "Arming: off")
         self.armed = False
         stop["active"] = False
         self.stop = None
-        self._last_wall_time = None
         self._last_fuel_level = None
 
     # ---------------------------- update loop ----------------------------
 
     def _show_disconnected(self) -> None:
-        self.connection_var.set("Not connected to iRacing. Open the sim and click Drive.")
-        self.context_var.set("Car: -- | Track: --")
+        self._view.set(self.connection_var, "Not connected to iRacing. Open the sim and click Drive.")
+        self._view.set(self.context_var, "Car: -- | Track: --")
         if not self.armed and not self.stop:
-            self.status_var.set("Arm the next stop to start measuring.")
-        self.pending_fuel_var.set("Pending pit fuel: --")
+            self._view.set(self.status_var, "Arm the next stop to start measuring.")
+        self._view.set(self.pending_fuel_var, "Pending pit fuel: --")
+        self._view.set(self.rejoin_status_var, "Rejoin: --")
+        self._view.config(self.rejoin_status_label, fg=self.TEXT)
+        self._view.set(self.rejoin_loss_var, "Pit loss: --")
+        self._view.set(self.rejoin_curve_var, "Rejoin gap: --")
+        self._rejoin_at = None
 
     def _tick(self) -> None:
-        _, self.active_car_name = self._driver_identity()
-        _, self.active_track_name = self._track_identity()
-        self.context_var.set(f"Car: {self.active_car_name} | Track: {self.active_track_name}")
+        car_id, self.active_car_name = self._driver_identity()
+        track_id, self.active_track_name = self._track_identity()
+        if (car_id, track_id) != self.active_identity:
+            if self.active_identity is None or car_id != self.active_identity[0]:
+                self.fuel_model = self.history.fuel_model(car_id)
+            self.active_identity = (car_id, track_id)
+            self._show_history(self.history.summary(car_id, track_id))
+        self._view.set(self.context_var, f"Car: {self.active_car_name} | Track: {self.active_track_name}")
 
         on_pit_road = bool(self._read_var("OnPitRoad", 0))
         fuel_level = self._safe_float(self._read_var("FuelLevel"), default=None)
         pending = self._safe_float(self._read_var("PitSvFuel"), default=None)
-        now = time.perf_counter()
+        now = self._safe_float(self._read_var("SessionTime"), default=None)
+        if now is None or (self._prev_sample is not None and now == self._prev_sample[0]):
+            # No new sim tick since the last poll (or the sim is paused): nothing to time.
+            return
+        service_now = self._service_active(on_pit_road)
 
         if self.armed and self.stop is None and on_pit_road:
             self._start_armed_stop(now, fuel_level)
 
         if self.stop is not None:
-            if on_pit_road:
-                self._update_armed_stop(now, fuel_level, on_pit_road)
-            else:
+            self._record_tick(fuel_level, on_pit_road)
+            # The exit sample still closes the interval that contains the pit-exit edge.
+            self._update_armed_stop(now, fuel_level, on_pit_road, service_now)
+            if not on_pit_road:
                 self._finish_armed_stop()
         else:
-            self.pending_fuel_var.set(f"Pending pit fuel: {self._format_liters(pending)}")
+            self._view.set(self.pending_fuel_var, self._pending_fuel_text(pending))
+            self._update_rejoin(now, fuel_level, pending)
+        self._prev_sample = (now, on_pit_road, service_now)
 
         if self.armed and self.stop is None and not on_pit_road:
-            self.arm_state_var.set("Arming: ON — next stop is the one that counts")
+            self._view.set(self.arm_state_var, "Arming: ON — next stop is the one that counts")
         elif not self.armed:
-            self.arm_state_var.set("Arming: off")
+            self._view.set(self.arm_state_var, "Arming: off")
 
     def _update(self) -> None:
         try:
@@ -467,20 +1298,27 @@ class PitCalibratorApp:
                 self.root.after(500, self._update)
                 return
 
-            self.connection_var.set(f"Connected to iRacing | refresh {UPDATE_MS} ms")
+            interval_ms = self._poll_interval_ms()
+            self._view.set(self.connection_var, f"Connected to iRacing | refresh {interval_ms} ms")
             self.ir.freeze_var_buffer_latest()
             try:
                 self._tick()
             finally:
                 self.ir.unfreeze_var_buffer_latest()
         except Exception as exc:
-            self.status_var.set(f"Runtime error: {type(exc).__name__}: {exc}")
+            self._view.set(self.status_var, f"Runtime error: {type(exc).__name__}: {exc}")
 
-        self.root.after(UPDATE_MS, self._update)
+        self.root.after(self._poll_interval_ms(), self._update)
+
+    def _poll_interval_ms(self) -> int:
+        return STOP_UPDATE_MS if self.armed or self.stop is not None else UPDATE_MS
 
     def run(self) -> None:
         self._update()
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.history.close()
 
 
 def main() -> int:
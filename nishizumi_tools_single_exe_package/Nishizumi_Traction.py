@@ -18,7 +18,7 @@ import tkinter as tk
 from collections import deque
 from dataclasses import dataclass
 from tkinter import filedialog, ttk
-from typing import Any, Deque, List, Optional, Sequence, Tuple
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
 
 import irsdk
 
@@ -88,6 +88,40 @@ class UnderuseSegment:
     confidence: bool
 
 
+class ViewBinder:
+    """Push widget options and variable values to Tk only when they change.
+
+    The last applied value of every bound field is kept per Tk name, so an
+    unchanged field costs a dict lookup instead of a configure/set call and
+    the geometry pass Tk schedules after it.
+    """
+
+    def __init__(self) -> None:
+        self._applied: Dict[Tuple[str, str], object] = {}
+
+    def config(self, widget: tk.Misc, **options: object) -> bool:
+        name = str(widget)
+        changed = {
+            option: value
+            for option, value in options.items()
+            if (name, option) not in self._applied or self._applied[(name, option)] != value
+        }
+        if not changed:
+            return False
+        widget.configure(**changed)
+        for option, value in changed.items():
+            self._applied[(name, option)] = value
+        return True
+
+    def set(self, variable: tk.Variable, value: object) -> bool:
+        key = (str(variable), "value")
+        if key in self._applied and self._applied[key] == value:
+            return False
+        variable.set(value)
+        self._applied[key] = value
+        return True
+
+
 class InfoCard(ttk.Frame):
     def __init__(self, master: tk.Misc, title: str) -> None:
         super().__init__(master, style="Card.TFrame", padding=(14, 10))
@@ -98,8 +132,12 @@ class InfoCard(ttk.Frame):
         ttk.Label(self, textvariable=self.title_var, style="CardTitle.TLabel").pack(anchor="w")
         ttk.Label(self, textvariable=self.value_var, style="CardValue.TLabel").pack(anchor="w", pady=(6, 2))
         ttk.Label(self, textvariable=self.sub_var, style="CardSub.TLabel").pack(anchor="w")
+        self._shown: Optional[Tuple[str, str]] = None
 
     def set(self, value: str, sub: str = "") -> None:
+        if self._shown == (value, sub):
+            return
+        self._shown = (value, sub)
         self.value_var.set(value)
         self.sub_var.set(sub)
 
@@ -114,8 +152,12 @@ class CoachCard(ttk.Frame):
         ttk.Label(self, textvariable=self.title_var, style="CoachTitle.TLabel").pack(anchor="w")
         ttk.Label(self, textvariable=self.meta_var, style="CoachMeta.TLabel").pack(anchor="w", pady=(4, 6))
         ttk.Label(self, textvariable=self.body_var, style="CoachBody.TLabel", wraplength=310, justify="left").pack(anchor="w")
+        self._shown: Optional[Tuple[str, str, str]] = None
 
     def set(self, title: str, meta: str, body: str) -> None:
+        if self._shown == (title, meta, body):
+            return
+        self._shown = (title, meta, body)
         self.title_var.set(title)
         self.meta_var.set(meta)
         self.body_var.set(body)
@@ -132,6 +174,9 @@ class TractionCircleOverlay:
         self.root.configure(bg=BG)
         self.root.attributes("-topmost", True)
 
+        self._view = ViewBinder()
+        self._circle_layouts: Dict[str, Tuple[int, int, bool]] = {}
+        self._circle_states: Dict[str, Tuple[int, int, str, int]] = {}
         self.compact_mode = True
         self.minimal_mode = False
         self.sidebar_visible = True
@@ -465,11 +510,14 @@ class TractionCircleOverlay:
         self._draw_circle(0.0, 0.0, 0.0)
 
     def _close_circle_popout(self) -> None:
+        if self.circle_canvas is not None:
+            self._circle_layouts.pop(str(self.circle_canvas), None)
+            self._circle_states.pop(str(self.circle_canvas), None)
         if self.circle_window is not None and self.circle_window.winfo_exists():
             self.circle_window.destroy()
         self.circle_window = None
         self.circle_canvas = None
-        self.circle_caption_var.set("Usage --")
+        self._view.set(self.circle_caption_var, "Usage --")
         self.btn_circle.configure(text="Pop-out circle (O)")
 
     def _toggle_lapdist_overlay(self, _event: object = None) -> None:
@@ -509,7 +557,7 @@ class TractionCircleOverlay:
         if self.lapdist_window is not None and self.lapdist_window.winfo_exists():
             self.lapdist_window.destroy()
         self.lapdist_window = None
-        self.lapdist_var.set("LapDist: --")
+        self._view.set(self.lapdist_var, "LapDist: --")
         self.btn_lapdist.configure(text="LapDist overlay (L)")
 
     def _start_lapdist_move(self, event: tk.Event[tk.Misc]) -> None:
@@ -712,29 +760,29 @@ class TractionCircleOverlay:
     def _reference_from_ibt(self, file_path: str) -> Optional[List[float]]:
         ibt_reader = getattr(irsdk, "IBT", None)
         if ibt_reader is None:
-            self.status_var.set("IBT unavailable")
-            self.subheadline_var.set("Your pyirsdk build does not expose the IBT reader.")
+            self._view.set(self.status_var, "IBT unavailable")
+            self._view.set(self.subheadline_var, "Your pyirsdk build does not expose the IBT reader.")
             return None
 
         try:
             ibt = ibt_reader()
             opened = ibt.open(file_path)
         except Exception as exc:
-            self.status_var.set("IBT error")
-            self.subheadline_var.set(f"Failed to open IBT: {exc}")
+            self._view.set(self.status_var, "IBT error")
+            self._view.set(self.subheadline_var, f"Failed to open IBT: {exc}")
             return None
 
         if opened is False:
-            self.status_var.set("IBT error")
-            self.subheadline_var.set("Failed to open the IBT file.")
+            self._view.set(self.status_var, "IBT error")
+            self._view.set(self.subheadline_var, "Failed to open the IBT file.")
             return None
 
         lap_dist = self._read_ibt_series(ibt, "LapDistPct")
         long_accel = self._read_ibt_series(ibt, "LongAccel")
         lat_accel = self._read_ibt_series(ibt, "LatAccel")
         if not lap_dist or not long_accel or not lat_accel:
-            self.status_var.set("IBT incomplete")
-            self.subheadline_var.set("The IBT file does not contain LapDistPct / LongAccel / LatAccel.")
+            self._view.set(self.status_var, "IBT incomplete")
+            self._view.set(self.subheadline_var, "The IBT file does not contain LapDistPct / LongAccel / LatAccel.")
             return None
 
         sample_count = min(len(lap_dist), len(long_accel), len(lat_accel))
@@ -748,8 +796,8 @@ class TractionCircleOverlay:
                 bins[idx] = total_g
 
         if max(bins, default=0.0) < MIN_REFERENCE_G:
-            self.status_var.set("IBT too weak")
-            self.subheadline_var.set("IBT loaded, but it did not produce a useful grip reference.")
+            self._view.set(self.status_var, "IBT too weak")
+            self._view.set(self.subheadline_var, "IBT loaded, but it did not produce a useful grip reference.")
             return None
         return bins
 
@@ -767,17 +815,17 @@ class TractionCircleOverlay:
 
         self.external_reference_bins = bins
         self.external_reference_path = file_path
-        self.reference_var.set(f"IBT: {os.path.basename(file_path)}")
+        self._view.set(self.reference_var, f"IBT: {os.path.basename(file_path)}")
         lap_target = self._feedback_lap_target()
         lap_label = "clean" if self.incident_free_only_var.get() else "completed"
-        self.subheadline_var.set(f"IBT reference loaded. Coaching starts after {lap_target} {lap_label} lap(s).")
+        self._view.set(self.subheadline_var, f"IBT reference loaded. Coaching starts after {lap_target} {lap_label} lap(s).")
 
     def _clear_ibt_reference(self) -> None:
         self.external_reference_bins = None
         self.external_reference_path = None
-        self.reference_var.set("Adaptive live reference")
+        self._view.set(self.reference_var, "Adaptive live reference")
         lap_label = "clean" if self.incident_free_only_var.get() else "completed"
-        self.subheadline_var.set(f"Using the adaptive live reference based on your {lap_label} laps.")
+        self._view.set(self.subheadline_var, f"Using the adaptive live reference based on your {lap_label} laps.")
 
     @staticmethod
     def _phase_and_recommendation(neg_long: float, lat: float, pos_long: float) -> Tuple[str, str]:
@@ -910,7 +958,7 @@ class TractionCircleOverlay:
     def _refresh_feedback_settings(self, _event: object = None) -> None:
         lap_target = self._feedback_lap_target()
         lap_label = "clean" if self.incident_free_only_var.get() else "completed"
-        self.settings_hint_var.set(f"Coaching starts after {lap_target} {lap_label} lap(s).")
+        self._view.set(self.settings_hint_var, f"Coaching starts after {lap_target} {lap_label} lap(s).")
 
     def _open_quickstart_window(self, _event: object = None) -> None:
         if self.quickstart_window is not None and self.quickstart_window.winfo_exists():
@@ -969,7 +1017,7 @@ class TractionCircleOverlay:
             self.btn_lapdist.configure(
                 text=("Hide LapDist (L)" if self.lapdist_window is not None and self.lapdist_window.winfo_exists() else "LapDist overlay (L)")
             )
-            self.footer_var.set("Drag the window to position it  •  M: compact/detailed  •  V: exit")
+            self._view.set(self.footer_var, "Drag the window to position it  •  M: compact/detailed  •  V: exit")
         else:
             if self.sidebar_visible:
                 self.sidebar.pack(side="left", fill="y", padx=(12, 0))
@@ -981,7 +1029,7 @@ class TractionCircleOverlay:
             self.btn_lapdist.configure(
                 text=("Hide LapDist (L)" if self.lapdist_window is not None and self.lapdist_window.winfo_exists() else "LapDist overlay (L)")
             )
-            self.footer_var.set("M: compact/detailed  •  V: minimal view  •  O: pop-out circle  •  L: LapDist overlay  •  S: setup panel")
+            self._view.set(self.footer_var, "M: compact/detailed  •  V: minimal view  •  O: pop-out circle  •  L: LapDist overlay  •  S: setup panel")
 
     def _format_compact_headline(self, segments: Sequence[UnderuseSegment], lap_label: str) -> Tuple[str, str]:
         if not segments:
@@ -1022,14 +1070,15 @@ class TractionCircleOverlay:
             body = f"{self._lapdist_hint(seg.start_percent, seg.end_percent, seg.peak_percent)}\n{seg.recommendation}"
             card.set(title, meta, body)
 
-    def _render_circle(self, canvas: tk.Canvas, long_g: float, lat_g: float, usage_pct: float, *, compact: bool) -> None:
-        canvas.delete("all")
-        canvas.update_idletasks()
-        w = max(100, int(canvas.winfo_width()))
-        h = max(100, int(canvas.winfo_height()))
+    def _circle_geometry(self, w: int, h: int, compact: bool) -> Tuple[int, int, float]:
         cx = w // 2
         cy = h // 2 - (2 if compact else 8)
         radius = min(w, h) * (0.35 if compact else 0.34)
+        return cx, cy, radius
+
+    def _draw_circle_static(self, canvas: tk.Canvas, w: int, h: int, compact: bool) -> None:
+        canvas.delete("all")
+        cx, cy, radius = self._circle_geometry(w, h, compact)
 
         canvas.create_oval(cx - radius, cy - radius, cx + radius, cy + radius, outline=RING, width=2)
         for frac in (0.2, 0.4, 0.6, 0.8):
@@ -1039,49 +1088,78 @@ class TractionCircleOverlay:
         canvas.create_line(cx - radius, cy, cx + radius, cy, fill=GRID, width=1)
         canvas.create_line(cx, cy - radius, cx, cy + radius, fill=GRID, width=1)
 
-        limit = max(0.8, self.estimated_limit_g)
-        scale = radius / limit
-        dot_x = cx + lat_g * scale
-        dot_y = cy - long_g * scale
-
-        usage_color = GOOD if usage_pct < 85 else MEDIUM if usage_pct < 97 else BAD
-        canvas.create_line(cx, cy, dot_x, dot_y, fill=usage_color, width=3)
-        dot_radius = 6 if compact else 7
-        canvas.create_oval(dot_x - dot_radius, dot_y - dot_radius, dot_x + dot_radius, dot_y + dot_radius, fill=DOT, outline="")
+        # Live items are created once and then only moved or recoloured.
+        canvas.create_line(cx, cy, cx, cy, fill=GOOD, width=3, tags="vector")
+        canvas.create_oval(cx, cy, cx, cy, fill=DOT, outline="", tags="dot")
         canvas.create_oval(cx - 3, cy - 3, cx + 3, cy + 3, fill=SUBTEXT, outline="")
 
         if compact:
             canvas.create_text(cx, 20, text="Traction circle", fill=TEXT, font=("Segoe UI Semibold", 12))
-            canvas.create_text(cx, h - 22, text=f"{usage_pct:.0f}% of est. limit", fill=usage_color, font=("Segoe UI Semibold", 10))
+            canvas.create_text(cx, h - 22, text="", fill=GOOD, font=("Segoe UI Semibold", 10), tags="usage")
             return
 
         label_y = cy + radius + 26
         canvas.create_text(cx, 24, text="Traction circle", fill=TEXT, font=("Segoe UI Semibold", 13))
         canvas.create_text(cx, 46, text="LongAccel ↑ / brake    •    throttle ↓    •    LatAccel ← →", fill=SUBTEXT, font=("Segoe UI", 9))
-        canvas.create_text(cx, label_y, text=f"Usage {usage_pct:.0f}% of estimated limit", fill=usage_color, font=("Segoe UI Semibold", 11))
+        canvas.create_text(cx, label_y, text="", fill=GOOD, font=("Segoe UI Semibold", 11), tags="usage")
 
         gauge_w = min(int(w * 0.64), 360)
         gauge_h = 12
         gx0 = cx - gauge_w // 2
         gy0 = label_y + 18
-        gx1 = gx0 + gauge_w
-        gy1 = gy0 + gauge_h
-        canvas.create_rectangle(gx0, gy0, gx1, gy1, fill=PANEL_2, outline=BORDER)
+        canvas.create_rectangle(gx0, gy0, gx0 + gauge_w, gy0 + gauge_h, fill=PANEL_2, outline=BORDER)
+        canvas.create_rectangle(gx0, gy0, gx0, gy0 + gauge_h, fill=GOOD, outline="", tags="gauge_fill")
+
+    def _render_circle(self, canvas: tk.Canvas, long_g: float, lat_g: float, usage_pct: float, *, compact: bool) -> None:
+        w = max(100, int(canvas.winfo_width()))
+        h = max(100, int(canvas.winfo_height()))
+        canvas_name = str(canvas)
+        layout_key = (w, h, compact)
+        if self._circle_layouts.get(canvas_name) != layout_key:
+            self._draw_circle_static(canvas, w, h, compact)
+            self._circle_layouts[canvas_name] = layout_key
+            self._circle_states.pop(canvas_name, None)
+
+        cx, cy, radius = self._circle_geometry(w, h, compact)
+        limit = max(0.8, self.estimated_limit_g)
+        scale = radius / limit
+        dot_x = round(cx + lat_g * scale)
+        dot_y = round(cy - long_g * scale)
+        usage_color = GOOD if usage_pct < 85 else MEDIUM if usage_pct < 97 else BAD
+        usage_label = round(usage_pct)
+
+        state = (dot_x, dot_y, usage_color, usage_label)
+        if self._circle_states.get(canvas_name) == state:
+            return
+        self._circle_states[canvas_name] = state
+
+        dot_radius = 6 if compact else 7
+        canvas.coords("vector", cx, cy, dot_x, dot_y)
+        canvas.itemconfigure("vector", fill=usage_color)
+        canvas.coords("dot", dot_x - dot_radius, dot_y - dot_radius, dot_x + dot_radius, dot_y + dot_radius)
+        if compact:
+            canvas.itemconfigure("usage", text=f"{usage_label}% of est. limit", fill=usage_color)
+            return
+
+        canvas.itemconfigure("usage", text=f"Usage {usage_label}% of estimated limit", fill=usage_color)
+        gx0, gy0, gx1, gy1 = canvas.coords("gauge_fill")
+        gauge_w = min(int(w * 0.64), 360)
         fill_x = gx0 + int(max(0.0, min(1.0, usage_pct / 100.0)) * gauge_w)
-        canvas.create_rectangle(gx0, gy0, fill_x, gy1, fill=usage_color, outline="")
+        canvas.coords("gauge_fill", gx0, gy0, fill_x, gy1)
+        canvas.itemconfigure("gauge_fill", fill=usage_color)
 
     def _draw_circle(self, long_g: float, lat_g: float, usage_pct: float) -> None:
         self._render_circle(self.canvas, long_g, lat_g, usage_pct, compact=False)
         if self.circle_canvas is not None and self.circle_window is not None and self.circle_window.winfo_exists():
             self._render_circle(self.circle_canvas, long_g, lat_g, usage_pct, compact=True)
-            self.circle_caption_var.set(
+            self._view.set(self.circle_caption_var,
                 f"Usage {usage_pct:.0f}%  •  Long {long_g:+.2f}g  •  Lat {lat_g:+.2f}g"
             )
 
     def _update_disconnected_ui(self) -> None:
-        self.status_var.set("Offline")
-        self.headline_var.set("Waiting for telemetry...")
-        self.subheadline_var.set("Open iRacing, join the session, and click Drive.")
+        self._view.set(self.status_var, "Offline")
+        self._view.set(self.headline_var, "Waiting for telemetry...")
+        self._view.set(self.subheadline_var, "Open iRacing, join the session, and click Drive.")
         self.card_total.set("--", "no data")
         self.card_long.set("--", "no data")
         self.card_lat.set("--", "no data")
@@ -1089,7 +1167,7 @@ class TractionCircleOverlay:
         self.coach_card_1.set("No connection", "iRacing not detected", "When telemetry comes online, the app will resume learning automatically.")
         self.coach_card_2.set("", "", "")
         self.coach_card_3.set("", "", "")
-        self.lapdist_var.set("LapDist: --\nWaiting iRacing...")
+        self._view.set(self.lapdist_var, "LapDist: --\nWaiting iRacing...")
         self._draw_circle(0.0, 0.0, 0.0)
 
     def _update(self) -> None:
@@ -1099,7 +1177,7 @@ class TractionCircleOverlay:
             self.root.after(400, self._update)
             return
 
-        self.status_var.set("Live")
+        self._view.set(self.status_var, "Live")
 
         context_key, track_name, car_name, session_name = self._detect_context()
         if self.context_key and context_key != self.context_key:
@@ -1108,14 +1186,14 @@ class TractionCircleOverlay:
         self.current_track = track_name
         self.current_car = car_name
         self.current_session = session_name
-        self.context_var.set(f"{self.current_car}  •  {self.current_track}  •  {self.current_session}")
+        self._view.set(self.context_var, f"{self.current_car}  •  {self.current_track}  •  {self.current_session}")
 
         long_accel = self._safe_float(self._read_var("LongAccel", 0.0))
         lat_accel = self._safe_float(self._read_var("LatAccel", 0.0))
         lap_num = int(self._safe_float(self._read_var("Lap", 0.0)))
         lap_dist_pct = self._safe_float(self._read_var("LapDistPct", 0.0))
         driver_idx = int(self._safe_float(self._read_var("DriverCarIdx", 0)))
-        self.lapdist_var.set(f"LapDist: {lap_dist_pct:.3f}")
+        self._view.set(self.lapdist_var, f"LapDist: {lap_dist_pct:.3f}")
 
         long_g = long_accel / G_CONSTANT
         lat_g = lat_accel / G_CONSTANT
@@ -1157,12 +1235,12 @@ class TractionCircleOverlay:
 
         if self.external_reference_bins is not None:
             if coaching_ready:
-                self.reference_var.set(f"IBT: {os.path.basename(self.external_reference_path or 'reference')}  •  pronto")
+                self._view.set(self.reference_var, f"IBT: {os.path.basename(self.external_reference_path or 'reference')}  •  pronto")
             else:
-                self.reference_var.set(f"IBT: {os.path.basename(self.external_reference_path or 'reference')}  •  waiting for {lap_target - len(coaching_laps)}")
+                self._view.set(self.reference_var, f"IBT: {os.path.basename(self.external_reference_path or 'reference')}  •  waiting for {lap_target - len(coaching_laps)}")
         else:
             confident_bins = sum(1 for x in self.bin_confidence if x)
-            self.reference_var.set(f"Adaptive live reference  •  {confident_bins}/{BINS_PER_LAP} confident bins")
+            self._view.set(self.reference_var, f"Adaptive live reference  •  {confident_bins}/{BINS_PER_LAP} confident bins")
 
         if coaching_ready:
             headline, sub = self._format_compact_headline(segments, laps_used_label)
@@ -1174,8 +1252,8 @@ class TractionCircleOverlay:
             else:
                 sub = f"Drive {remaining} more {laps_used_label} lap(s) to raise coaching confidence."
 
-        self.headline_var.set(headline)
-        self.subheadline_var.set(
+        self._view.set(self.headline_var, headline)
+        self._view.set(self.subheadline_var,
             f"{sub}  •  invalid laps skipped: {self.invalid_laps_count}  •  outliers removed: {self.outliers_removed_last}"
         )
 
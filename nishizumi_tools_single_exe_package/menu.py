@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import multiprocessing
 import os
 import subprocess
 import sys
@@ -800,4 +801,6 @@ def main() -> int:
 
 
 if __name__ == "__main__":
+    # TireWear runs its model in a spawned process; the frozen exe must route that child here.
+    multiprocessing.freeze_support()
     raise SystemExit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Idle CPU of a Tk overlay's update loop with steady telemetry.
+
+    python tools/bench_idle_cpu.py apps/Nishizumi_Traction.py
+    python tools/bench_idle_cpu.py --baseline <rev> apps/*.py
+
+The app module is loaded from the given path. With --baseline, the same
+file is also extracted from that git revision and measured first, so one
+run gives the before and after numbers. iRacing is replaced by one fixed, connected
+telemetry snapshot. The app's own update method is called N times, each
+followed by root.update() so the redraw and geometry work Tk queued is
+counted too, and the total is timed with time.process_time(). Tk needs a
+display.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tkinter as tk
+import types
+
+# class name -> (update method, period in ms when the module has no UPDATE_MS)
+APPS = {
+    "FuelConsumptionMonitor": ("_update_loop", 100),
+    "TractionCircleOverlay": ("_update", 60),
+    "PitCalibratorApp": ("_update", 100),
+}
+
+SNAPSHOT = {
+    "SessionTime": 1234.5,
+    "SessionNum": 0,
+    "SessionFlags": 0,
+    "SessionTimeRemain": 1800.0,
+    "SessionLapsRemainEx": 32767,
+    "DisplayUnits": 1,
+    "IsOnTrack": True,
+    "OnPitRoad": False,
+    "Lap": 5,
+    "LapDistPct": 0.37,
+    "LapLastLapTime": 90.0,
+    "LapBestLapTime": 89.5,
+    "FuelLevel": 42.0,
+    "FuelLevelPct": 0.42,
+    "Speed": 0.0,
+    "LongAccel": 0.0,
+    "LatAccel": 0.0,
+    "TrackTemp": 30.0,
+    "TrackTempCrew": 30.0,
+    "DriverCarIdx": 0,
+    "PlayerCarIdx": 0,
+    "CarIdxTrackSurface": [3] * 64,
+    "PitSvFuel": 0.0,
+    "PitSvFlags": 0,
+    "PitstopActive": False,
+    "PlayerCarPitSvStatus": 0,
+    "DriverInfo": {
+        "DriverCarIdx": 0,
+        "DriverCarFuelMaxLtr": 100.0,
+        "DriverCarMaxFuelPct": 1.0,
+        "Drivers": [
+            {
+                "CarIdx": 0,
+                "UserName": "Bench Driver",
+                "CarID": 1,
+                "CarPath": "benchcar",
+                "CarScreenName": "Bench Car",
+                "CarScreenNameShort": "Bench",
+            }
+        ],
+    },
+    "WeekendInfo": {
+        "TrackID": 1,
+        "TrackName": "bench",
+        "TrackDisplayName": "Bench Track",
+        "TrackConfigName": "Full",
+    },
+    "SessionInfo": {"Sessions": [{"SessionNum": 0, "SessionType": "Practice", "SessionName": "PRACTICE"}]},
+}
+
+
+class SteadyTelemetry:
+    """Connected iRacing stand-in that always returns the same snapshot."""
+
+    is_initialized = True
+    is_connected = True
+
+    def startup(self, *_args, **_kwargs) -> bool:
+        return True
+
+    def shutdown(self) -> None:
+        pass
+
+    def freeze_var_buffer_latest(self) -> None:
+        pass
+
+    def unfreeze_var_buffer_latest(self) -> None:
+        pass
+
+    def __getitem__(self, key: str):
+        return SNAPSHOT.get(key)
+
+
+def load_app(path: str, module_name: str):
+    sys.modules["irsdk"] = types.SimpleNamespace(IRSDK=SteadyTelemetry)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    for name, (method, period_ms) in APPS.items():
+        if hasattr(module, name):
+            return getattr(module, name), method, getattr(module, "UPDATE_MS", period_ms)
+    raise SystemExit(f"{path}: none of {', '.join(APPS)} found")
+
+
+def measure(path: str, module_name: str, ticks: int, warmup: int) -> str:
+    app_class, method, period_ms = load_app(path, module_name)
+    app = app_class()
+    # The benchmark drives the loop itself instead of the app rescheduling it.
+    app.root.after = lambda *_args, **_kwargs: "after#bench"
+    update = getattr(app, method)
+
+    for _ in range(warmup):
+        update()
+        app.root.update()
+
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    for _ in range(ticks):
+        update()
+        app.root.update()
+    cpu_ms = (time.process_time() - cpu_started) * 1000.0 / ticks
+    wall_ms = (time.perf_counter() - wall_started) * 1000.0 / ticks
+    app.root.destroy()
+    return (
+        f"{ticks} ticks | {cpu_ms:.3f} ms CPU/tick ({wall_ms:.3f} ms wall) | "
+        f"{100.0 * cpu_ms / period_ms:.2f}% of one core at the {period_ms} ms period"
+    )
+
+
+def git_show(rev: str, path: str, workdir: str) -> str:
+    relative = os.path.relpath(os.path.abspath(path), _repo_root())
+    target = os.path.join(workdir, f"{rev.replace('/', '_')}_{os.path.basename(path)}")
+    with open(target, "wb") as f:
+        f.write(subprocess.run(["git", "show", f"{rev}:{relative.replace(os.sep, '/')}"], check=True, capture_output=True).stdout)
+    return target
+
+
+def _repo_root() -> str:
+    return subprocess.run(["git", "rev-parse", "--show-toplevel"], check=True, capture_output=True, text=True).stdout.strip()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("apps", nargs="+", help="paths of the overlay modules to measure")
+    parser.add_argument("--baseline", metavar="REV", help="also measure each file as of this git revision")
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    args = parser.parse_args()
+
+    # History stores and profiles go to a throwaway directory.
+    workdir = tempfile.mkdtemp(prefix="nishizumi_bench_")
+    os.environ["APPDATA"] = workdir
+    try:
+        tk.Tk().destroy()
+    except tk.TclError as exc:
+        print(f"Tk cannot open a window ({exc}); run on a desktop or under xvfb-run.", file=sys.stderr)
+        return 2
+
+    for index, path in enumerate(args.apps):
+        runs = [("current", path)]
+        if args.baseline:
+            runs.insert(0, (args.baseline, git_show(args.baseline, path, workdir)))
+        for run, (label, source) in enumerate(runs):
+            result = measure(source, f"bench_target_{index}_{run}", args.ticks, args.warmup)
+            print(f"{path} [{label}]: {result}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())